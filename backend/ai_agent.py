@@ -6,13 +6,37 @@ real column names (Player/Goals/Points/Rebounds/AVG/ERA etc.)
 """
 
 import os
+import re
+import threading
+import time
 import pandas as pd
-from groq import Groq
 from dotenv import load_dotenv
 
+import metrics
+import opponents
+
+from token_budget import (
+    CHARS_PER_TOKEN, PROMPT_TOKEN_BUDGET, HISTORY_TOKEN_BUDGET,
+    PRIORITY_REQUIRED, PRIORITY_STATS, PRIORITY_COACH, PRIORITY_HISTORY,
+    estimate_tokens, message_tokens, fit_history, fit_context,
+)
+
 load_dotenv()
 
-client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+# The Groq SDK (and the httpx/anyio stack under it) is ~0.3s of import time,
+# so the client is built on first use instead of when api.py is imported.
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from groq import Groq
+                _client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+    return _client
 
 SYSTEM_PROMPT = """You are the Edison Eagles Athletics AI Analyst — the official AI for ALL Edison High School sports.
 
@@ -33,72 +57,93 @@ CRITICAL RULES:
 Your personality: Knowledgeable, enthusiastic, loyal to the Edison Eagles.
 """
 
+CONTEXT_ACK = "Got it — I have all Edison Athletics data loaded for all 6 sports. Ask me anything!"
+
+
+def _columns(df) -> tuple:
+    """
+    Column-wise view of a frame for string assembly. Elements come from
+    df.values, exactly as iterrows() would hand them out, so formatting is
+    byte-identical to the old row-by-row rendering.
+    """
+    values = df.values
+    cols = {}
+    for j, c in enumerate(df.columns):
+        cols.setdefault(c, list(values[:, j]))
+    return cols, len(df)
+
+
+def _col(cols: dict, name: str, n: int, default=0) -> list:
+    return cols[name] if name in cols else [default] * n
+
+
+def _or(values: list, default) -> list:
+    return [v or default for v in values]
+
+
+def _per_game(totals: list, games: list) -> list:
+    return [round(t / g, 1) for t, g in zip(totals, games)]
+
 
 def _df_context(df, sport: str, max_rows: int = 12) -> str:
     """Convert a pandas DataFrame to a readable string using real column names."""
     if df is None or not isinstance(df, pd.DataFrame) or df.empty:
         return "  No data available."
 
-    lines = []
-    for _, p in df.head(max_rows).iterrows():
-        name = p.get("Player", "Unknown")
-
-        if sport in ("boys_soccer", "girls_soccer"):
-            lines.append(
-                f"  {name}: {p.get('Goals', 0)} goals, "
-                f"{p.get('Assists', 0)} assists, "
-                f"{p.get('Points', 0)} pts"
-            )
-
-        elif sport in ("boys_basketball", "girls_basketball"):
-            pts = p.get("Points", 0) or 0
-            reb = p.get("Rebounds", 0) or 0
-            ast = p.get("Assists", 0) or 0
-            gp  = p.get("GP", 1) or 1
-            lines.append(
-                f"  {name}: {pts} pts ({round(pts/gp,1)} PPG), "
-                f"{reb} reb ({round(reb/gp,1)} RPG), "
-                f"{ast} ast ({round(ast/gp,1)} APG), "
-                f"{gp} GP"
-            )
-
-        elif sport == "baseball":
-            era = p.get("ERA", None)
-            if era and float(era) > 0:
-                lines.append(
-                    f"  {name} (P): ERA {era}, "
-                    f"{p.get('Strikeouts', 0)} K, "
-                    f"{p.get('IP', 0)} IP"
-                )
-            else:
-                lines.append(
-                    f"  {name}: {p.get('AVG', '---')} AVG, "
-                    f"{p.get('RBI', 0)} RBI, "
-                    f"{p.get('H', 0)} H, "
-                    f"{p.get('AB', 0)} AB"
-                )
-
-        elif sport == "wrestling":
-            w    = p.get("Wins", 0) or 0
-            l    = p.get("Losses", 0) or 0
-            pins = p.get("Pins", 0) or 0
-            tf   = p.get("Tech Falls", 0) or 0
-            wt   = p.get("Weight", "")
-            lines.append(
-                f"  {name}: {w}W-{l}L, {pins} pins, {tf} tech falls"
-                + (f", {wt}" if wt else "")
-            )
-
-        else:
-            lines.append(f"  {name}: {dict(p)}")
+    cols, n = _columns(df.head(max_rows))
+    names = _col(cols, "Player", n, "Unknown")
+
+    if sport in ("boys_soccer", "girls_soccer"):
+        lines = [
+            f"  {name}: {g} goals, {a} assists, {pts} pts"
+            for name, g, a, pts in zip(names, _col(cols, "Goals", n), _col(cols, "Assists", n), _col(cols, "Points", n))
+        ]
+
+    elif sport in ("boys_basketball", "girls_basketball"):
+        pts = _or(_col(cols, "Points", n), 0)
+        reb = _or(_col(cols, "Rebounds", n), 0)
+        ast = _or(_col(cols, "Assists", n), 0)
+        gp  = _or(_col(cols, "GP", n, 1), 1)
+        lines = [
+            f"  {name}: {p} pts ({ppg} PPG), {r} reb ({rpg} RPG), {a} ast ({apg} APG), {g} GP"
+            for name, p, ppg, r, rpg, a, apg, g in zip(
+                names, pts, _per_game(pts, gp), reb, _per_game(reb, gp), ast, _per_game(ast, gp), gp)
+        ]
+
+    elif sport == "baseball":
+        era, k, ip = _col(cols, "ERA", n, None), _col(cols, "Strikeouts", n), _col(cols, "IP", n)
+        avg, rbi   = _col(cols, "AVG", n, "---"), _col(cols, "RBI", n)
+        h, ab      = _col(cols, "H", n), _col(cols, "AB", n)
+        lines = [
+            f"  {names[i]} (P): ERA {era[i]}, {k[i]} K, {ip[i]} IP"
+            if era[i] and float(era[i]) > 0 else
+            f"  {names[i]}: {avg[i]} AVG, {rbi[i]} RBI, {h[i]} H, {ab[i]} AB"
+            for i in range(n)
+        ]
+
+    elif sport == "wrestling":
+        lines = [
+            f"  {name}: {w}W-{l}L, {pins} pins, {tf} tech falls" + (f", {wt}" if wt else "")
+            for name, w, l, pins, tf, wt in zip(
+                names, _or(_col(cols, "Wins", n), 0), _or(_col(cols, "Losses", n), 0),
+                _or(_col(cols, "Pins", n), 0), _or(_col(cols, "Tech Falls", n), 0), _col(cols, "Weight", n, ""))
+        ]
+
+    else:
+        values, columns = df.head(max_rows).values, list(df.columns)
+        lines = [f"  {name}: {dict(zip(columns, row))}" for name, row in zip(names, values)]
 
     return "\n".join(lines) if lines else "  No player data."
 
 
-def _build_full_context(team_data: dict, coach_data: dict, is_coach: bool) -> str:
+def _build_context_blocks(team_data: dict, coach_data: dict, is_coach: bool, focus: str = "") -> list:
     """
-    Build full context string from team_data.
-    
+    Build the data context as an ordered list of (priority, text) blocks.
+    Joining every block with newlines gives the full context string; the
+    priorities (see token_budget) let get_ai_response drop historical and
+    coach sections first when the prompt is over budget. Sports named in
+    `focus` (usually the user's message) are never dropped.
+
     Real structure from scraper.py:
       team_data['boys_basketball'] = {
           'current_stats': {'players': DataFrame, 'season': str},
@@ -109,7 +154,8 @@ def _build_full_context(team_data: dict, coach_data: dict, is_coach: bool) -> st
       team_data['baseball'] uses 'batters' + 'pitchers'
       team_data['wrestling'] uses 'wrestlers'
     """
-    sections = ["=== EDISON ATHLETICS DATA ===\n"]
+    blocks = [(PRIORITY_REQUIRED, "=== EDISON ATHLETICS DATA ===\n")]
+    focus = (focus or "").lower()
 
     sport_configs = {
         "boys_soccer":     "Boys Soccer",
@@ -123,10 +169,11 @@ def _build_full_context(team_data: dict, coach_data: dict, is_coach: bool) -> st
     for sport_key, label in sport_configs.items():
         sport = team_data.get(sport_key, {})
         if not sport:
-            sections.append(f"--- {label}: No data loaded ---\n")
+            blocks.append((PRIORITY_REQUIRED, f"--- {label}: No data loaded ---\n"))
             continue
 
-        sections.append(f"--- {label} ---")
+        stats_priority = PRIORITY_REQUIRED if label.lower() in focus else PRIORITY_STATS
+        sections = [f"--- {label} ---"]
 
         # Record and coach come from fixtures, NOT current_stats
         fixtures = sport.get("fixtures", {})
@@ -153,12 +200,12 @@ def _build_full_context(team_data: dict, coach_data: dict, is_coach: bool) -> st
 
             if isinstance(gk, pd.DataFrame) and not gk.empty:
                 sections.append("Goalkeepers:")
-                for _, row in gk.head(4).iterrows():
-                    sections.append(
-                        f"  {row.get('Player','?')}: "
-                        f"{row.get('Saves', 0)} saves, "
-                        f"{row.get('Games Played', 0)} GP"
-                    )
+                gk_cols, gk_n = _columns(gk.head(4))
+                sections.extend(
+                    f"  {name}: {saves} saves, {gp} GP"
+                    for name, saves, gp in zip(_col(gk_cols, "Player", gk_n, "?"), _col(gk_cols, "Saves", gk_n),
+                                               _col(gk_cols, "Games Played", gk_n))
+                )
 
         # ── Basketball ──
         elif sport_key in ("boys_basketball", "girls_basketball"):
@@ -195,10 +242,12 @@ def _build_full_context(team_data: dict, coach_data: dict, is_coach: bool) -> st
             else:
                 sections.append("Wrestlers: No stats available")
 
+        blocks.append((stats_priority, "\n".join(sections)))
+
         # ── Historical summary ──
         history = sport.get("history", {})
         if history:
-            sections.append("Historical Seasons:")
+            sections = ["Historical Seasons:"]
             for yr in sorted(history.keys(), reverse=True)[:4]:
                 yr_data = history.get(yr, {})
                 count = 0
@@ -208,11 +257,22 @@ def _build_full_context(team_data: dict, coach_data: dict, is_coach: bool) -> st
                         count = len(df)
                         break
                 sections.append(f"  {yr}: {count} players on record" if count else f"  {yr}: data available")
+            blocks.append((PRIORITY_HISTORY, "\n".join(sections)))
+
+        blocks.append((PRIORITY_REQUIRED, ""))
 
-        sections.append("")
+    # ── Opponents named in the question (cached scouting data only; never scrapes here) ──
+    if focus:
+        named = [k for k, label in sport_configs.items() if label.lower() in focus]
+        found = [e for e in opponents.mentioned(focus) if not named or e["sport"] in named]
+        for entry in found[:3]:
+            label = sport_configs.get(entry["sport"], entry["sport"])
+            blocks.append((PRIORITY_REQUIRED, f"--- Opponent: {entry['team']} {label} ({entry['data']['season']}) ---\n"
+                           + _df_context(entry["frame"], entry["sport"], max_rows=8)))
 
     # ── Coach portal ──
     if coach_data:
+        sections = []
         injuries = [i for i in coach_data.get("injuries", []) if not i.get("resolved", False)]
         notes    = coach_data.get("player_notes", [])
         scouting = coach_data.get("scouting_reports", [])
@@ -234,30 +294,230 @@ def _build_full_context(team_data: dict, coach_data: dict, is_coach: bool) -> st
 
         if notes and is_coach:
             sections.append("Coach Notes:")
-            for n in notes[-10:]:
+            for n in notes[:10]:   # newest first
                 sections.append(
                     f"  [{n.get('sport','?')}] {n.get('player_name','?')}: {n.get('note','')}"
                 )
 
         if scouting and is_coach:
             sections.append("Scouting Reports:")
-            for s in scouting[-3:]:
+            for s in scouting[:3]:
                 sections.append(f"  vs {s.get('opponent','?')}: {s.get('notes','')}")
 
-    return "\n".join(sections)
+        if sections:
+            blocks.append((PRIORITY_COACH, "\n".join(sections)))
 
+    return blocks
 
-def get_ai_response(
-    message: str,
-    conversation_history: list,
-    team_data: dict,
-    coach_data: dict,
-    is_coach: bool = False,
-) -> str:
-    """
-    Main entry point. Called from api.py with in-memory data — no HTTP calls.
-    """
-    context = _build_full_context(team_data, coach_data, is_coach)
+
+def _build_full_context(team_data: dict, coach_data: dict, is_coach: bool) -> str:
+    """Build full context string from team_data (every block, no budget applied)."""
+    return "\n".join(text for _, text in _build_context_blocks(team_data, coach_data, is_coach))
+
+
+# ── LLM scheduler: priority lanes + model tiers ──
+# Coach requests and public (fan) requests run in separate lanes, each with its
+# own concurrency limit, under one overall cap. When the overall cap is reached
+# a waiting coach always gets the next free slot before any public request.
+# Set GROQ_BASE_URL to point the client at a local stub completion server.
+
+MODEL_LARGE = os.getenv("GROQ_MODEL_LARGE", "llama-3.3-70b-versatile")
+MODEL_SMALL = os.getenv("GROQ_MODEL_SMALL", "llama-3.1-8b-instant")
+
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "6"))
+LLM_QUEUE_TIMEOUT   = float(os.getenv("LLM_QUEUE_TIMEOUT", "20"))
+LLM_SLOW_SECONDS    = float(os.getenv("LLM_SLOW_SECONDS", "6"))
+LLM_CALL_TIMEOUT    = float(os.getenv("LLM_CALL_TIMEOUT", "30"))
+
+LANES = {
+    "coach":  {"limit": int(os.getenv("LLM_COACH_CONCURRENCY", "4")),  "active": 0, "waiting": 0, "served": 0, "rejected": 0},
+    "public": {"limit": int(os.getenv("LLM_PUBLIC_CONCURRENCY", "3")), "active": 0, "waiting": 0, "served": 0, "rejected": 0},
+}
+TIERS = {
+    "small": {"model": MODEL_SMALL, "ewma_latency": 0.0, "calls": 0, "errors": 0, "fallbacks": 0},
+    "large": {"model": MODEL_LARGE, "ewma_latency": 0.0, "calls": 0, "errors": 0, "fallbacks": 0},
+}
+_EWMA_ALPHA = 0.3
+BUSY_MESSAGE = "The AI is handling a lot of questions right now. Please try again in a moment."
+_cond = threading.Condition()
+
+# Questions that need reasoning over several sections go to the large model
+COMPLEX_RE = re.compile(
+    r"\b(why|how come|compare|comparison|versus|vs\.?|analy[sz]\w*|explain|strategy|game plan|plan|"
+    r"predict\w*|should|improve|weakness\w*|strength\w*|scout\w*|trend\w*|matchup|lineup|"
+    r"history|historical|season[- ]over[- ]season|year[- ]over[- ]year)\b",
+    re.I,
+)
+
+
+def _choose_tier(message: str, history: list) -> str:
+    """Short, direct questions go to the small model; anything analytical to the large one."""
+    if len(message) > 160 or COMPLEX_RE.search(message) or len(history) > 4:
+        tier = "large"
+    else:
+        tier = "small"
+    other = "large" if tier == "small" else "small"
+    # Latency-based fallback: skip a tier that has been slow recently
+    with _cond:
+        if TIERS[tier]["ewma_latency"] > LLM_SLOW_SECONDS and TIERS[other]["ewma_latency"] <= LLM_SLOW_SECONDS:
+            TIERS[tier]["fallbacks"] += 1
+            return other
+    return tier
+
+
+def _acquire_slot(lane: str) -> bool:
+    """Block until `lane` may start a request; False if LLM_QUEUE_TIMEOUT passes first."""
+    started = time.monotonic()
+    deadline = started + LLM_QUEUE_TIMEOUT
+    with _cond:
+        LANES[lane]["waiting"] += 1
+        try:
+            while True:
+                total = sum(l["active"] for l in LANES.values())
+                # A coach held back only by the overall cap gets the next free slot
+                coach_first = lane == "public" and LANES["coach"]["waiting"] > 0 \
+                    and LANES["coach"]["active"] < LANES["coach"]["limit"]
+                if LANES[lane]["active"] < LANES[lane]["limit"] and total < LLM_MAX_CONCURRENCY \
+                        and not coach_first:
+                    LANES[lane]["active"] += 1
+                    metrics.observe("chat_llm_queue_wait_seconds", time.monotonic() - started, (lane,))
+                    return True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    LANES[lane]["rejected"] += 1
+                    return False
+                _cond.wait(remaining)
+        finally:
+            LANES[lane]["waiting"] -= 1
+
+
+def _release_slot(lane: str):
+    with _cond:
+        LANES[lane]["active"] -= 1
+        LANES[lane]["served"] += 1
+        _cond.notify_all()
+
+
+def _call_tier(tier: str, messages: list) -> str:
+    stats = TIERS[tier]
+    started = time.monotonic()
+    try:
+        resp = get_client().chat.completions.create(
+            model=stats["model"],
+            messages=messages,
+            max_tokens=600,
+            temperature=0.7,
+            timeout=LLM_CALL_TIMEOUT,
+        )
+        reply = resp.choices[0].message.content
+        metrics.observe("chat_completion_tokens", estimate_tokens(reply or ""))
+        return reply
+    except Exception:
+        with _cond:
+            stats["errors"] += 1
+        raise
+    finally:
+        elapsed = time.monotonic() - started
+        metrics.observe("chat_llm_seconds", elapsed, (tier,))
+        with _cond:
+            stats["calls"] += 1
+            stats["ewma_latency"] = elapsed if stats["calls"] == 1 else \
+                _EWMA_ALPHA * elapsed + (1 - _EWMA_ALPHA) * stats["ewma_latency"]
+
+
+def _stream_tier(tier: str, messages: list):
+    """Stream one completion from `tier`, yielding content pieces."""
+    stats = TIERS[tier]
+    started = time.monotonic()
+    chars = 0
+    try:
+        stream = get_client().chat.completions.create(
+            model=stats["model"],
+            messages=messages,
+            max_tokens=600,
+            temperature=0.7,
+            stream=True,
+            timeout=LLM_CALL_TIMEOUT,
+        )
+        for chunk in stream:
+            piece = chunk.choices[0].delta.content if chunk.choices else None
+            if piece:
+                if not chars:
+                    metrics.observe("chat_llm_first_token_seconds", time.monotonic() - started, (tier,))
+                chars += len(piece)
+                yield piece
+    except Exception:
+        with _cond:
+            stats["errors"] += 1
+        raise
+    finally:
+        elapsed = time.monotonic() - started
+        metrics.observe("chat_llm_seconds", elapsed, (tier,))
+        metrics.observe("chat_completion_tokens", chars / CHARS_PER_TOKEN)
+        with _cond:
+            stats["calls"] += 1
+            stats["ewma_latency"] = elapsed if stats["calls"] == 1 else \
+                _EWMA_ALPHA * elapsed + (1 - _EWMA_ALPHA) * stats["ewma_latency"]
+
+
+def _complete(messages: list, lane: str, tier: str) -> str:
+    """Run one completion in `lane`, falling back to the other tier if the first one fails."""
+    if not _acquire_slot(lane):
+        return BUSY_MESSAGE
+    try:
+        try:
+            return _call_tier(tier, messages)
+        except Exception:
+            other = "large" if tier == "small" else "small"
+            with _cond:
+                TIERS[other]["fallbacks"] += 1
+            return _call_tier(other, messages)
+    finally:
+        _release_slot(lane)
+
+
+def scheduler_stats() -> dict:
+    with _cond:
+        return {
+            "max_concurrency": LLM_MAX_CONCURRENCY,
+            "lanes": {k: dict(v) for k, v in LANES.items()},
+            "tiers": {k: {**v, "ewma_latency": round(v["ewma_latency"], 3)} for k, v in TIERS.items()},
+        }
+
+
+@metrics.collector
+def _scheduler_metrics():
+    s = scheduler_stats()
+    return [
+        ("chat_llm_lane_active", "gauge", "LLM calls in progress, by lane", {(k,): v["active"] for k, v in s["lanes"].items()}),
+        ("chat_llm_lane_waiting", "gauge", "Requests queued for an LLM slot, by lane", {(k,): v["waiting"] for k, v in s["lanes"].items()}),
+        ("chat_llm_lane_rejected_total", "counter", "Requests turned away after LLM_QUEUE_TIMEOUT, by lane",
+         {(k,): v["rejected"] for k, v in s["lanes"].items()}),
+        ("chat_llm_tier_ewma_latency_seconds", "gauge", "Smoothed LLM latency used for tier fallback, by tier",
+         {(k,): v["ewma_latency"] for k, v in s["tiers"].items()}),
+    ]
+
+for _name, _label in (("chat_llm_lane_active", "lane"), ("chat_llm_lane_waiting", "lane"),
+                      ("chat_llm_lane_rejected_total", "lane"), ("chat_llm_tier_ewma_latency_seconds", "tier")):
+    metrics.label_names(_name, (_label,))
+
+
+def _build_messages(message: str, conversation_history: list, team_data: dict,
+                    coach_data: dict, is_coach: bool) -> list:
+    """Assemble the chat messages for one request inside the token budget, logging its size."""
+    started = time.perf_counter()
+    # ── Token budget: system + message are fixed, history then context share the rest ──
+    fixed = [
+        {"role": "user", "content": f"{SYSTEM_PROMPT}\n\nHere is all current Edison Athletics data:\n\n"},
+        {"role": "assistant", "content": CONTEXT_ACK},
+        {"role": "user", "content": message},
+    ]
+    remaining = PROMPT_TOKEN_BUDGET - message_tokens(fixed)
+    history = fit_history(conversation_history, min(HISTORY_TOKEN_BUDGET, max(remaining, 0)))
+    history_tokens = message_tokens(history)
+
+    blocks = _build_context_blocks(team_data, coach_data, is_coach, focus=message)
+    context, dropped = fit_context(blocks, remaining - history_tokens)
 
     messages = [
         {
@@ -266,26 +526,75 @@ def get_ai_response(
         },
         {
             "role": "assistant",
-            "content": "Got it — I have all Edison Athletics data loaded for all 6 sports. Ask me anything!"
+            "content": CONTEXT_ACK
         }
     ]
+    messages.extend(history)
+    messages.append({"role": "user", "content": message})
+    metrics.observe("chat_context_build_seconds", time.perf_counter() - started)
+    metrics.observe("chat_prompt_tokens", message_tokens(messages))
 
-    # Include last 6 turns of conversation history
-    for turn in (conversation_history or [])[-6:]:
-        role    = turn.get("role", "user")
-        content = turn.get("content", "")
-        if role in ("user", "assistant") and content:
-            messages.append({"role": role, "content": content})
+    print(
+        f"  📏 Prompt ~{message_tokens(messages)} tokens "
+        f"(system {estimate_tokens(SYSTEM_PROMPT)}, context {estimate_tokens(context)}, "
+        f"history {history_tokens} in {len(history)} msgs, message {estimate_tokens(message)}) "
+        f"| budget {PROMPT_TOKEN_BUDGET}"
+        + (f" | dropped {dropped} context block(s)" if dropped else "")
+    )
+    return messages
 
-    messages.append({"role": "user", "content": message})
 
+def get_ai_response(
+    message: str,
+    conversation_history: list,
+    team_data: dict,
+    coach_data: dict,
+    is_coach: bool = False,
+) -> str:
+    """
+    Main entry point. Called from api.py with in-memory data — no HTTP calls.
+    """
+    messages = _build_messages(message, conversation_history, team_data, coach_data, is_coach)
+    lane = "coach" if is_coach else "public"
+    tier = _choose_tier(message, messages[2:-1])
     try:
-        resp = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=messages,
-            max_tokens=600,
-            temperature=0.7,
-        )
-        return resp.choices[0].message.content
+        return _complete(messages, lane, tier)
+    except Exception as e:
+        return f"Sorry, I ran into an issue connecting to the AI: {str(e)}. Please try again."
+
+
+def stream_ai_response(
+    message: str,
+    conversation_history: list,
+    team_data: dict,
+    coach_data: dict,
+    is_coach: bool = False,
+):
+    """
+    Same as get_ai_response but yields the reply in pieces as the model produces them.
+    The lane slot is held until the stream is exhausted or closed.
+    """
+    messages = _build_messages(message, conversation_history, team_data, coach_data, is_coach)
+    lane = "coach" if is_coach else "public"
+    tier = _choose_tier(message, messages[2:-1])
+    if not _acquire_slot(lane):
+        yield BUSY_MESSAGE
+        return
+    sent = False
+    try:
+        try:
+            for piece in _stream_tier(tier, messages):
+                sent = True
+                yield piece
+        except Exception:
+            if sent:
+                raise
+            # Nothing reached the client yet, so the other tier can still answer cleanly
+            other = "large" if tier == "small" else "small"
+            with _cond:
+                TIERS[other]["fallbacks"] += 1
+            yield from _stream_tier(other, messages)
     except Exception as e:
-        return f"Sorry, I ran into an issue connecting to the AI: {str(e)}. Please try again."
\ No newline at end of file
+        yield f"Sorry, I ran into an issue connecting to the AI: {str(e)}. Please try again."
+    finally:
+        _release_slot(lane)
@@ -1,23 +1,96 @@
-from fastapi import FastAPI, HTTPException, Header, Depends
+from fastapi import FastAPI, HTTPException, Header, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import StreamingResponse, PlainTextResponse, Response
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel, ValidationError
 from typing import Optional, List, Dict
 import pandas as pd
-from scraper import scrape_all_data, scrape_opponent_data, SEASONS, CURRENT_SEASON, PREVIOUS_SEASON
-from ai_agent import get_ai_response
+import codecs
+import csv
+import io
+import json
+import os
+import threading
+import time
+from datetime import date, datetime
+from scraper import scrape_all_data, SEASONS, CURRENT_SEASON, PREVIOUS_SEASON
 import database as db
+import fast_path
+import ics
+import metrics
+import opponents
+import players
+import profiling
+import progression
+import schedule
+import snapshot
+import conversations
 
 app = FastAPI(title="Edison Athletics Analytics API v3")
-app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
+app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_credentials=True, allow_methods=["*"], allow_headers=["*"],
+                   expose_headers=["X-Session-Id"])
+app.add_middleware(metrics.MetricsMiddleware)
+if profiling.ENABLED:
+    app.add_middleware(profiling.ProfilingMiddleware)
 
 team_data = {}
+LOAD_ATTEMPTS      = int(os.getenv("TEAM_DATA_LOAD_ATTEMPTS", "5"))
+LOAD_RETRY_SECONDS = float(os.getenv("TEAM_DATA_RETRY_SECONDS", "30"))   # doubles after each failed attempt
 
 @app.on_event("startup")
 async def startup_event():
+    # Load in the background so uvicorn binds the port right away (Heroku fails a dyno that hasn't
+    # bound within 60s); until then "/" reports nothing loaded and sport endpoints answer 503.
+    threading.Thread(target=_load_team_data, name="team-data-loader", daemon=True).start()
+
+def _load_team_data():
+    """Load team data, retrying with backoff; if it never loads, exit so the platform restarts the process."""
+    started = time.perf_counter()
+    for attempt in range(1, LOAD_ATTEMPTS + 1):
+        try:
+            _load_once()
+            break
+        except Exception as e:
+            if attempt >= LOAD_ATTEMPTS:
+                print(f"❌ Loading team data failed {attempt} times, exiting so the process is restarted: {e}")
+                os._exit(1)
+            delay = LOAD_RETRY_SECONDS * 2 ** (attempt - 1)
+            print(f"❌ Loading team data failed (attempt {attempt}/{LOAD_ATTEMPTS}), retrying in {delay:.0f}s: {e}")
+            time.sleep(delay)
+    print(f"✅ All data loaded in {time.perf_counter() - started:.1f}s")
+    # Off the request path: the first chat shouldn't pay for importing the LLM client
+    from ai_agent import get_client
+    get_client()
+
+def _load_once():
+    global team_data
+    version = None
+    if snapshot.SNAPSHOT_DIR:
+        # Multi-worker mode: the snapshot loader scrapes once, every worker maps its data read-only
+        version, data = snapshot.load_snapshot(snapshot.SNAPSHOT_DIR)
+        print(f"📸 Attached to team_data snapshot {version}")
+    else:
+        print("🔄 Loading all Edison sports data (~30s for 5 sports × 5 years)...")
+        data = scrape_all_data()
+        progression.record(data)
+    players.build_index(data)
+    schedule.build_index(data)
+    metrics.set_team_data(data)
+    team_data = data
+    db.relink_players()
+    if snapshot.SNAPSHOT_DIR:
+        snapshot.watch(_use_snapshot, snapshot.SNAPSHOT_DIR, version)
+    else:
+        # In multi-worker mode the snapshot loader prefetches into the shared cache
+        opponents.prefetch(data)
+
+def _use_snapshot(version: str, data: dict):
     global team_data
-    print("🔄 Loading all Edison sports data (~30s for 5 sports × 5 years)...")
-    team_data = scrape_all_data()
-    print("✅ All data loaded")
+    players.build_index(data)
+    schedule.build_index(data)
+    metrics.set_team_data(data)
+    team_data = data
+    print(f"📸 Switched to team_data snapshot {version}")
 
 def get_coach_session(authorization: Optional[str] = Header(None)):
     from auth import validate_token
@@ -28,6 +101,13 @@ def get_coach_session(authorization: Optional[str] = Header(None)):
         raise HTTPException(status_code=401, detail="Session expired")
     return session
 
+def optional_coach_session(authorization: Optional[str] = Header(None)):
+    """The coach session when a valid Bearer token is sent, else None (the caller is treated as public)."""
+    if not authorization or not authorization.startswith("Bearer "):
+        return None
+    from auth import validate_token
+    return validate_token(authorization.replace("Bearer ", ""))
+
 def get_sport_data(sport: str):
     if not team_data:
         raise HTTPException(status_code=503, detail="Data still loading")
@@ -35,6 +115,22 @@ def get_sport_data(sport: str):
         raise HTTPException(status_code=404, detail=f"Sport '{sport}' not found. Options: boys_soccer, girls_soccer, boys_basketball, girls_basketball, baseball, wrestling")
     return team_data[sport]
 
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+# ── PROFILES ──
+@app.get("/api/debug/profiles")
+def debug_profiles(session=Depends(get_coach_session)):
+    return {**profiling.stats(), "profiles": profiling.list_profiles()}
+
+@app.get("/api/debug/profiles/{profile_id}")
+def debug_profile_download(profile_id: str, session=Depends(get_coach_session)):
+    profile = profiling.get_profile(profile_id)
+    if not profile: raise HTTPException(status_code=404, detail="Profile not found (it may have rotated out of the buffer)")
+    return PlainTextResponse(profiling.folded(profile), headers={
+        "Content-Disposition": f'attachment; filename="profile-{profile_id}.folded"'})
+
 # ── AUTH ──
 class LoginRequest(BaseModel):
     password: str
@@ -59,6 +155,11 @@ def logout(authorization: Optional[str] = Header(None)):
 def get_me(session=Depends(get_coach_session)):
     return {"coach": session["coach"], "authenticated": True}
 
+@app.get("/api/auth/sessions/stats")
+def auth_session_stats(session=Depends(get_coach_session)):
+    from auth import session_stats
+    return session_stats()
+
 # ── SPORTS META ──
 @app.get("/api/sports")
 def list_sports():
@@ -206,6 +307,47 @@ def sport_schedule(sport: str, filter: str = "all"):
     if filter == "recent":   return {"games": df[df['Outcome'] != '—'].tail(10).to_dict('records')}
     return {"games": df.to_dict('records')}
 
+@app.get("/api/{sport}/head-to-head/{opponent}")
+def sport_head_to_head(sport: str, opponent: str):
+    get_sport_data(sport)
+    h2h = schedule.head_to_head(sport, opponent)
+    if not h2h:
+        return {"found": False, "sport": sport, "opponent": opponent}
+    return {"found": True, **h2h}
+
+@app.get("/api/{sport}/progression")
+def sport_progression(sport: str, player: Optional[str] = None, stat: Optional[str] = None,
+                      frame: Optional[str] = None, season: Optional[str] = None):
+    sd = get_sport_data(sport)
+    if sport not in progression.FRAMES:
+        # team_data also holds non-sport keys (current_stats, fixtures) that get_sport_data accepts
+        raise HTTPException(status_code=404, detail=f"Sport '{sport}' not found. Options: {', '.join(progression.FRAMES)}")
+    season = season or (sd.get('current_stats') or {}).get('season') or CURRENT_SEASON
+    if frame and frame not in progression.FRAMES[sport]:
+        raise HTTPException(status_code=400, detail=f"Unknown table '{frame}'. Options: {', '.join(progression.FRAMES[sport])}")
+    pid = None
+    if player:
+        ids = players.resolve(player, sport)
+        if len(ids) > 1:
+            return {"found": False, "message": f"'{player}' matches more than one player",
+                    "matches": [players.get_player(i) or {"id": i} for i in ids]}
+        pid = ids[0] if ids else players.player_id(player)
+        if not frame:
+            # Goalies and pitchers live in the sport's second table
+            rows = players.locate(pid, team_data, sport, season)
+            frame = rows[0][2] if rows else None
+    result = progression.trajectory(sport, season, frame, pid, stat)
+    if not result:
+        return {"found": False, "sport": sport, "season": season,
+                "message": f"No progression recorded for '{player}'" if player else "No progression recorded yet"}
+    if pid:
+        result["player"] = {"id": pid, "name": progression.player_name(pid) or player}
+    return {"found": True, **result}
+
+@app.get("/api/progression/stats")
+def progression_stats():
+    return progression.stats()
+
 @app.get("/api/{sport}/goalkeepers")
 def sport_goalkeepers(sport: str):
     if sport not in ("boys_soccer", "girls_soccer"):
@@ -233,29 +375,43 @@ def get_top_scorers(limit: int = 10):
 @app.get("/api/players/search/{name}")
 def search_player(name: str):
     if not team_data: raise HTTPException(status_code=503, detail="Loading")
-    from database import get_custom_player_data, get_player_notes, get_injuries
     cs = team_data.get('current_stats')
     if not cs: return {"found": False}
-    field_df = cs['field_players']; goalie_df = cs['goalies']
-    m = field_df[field_df['Player'].str.contains(name, case=False, na=False)]
-    if not m.empty:
-        row = m.iloc[0]; pname = row['Player']
-        custom = (get_custom_player_data(pname) or [{}])[0]
-        notes = get_player_notes(pname)
-        inj = next((i for i in get_injuries() if pname.lower() in i['player_name'].lower()), None)
+    ids = players.resolve(name, "boys_soccer")
+    if not ids:
+        # Partial names ("emma") still work as long as they pick out one current player
+        field_df = cs['field_players']; goalie_df = cs['goalies']
+        hits = set()
+        for df in (field_df, goalie_df):
+            hits.update(map(players.player_id, df.loc[df['Player'].str.contains(name, case=False, na=False, regex=False), 'Player']))
+        ids = sorted(hits)
+    if len(ids) > 1:
+        return {"found": False, "message": f"'{name}' matches more than one player",
+                "matches": [players.get_player(i) or {"id": i} for i in ids]}
+    rows = players.locate(ids[0], team_data, "boys_soccer", CURRENT_SEASON) if ids else []
+    if not rows:
+        return {"found": False, "message": f"No player found matching '{name}'"}
+    _, _, key, row = rows[0]
+    if key == "field_players":
+        pid = ids[0]; pname = row['Player']
+        records = db.get_player_records(pid)
+        custom = records["custom"] or {}
         return {"found": True, "player": {
-            "name": pname, "position": row['Year/Position'], "type": "field_player",
+            "id": pid, "name": pname, "position": row['Year/Position'], "type": "field_player",
             "stats": {"goals": int(row['Goals']), "assists": int(row['Assists']), "points": int(row['Points']),
                       "minutes_played": custom.get('minutes_played'), "yellow_cards": custom.get('yellow_cards')},
             "ratings": {"fitness": custom.get('fitness_rating'), "technical": custom.get('technical_rating'), "attitude": custom.get('attitude_rating')},
-            "coach_notes": notes, "current_injury": inj
+            "coach_notes": records["notes"], "current_injury": (records["injuries"] or [None])[0]
         }}
-    gm = goalie_df[goalie_df['Player'].str.contains(name, case=False, na=False)]
-    if not gm.empty:
-        row = gm.iloc[0]
-        return {"found": True, "player": {"name": row['Player'], "type": "goalkeeper",
-                "stats": {"saves": int(row['Saves']), "games_played": int(row['Games Played'])}}}
-    return {"found": False, "message": f"No player found matching '{name}'"}
+    return {"found": True, "player": {"id": ids[0], "name": row['Player'], "type": "goalkeeper",
+            "stats": {"saves": int(row['Saves']), "games_played": int(row['Games Played'])}}}
+
+@app.get("/api/players/{player_id}")
+def get_player_profile(player_id: str):
+    info = players.get_player(player_id)
+    if not info: raise HTTPException(status_code=404, detail=f"Unknown player id '{player_id}'")
+    return {**info, "rows": [{"sport": sp, "season": se, "table": key, "stats": row.to_dict()}
+                             for sp, se, key, row in players.locate(player_id, team_data)]}
 
 @app.get("/api/goalkeepers")
 def get_goalkeepers(): return sport_goalkeepers("boys_soccer")
@@ -276,17 +432,90 @@ def get_all_games():
 
 @app.get("/api/schedule/opponent/{team_name}")
 def get_opponent_history(team_name: str):
-    df = get_sport_data("boys_soccer")['fixtures']['games']
-    og = df[df['Opponent'].str.contains(team_name, case=False, na=False)]
-    if og.empty: return {"found": False}
-    played = og[og['Outcome'] != '—']
+    # Boys soccer, current season — see /api/{sport}/head-to-head/{opponent} for every sport and season
+    get_sport_data("boys_soccer")
+    h2h = schedule.head_to_head("boys_soccer", team_name) or {"games": []}
+    games = [g for g in h2h["games"] if g["season"] == CURRENT_SEASON]
+    if not games: return {"found": False}
+    played = [g["outcome"] for g in games if g["played"]]
     return {"found": True, "opponent": team_name, "games_played": len(played),
-            "record_vs_opponent": played['Outcome'].value_counts().to_dict(),
-            "games": og[['Date', 'Location', 'Result', 'Record']].to_dict('records')}
+            "record_vs_opponent": {o: played.count(o) for o in "WLT" if o in played},
+            "games": [{"Date": g["display_date"], "Location": g["location"], "Result": g["result"],
+                       "Record": g["record"]} for g in games]}
+
+# ── CALENDAR (all sports, indexed by date) ──
+def _calendar_args(sport: Optional[str], *dates: Optional[str]):
+    if not team_data:
+        raise HTTPException(status_code=503, detail="Data still loading")
+    if sport and sport not in schedule.SPORTS:
+        raise HTTPException(status_code=404, detail=f"Sport '{sport}' not found. Options: {', '.join(schedule.SPORTS)}")
+    for d in dates:
+        if d:
+            try:
+                date.fromisoformat(d)
+            except ValueError:
+                raise HTTPException(status_code=400, detail=f"'{d}' is not a YYYY-MM-DD date")
+
+@app.get("/api/calendar")
+def calendar_range(start: Optional[str] = None, end: Optional[str] = None, sport: Optional[str] = None,
+                   opponent: Optional[str] = None, limit: Optional[int] = None):
+    _calendar_args(sport, start, end)
+    games = schedule.against(opponent, sport, start, end) if opponent else schedule.between(start, end, sport)
+    return {"start": start, "end": end, "count": len(games), "games": games[:limit] if limit else games}
+
+@app.get("/api/calendar/upcoming")
+def calendar_upcoming(n: int = 5, sport: Optional[str] = None, after: Optional[str] = None):
+    _calendar_args(sport, after)
+    return {"games": schedule.upcoming(n, after, sport)}
+
+@app.get("/api/calendar/recent")
+def calendar_recent(n: int = 10, sport: Optional[str] = None, before: Optional[str] = None):
+    _calendar_args(sport, before)
+    return {"games": schedule.recent(n, before, sport)}
+
+@app.get("/api/calendar/opponent/{name}")
+def calendar_opponent(name: str, sport: Optional[str] = None):
+    _calendar_args(sport)
+    games = schedule.against(name, sport)
+    if not games:
+        return {"found": False, "opponent": name}
+    played = [g["outcome"] for g in games if g["played"]]
+    return {"found": True, "opponent": name, "matched": [schedule.opponent_name(k) for k in schedule.opponents(name)],
+            "games_played": len(played), "record_vs_opponent": {o: played.count(o) for o in "WLT" if o in played},
+            "games": games}
+
+def _ics_response(request: Request, sport: Optional[str]) -> Response:
+    _calendar_args(sport)
+    feed = ics.feed(sport)
+    headers = {"ETag": feed["etag"], "Last-Modified": feed["last_modified"], "Vary": "Accept-Encoding",
+               "Cache-Control": f"public, max-age={ics.MAX_AGE}"}
+    if ics.not_modified(request.headers, feed):
+        return Response(status_code=304, headers=headers)
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        return Response(feed["gzip"], media_type="text/calendar; charset=utf-8",
+                        headers={**headers, "Content-Encoding": "gzip"})
+    return Response(feed["body"], media_type="text/calendar; charset=utf-8", headers=headers)
+
+@app.get("/api/calendar.ics")
+def calendar_feed(request: Request):
+    return _ics_response(request, None)
+
+@app.get("/api/calendar/{sport}.ics")
+def calendar_sport_feed(sport: str, request: Request):
+    return _ics_response(request, sport)
 
 @app.get("/api/opponent/scrape/{team_name}")
-def scrape_opponent(team_name: str):
-    return {"found": bool(scrape_opponent_data(team_name)), "data": scrape_opponent_data(team_name)}
+def scrape_opponent(team_name: str, sport: str = "boys_soccer"):
+    if sport not in opponents.SPORT_SLUGS:
+        raise HTTPException(status_code=404, detail=f"Sport '{sport}' not found. Options: {', '.join(opponents.SPORT_SLUGS)}")
+    entry = opponents.get(team_name, sport)
+    return {"found": bool(entry["data"]), "data": entry["data"], "sport": sport,
+            "fetched_at": datetime.utcfromtimestamp(entry["fetched_at"]).isoformat(),
+            "stale": entry["expires"] <= time.time()}
+
+@app.get("/api/opponent/cache/stats")
+def opponent_cache_stats():
+    return opponents.stats()
 
 @app.get("/api/analytics/form")
 def get_form(last_n: int = 5):
@@ -354,10 +583,21 @@ def coach_add_note(req: PlayerNoteRequest, session=Depends(get_coach_session)):
     from database import add_player_note
     return {"success": True, "note": add_player_note(req.player_name, req.note, req.category, session['coach'])}
 
+def _page(key: str, fetch, limit: Optional[int]) -> dict:
+    # Coach list endpoints: newest first; pass next_cursor back as ?cursor= for the next page
+    if limit is not None and limit < 1:
+        raise HTTPException(status_code=400, detail="limit must be positive")
+    try:
+        items = fetch()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {key: items, "next_cursor": db.page_cursor(items[-1]) if limit and len(items) == limit else None}
+
 @app.get("/api/coach/player-notes")
-def coach_get_notes(player: Optional[str] = None, session=Depends(get_coach_session)):
+def coach_get_notes(player: Optional[str] = None, limit: Optional[int] = None, cursor: Optional[str] = None,
+                    since: Optional[str] = None, until: Optional[str] = None, session=Depends(get_coach_session)):
     from database import get_player_notes
-    return {"notes": get_player_notes(player)}
+    return _page("notes", lambda: get_player_notes(player, limit, cursor, since, until), limit)
 
 @app.delete("/api/coach/player-notes/{note_id}")
 def coach_del_note(note_id: str, session=Depends(get_coach_session)):
@@ -365,9 +605,10 @@ def coach_del_note(note_id: str, session=Depends(get_coach_session)):
     delete_player_note(note_id); return {"success": True}
 
 @app.get("/api/coach/injuries")
-def coach_get_injuries(active_only: bool = True, session=Depends(get_coach_session)):
+def coach_get_injuries(active_only: bool = True, limit: Optional[int] = None, cursor: Optional[str] = None,
+                       since: Optional[str] = None, until: Optional[str] = None, session=Depends(get_coach_session)):
     from database import get_injuries
-    return {"injuries": get_injuries(active_only)}
+    return _page("injuries", lambda: get_injuries(active_only, limit, cursor, since, until), limit)
 
 @app.post("/api/coach/injuries")
 def coach_add_injury(req: InjuryRequest, session=Depends(get_coach_session)):
@@ -379,10 +620,17 @@ def coach_resolve(injury_id: str, session=Depends(get_coach_session)):
     from database import resolve_injury
     resolve_injury(injury_id); return {"success": True}
 
+@app.get("/api/coach/game-notes")
+def coach_get_game_notes(opponent: Optional[str] = None, limit: Optional[int] = None, cursor: Optional[str] = None,
+                         since: Optional[str] = None, until: Optional[str] = None, session=Depends(get_coach_session)):
+    from database import get_game_notes
+    return _page("notes", lambda: get_game_notes(opponent, limit, cursor, since, until), limit)
+
 @app.get("/api/coach/scouting")
-def coach_get_scouting(opponent: Optional[str] = None, session=Depends(get_coach_session)):
+def coach_get_scouting(opponent: Optional[str] = None, limit: Optional[int] = None, cursor: Optional[str] = None,
+                       since: Optional[str] = None, until: Optional[str] = None, session=Depends(get_coach_session)):
     from database import get_scouting_reports
-    return {"reports": get_scouting_reports(opponent)}
+    return _page("reports", lambda: get_scouting_reports(opponent, limit, cursor, since, until), limit)
 
 @app.post("/api/coach/scouting")
 def coach_add_scouting(req: ScoutingReportRequest, session=Depends(get_coach_session)):
@@ -398,10 +646,111 @@ def coach_upsert_stats(req: PlayerStatsRequest, session=Depends(get_coach_sessio
         technical_rating=req.technical_rating, attitude_rating=req.attitude_rating,
         position_primary=req.position_primary, jersey_number=req.jersey_number, notes=req.notes)}
 
+# ── BULK IMPORT / EXPORT ──
+IMPORT_MODELS = {"player_notes": PlayerNoteRequest, "injuries": InjuryRequest, "game_notes": GameNoteRequest,
+                 "scouting_reports": ScoutingReportRequest, "custom_player_data": PlayerStatsRequest}
+IMPORT_PASSTHROUGH = ("id", "created_at", "coach", "active", "resolved_at")   # kept for export round-trips
+IMPORT_BATCH = 500
+IMPORT_MAX_ERRORS = 50
+
+def _import_format(request: Request, fmt: Optional[str]) -> str:
+    fmt = (fmt or "").lower() or ("csv" if "csv" in request.headers.get("content-type", "") else "jsonl")
+    if fmt not in ("csv", "jsonl"):
+        raise HTTPException(status_code=400, detail="format must be csv or jsonl")
+    return fmt
+
+async def _records(request: Request, fmt: str):
+    """Yield (row number, dict) as the body streams in; CSV records may span lines inside quotes."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buf, pending, header, n = "", [], None, 0
+    async def chunks():
+        async for chunk in request.stream():
+            yield decoder.decode(chunk)
+        yield decoder.decode(b"", final=True) + "\n"
+    async for text in chunks():
+        buf += text
+        *lines, buf = buf.split("\n")
+        for line in lines:
+            if fmt == "jsonl":
+                if line.strip():
+                    n += 1
+                    try:
+                        yield n, json.loads(line)
+                    except ValueError as e:
+                        yield n, e
+                continue
+            pending.append(line + "\n")
+            if sum(l.count('"') for l in pending) % 2:
+                continue   # inside a quoted field
+            record = next(csv.reader(pending), [])
+            pending = []
+            if not any(record):
+                continue
+            if header is None:
+                header = [h.strip() for h in record]
+                continue
+            n += 1
+            yield n, {k: (v if v != "" else None) for k, v in zip(header, record)}
+
+@app.post("/api/coach/import/{collection}")
+async def coach_import(collection: str, request: Request, format: Optional[str] = None,
+                       session=Depends(get_coach_session)):
+    model = IMPORT_MODELS.get(collection)
+    if not model: raise HTTPException(status_code=404, detail=f"Unknown collection '{collection}'. Options: {', '.join(IMPORT_MODELS)}")
+    fmt = _import_format(request, format)
+    imported = rejected = batches = 0; errors = []; batch = []
+
+    async def flush():
+        nonlocal imported, batches, batch
+        if batch:
+            imported += await run_in_threadpool(db.import_rows, collection, batch)
+            batches += 1; batch = []
+
+    async for n, row in _records(request, fmt):
+        try:
+            if isinstance(row, Exception) or not isinstance(row, dict): raise ValueError(f"not a JSON object: {row}")
+            clean = model(**row).model_dump()
+            if collection == "player_notes": clean["coach"] = session['coach']
+            clean.update({k: row[k] for k in IMPORT_PASSTHROUGH if row.get(k) is not None})
+            batch.append(clean)
+        except Exception as e:
+            rejected += 1
+            if len(errors) < IMPORT_MAX_ERRORS:
+                detail = "; ".join(f"{'.'.join(map(str, x['loc']))}: {x['msg']}" for x in e.errors()) \
+                    if isinstance(e, ValidationError) else str(e)
+                errors.append({"row": n, "error": detail})
+            continue
+        if len(batch) >= IMPORT_BATCH: await flush()
+    await flush()
+    return {"success": True, "collection": collection, "format": fmt, "imported": imported,
+            "rejected": rejected, "batches": batches, "errors": errors}
+
+@app.get("/api/coach/export/{collection}")
+def coach_export(collection: str, format: str = "jsonl", session=Depends(get_coach_session)):
+    if format not in ("csv", "jsonl"): raise HTTPException(status_code=400, detail="format must be csv or jsonl")
+    try:
+        fields, rows = db.export_rows(collection)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    def stream():
+        out = io.StringIO()
+        writer = csv.DictWriter(out, fieldnames=fields, extrasaction="ignore") if format == "csv" else None
+        if writer: writer.writeheader()
+        for i, row in enumerate(rows, 1):
+            if writer: writer.writerow(row)
+            else: out.write(json.dumps(row, default=str) + "\n")
+            if i % IMPORT_BATCH == 0:
+                yield out.getvalue(); out.seek(0); out.truncate()
+        yield out.getvalue()
+
+    return StreamingResponse(stream(), media_type="text/csv" if format == "csv" else "application/x-ndjson",
+                             headers={"Content-Disposition": f'attachment; filename="{collection}.{format}"'})
+
 @app.get("/api/coach/dashboard")
 def coach_dashboard(session=Depends(get_coach_session)):
-    from database import get_injuries, get_player_notes, get_scouting_reports
-    injuries = get_injuries(True); notes = get_player_notes(); scouting = get_scouting_reports()
+    from database import get_injuries
+    injuries = get_injuries(True)
     recent_form = []; top_performers = []
     if team_data and team_data.get('boys_soccer'):
         games_df = team_data['boys_soccer']['fixtures']['games']
@@ -416,36 +765,103 @@ def coach_dashboard(session=Depends(get_coach_session)):
         "coach": session['coach'],
         "team_health": {"injured_count": len(injuries),
                         "active_injuries": [{"player": i["player_name"], "injury": i["injury_type"], "expected_return": i.get("expected_return")} for i in injuries]},
-        "coach_notes_count": len(notes), "scouting_reports_count": len(scouting),
+        "coach_notes_count": db.count("player_notes"), "scouting_reports_count": db.count("scouting_reports"),
         "recent_form": recent_form, "top_performers": top_performers,
     }
 
+@app.get("/api/coach/search")
+def coach_search(q: str, type: Optional[str] = None, limit: int = 20, session=Depends(get_coach_session)):
+    kinds = [k.strip() for k in type.split(",")] if type else None
+    started = time.perf_counter()
+    results = db.search(q, kinds, limit)
+    return {"query": q, "results": results, "took_ms": round((time.perf_counter() - started) * 1000, 2)}
+
+@app.get("/api/coach/storage")
+def coach_storage(session=Depends(get_coach_session)):
+    return {**db.journal_stats(), "writer": db.writer_stats()}
+
+@app.post("/api/coach/storage/compact")
+def coach_compact(session=Depends(get_coach_session)):
+    return {"success": True, **db.compact(force=True)}
+
 # ── CHAT ──
 class ChatRequest(BaseModel):
-    message: str; conversation_history: Optional[List[Dict]] = []; is_coach: Optional[bool] = False
+    message: str; session_id: Optional[str] = None
+    is_coach: Optional[bool] = False  # ignored: coach context and the coach lane need a valid Bearer session
+    stream: Optional[bool] = False  # plain-text streamed reply, session id in the X-Session-Id header
+    conversation_history: Optional[List[Dict]] = []  # legacy clients only — sessions keep history server-side
 
 @app.post("/api/chat")
-async def chat(request: ChatRequest):
+async def chat(request: ChatRequest, session=Depends(optional_coach_session)):
+    is_coach = session is not None
     try:
+        session_id, _ = conversations.get_or_create(request.session_id)
+
+        # Simple stat lookups are answered from the frames without calling the LLM
+        hit = fast_path.try_answer(request.message, team_data)
+        if hit:
+            metrics.inc("chat_fast_path_total", (hit[0],))
+            conversations.record_turn(session_id, request.message, hit[1])
+            if request.stream:
+                return StreamingResponse(iter([hit[1]]), media_type="text/plain",
+                                         headers={"X-Session-Id": session_id, "X-Source": "fast_path"})
+            return {"response": hit[1], "status": "success", "session_id": session_id,
+                    "source": "fast_path", "intent": hit[0]}
+
         coach_data = {}
         try:
             coach_data = db.get_all_coach_context()
         except:
             pass
 
+        history = request.conversation_history or conversations.history_for_prompt(session_id)
+        if request.stream:
+            from ai_agent import stream_ai_response
+
+            def relay():
+                parts = []
+                for piece in stream_ai_response(request.message, history, team_data, coach_data, is_coach):
+                    parts.append(piece)
+                    yield piece
+                conversations.record_turn(session_id, request.message, "".join(parts))
+
+            # StreamingResponse iterates a sync generator in the threadpool
+            return StreamingResponse(relay(), media_type="text/plain", headers={"X-Session-Id": session_id})
+
+        # Runs in the threadpool so the scheduler's lanes can hold requests without blocking the event loop
         from ai_agent import get_ai_response
-        response = get_ai_response(
+        response = await run_in_threadpool(
+            get_ai_response,
             message=request.message,
-            conversation_history=request.conversation_history or [],
+            conversation_history=history,
             team_data=team_data,
             coach_data=coach_data,
-            is_coach=request.is_coach or False,
+            is_coach=is_coach,
         )
-        return {"response": response, "status": "success"}
+        conversations.record_turn(session_id, request.message, response)
+        return {"response": response, "status": "success", "session_id": session_id}
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.delete("/api/chat/session/{session_id}")
+def chat_end_session(session_id: str):
+    conversations.end_session(session_id)
+    return {"success": True}
+
+@app.get("/api/chat/fast-path/stats")
+def chat_fast_path_stats():
+    return fast_path.get_stats()
+
+@app.get("/api/chat/scheduler/stats")
+def chat_scheduler_stats():
+    from ai_agent import scheduler_stats
+    return scheduler_stats()
+
+@app.get("/api/chat/sessions/stats")
+def chat_session_stats():
+    return conversations.stats()
+
 @app.get("/")
 def root():
     sports_loaded = {k: bool(team_data.get(k, {}).get('current_stats')) for k in ['boys_soccer', 'girls_soccer', 'boys_basketball', 'girls_basketball', 'baseball', 'wrestling']} if team_data else {}
@@ -1,37 +1,173 @@
 import os
+import heapq
 import secrets
+import sqlite3
 import hashlib
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import Optional, Dict
 from dotenv import load_dotenv
 
 load_dotenv()
 
-# In-memory session store
-_sessions: Dict[str, dict] = {}
+# ── SESSION STORE ──
+# Tokens are kept by their SHA-256 so a leaked store can't be replayed.
+# "memory" is per-process; "sqlite" is a file every uvicorn worker opens, so a
+# coach stays logged in across workers and restarts.
+SESSION_TTL_HOURS      = float(os.getenv("AUTH_SESSION_TTL_HOURS", "24"))
+SESSION_MAX            = int(os.getenv("AUTH_SESSION_MAX", "10000"))
+SESSION_SWEEP_INTERVAL = float(os.getenv("AUTH_SWEEP_INTERVAL", "60"))
+SESSION_BACKEND        = os.getenv("AUTH_SESSION_BACKEND", "memory").lower()
+SESSION_DB_PATH        = os.getenv("AUTH_SESSION_DB", os.path.join(os.path.dirname(__file__), "sessions.db"))
+
+
+def _key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class MemorySessionStore:
+    """Dict of sessions plus a min-heap of (expires_at, key): expiry and eviction are O(log n)."""
+
+    def __init__(self, max_size: int = SESSION_MAX):
+        self.max_size = max_size
+        self._sessions: Dict[str, dict] = {}
+        self._heap = []
+        self._lock = threading.Lock()
+
+    def put(self, key: str, session: dict, expires: float):
+        with self._lock:
+            self._sessions[key] = {**session, "_expires": expires}
+            heapq.heappush(self._heap, (expires, key))
+            while len(self._sessions) > self.max_size:
+                self._pop_earliest()
+
+    def get(self, key: str) -> Optional[dict]:
+        session = self._sessions.get(key)
+        if not session:
+            return None
+        if time.time() > session["_expires"]:
+            self.delete(key)
+            return None
+        return {k: v for k, v in session.items() if k != "_expires"}
+
+    def delete(self, key: str):
+        # The heap entry is left behind and skipped when it surfaces
+        with self._lock:
+            self._sessions.pop(key, None)
+
+    def _pop_earliest(self) -> Optional[float]:
+        expires, key = heapq.heappop(self._heap)
+        session = self._sessions.get(key)
+        if session and session["_expires"] == expires:
+            del self._sessions[key]
+            return expires
+        return None
+
+    def sweep(self) -> int:
+        now, removed = time.time(), 0
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                removed += self._pop_earliest() is not None
+            # Drop stale heap entries (deleted tokens) once they outnumber live ones
+            if len(self._heap) > 2 * len(self._sessions) + 64:
+                self._heap = [(s["_expires"], k) for k, s in self._sessions.items()]
+                heapq.heapify(self._heap)
+        return removed
+
+    def __len__(self):
+        return len(self._sessions)
+
+
+class SQLiteSessionStore:
+    """Sessions in a shared SQLite file (WAL), indexed on expiry so sweeps and evictions are range deletes."""
+
+    def __init__(self, path: str = SESSION_DB_PATH, max_size: int = SESSION_MAX):
+        self.path, self.max_size = path, max_size
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS sessions (key TEXT PRIMARY KEY, coach TEXT, created_at TEXT, "
+                         "expires_at TEXT, expires REAL NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions(expires)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def put(self, key: str, session: dict, expires: float):
+        with self._conn() as conn:
+            conn.execute("INSERT OR REPLACE INTO sessions VALUES (?,?,?,?,?)",
+                         (key, session["coach"], session["created_at"], session["expires_at"], expires))
+            conn.execute("DELETE FROM sessions WHERE key IN (SELECT key FROM sessions ORDER BY expires "
+                         "LIMIT max(0, (SELECT count(*) FROM sessions) - ?))", (self.max_size,))
+
+    def get(self, key: str) -> Optional[dict]:
+        row = self._conn().execute("SELECT coach, created_at, expires_at FROM sessions WHERE key = ? AND expires > ?",
+                                   (key, time.time())).fetchone()
+        return {"coach": row[0], "created_at": row[1], "expires_at": row[2]} if row else None
+
+    def delete(self, key: str):
+        with self._conn() as conn:
+            conn.execute("DELETE FROM sessions WHERE key = ?", (key,))
+
+    def sweep(self) -> int:
+        with self._conn() as conn:
+            return conn.execute("DELETE FROM sessions WHERE expires <= ?", (time.time(),)).rowcount
+
+    def __len__(self):
+        return self._conn().execute("SELECT count(*) FROM sessions").fetchone()[0]
+
+
+_store = SQLiteSessionStore() if SESSION_BACKEND == "sqlite" else MemorySessionStore()
+_sweeper = None
+_swept = {"runs": 0, "removed": 0}
+
+
+def _sweep_loop():
+    while True:
+        time.sleep(SESSION_SWEEP_INTERVAL)
+        try:
+            _swept["removed"] += _store.sweep()
+            _swept["runs"] += 1
+        except Exception as e:
+            print(f"  ⚠️ Session sweep failed: {e}")
+
+
+def _start_sweeper():
+    global _sweeper
+    if SESSION_SWEEP_INTERVAL > 0 and not (_sweeper and _sweeper.is_alive()):
+        _sweeper = threading.Thread(target=_sweep_loop, name="auth-session-sweeper", daemon=True)
+        _sweeper.start()
+
+
+def session_stats() -> dict:
+    return {"backend": type(_store).__name__, "sessions": len(_store), "max": SESSION_MAX,
+            "ttl_hours": SESSION_TTL_HOURS, **_swept}
+
 
 def verify_password(password: str) -> bool:
     coach_password = os.environ.get("COACH_PASSWORD", "eagles2026")
     return password == coach_password
 
 def create_session_token(coach_name: str = "Coach") -> str:
+    _start_sweeper()
     token = secrets.token_hex(32)
-    _sessions[token] = {
+    now = datetime.utcnow()
+    expires = now + timedelta(hours=SESSION_TTL_HOURS)
+    _store.put(_key(token), {
         "coach": coach_name,
-        "created_at": datetime.utcnow().isoformat(),
-        "expires_at": (datetime.utcnow() + timedelta(hours=24)).isoformat()
-    }
+        "created_at": now.isoformat(),
+        "expires_at": expires.isoformat()
+    }, time.time() + SESSION_TTL_HOURS * 3600)
     return token
 
 def validate_token(token: str) -> Optional[dict]:
-    session = _sessions.get(token)
-    if not session:
-        return None
-    expires = datetime.fromisoformat(session["expires_at"])
-    if datetime.utcnow() > expires:
-        del _sessions[token]
-        return None
-    return session
+    return _store.get(_key(token))
 
 def invalidate_token(token: str):
-    _sessions.pop(token, None)
\ No newline at end of file
+    _store.delete(_key(token))
@@ -0,0 +1,231 @@
+"""
+Chat latency / prompt-size benchmark.
+Starts the Groq stand-in (llm_stub.py) and the API on synthetic team_data,
+drives /api/chat at a target concurrency, and reports latency percentiles,
+time-to-first-token, prompt token counts and server CPU time per request.
+
+    python bench_chat.py --concurrency 8 --requests 200
+    python bench_chat.py --json bench.json   # machine-readable, for comparing runs
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("GROQ_API_KEY", "bench")
+PASSWORD = "bench"
+
+QUESTIONS = [
+    # fast-path shaped
+    "Who is the top scorer for boys soccer?",
+    "What's the girls basketball record?",
+    "Who has the most pins in wrestling?",
+    # LLM shaped
+    "How has the boys basketball team looked compared to last season?",
+    "Which soccer players should we lean on in the playoffs and why?",
+    "Give me a quick rundown of every Edison team right now.",
+    "Explain the baseball pitching staff's strengths and weaknesses.",
+    "What should the girls soccer team work on before the next game?",
+]
+
+
+def _pct(values: list, p: float):
+    if not values:
+        return None
+    values = sorted(values)
+    k = min(len(values) - 1, max(0, int(round(p / 100 * (len(values) - 1)))))
+    return round(values[k] * 1000, 1)
+
+
+def _wait_ready(url: str, timeout: float = 60):
+    import httpx
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            r = httpx.get(url, timeout=2)
+            if r.status_code == 200 and (r.json().get("sports_loaded") or "sports_loaded" not in r.json()):
+                return
+        except Exception:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError(f"{url} did not come up within {timeout}s")
+
+
+def serve_api(port: int, players: int, seasons: int):
+    """Child-process mode: run api.py on synthetic data with a CPU-time probe."""
+    import uvicorn
+    import api
+    import synthetic_data
+    from scraper import SEASONS
+
+    data = synthetic_data.make_team_data(seasons=SEASONS[:seasons], players_per_sport=players)
+    api.scrape_all_data = lambda: data
+
+    @api.app.get("/__bench/cpu")
+    def bench_cpu():
+        return {"cpu": time.process_time()}
+
+    uvicorn.run(api.app, host="127.0.0.1", port=port, log_level="warning")
+
+
+async def _one(client, url: str, payload: dict, stream: bool, headers: dict) -> dict:
+    started = time.perf_counter()
+    first = None
+    if stream:
+        async with client.stream("POST", url, json={**payload, "stream": True}, headers=headers) as r:
+            source = r.headers.get("x-source", "llm")
+            async for chunk in r.aiter_text():
+                if chunk and first is None:
+                    first = time.perf_counter() - started
+            ok = r.status_code == 200
+    else:
+        r = await client.post(url, json=payload, headers=headers)
+        first = time.perf_counter() - started
+        ok = r.status_code == 200
+        source = r.json().get("source", "llm") if ok else "error"
+    return {"latency": time.perf_counter() - started, "ttft": first, "ok": ok, "source": source}
+
+
+async def drive(base: str, concurrency: int, total: int, stream: bool, coach_fraction: float, seed: int,
+                token: str) -> tuple:
+    import httpx
+    r = random.Random(seed)
+    sem = asyncio.Semaphore(concurrency)
+    results = []
+
+    async def worker(i):
+        async with sem:
+            # Coach requests carry a session; the server picks the coach lane from it
+            headers = {"Authorization": f"Bearer {token}"} if r.random() < coach_fraction else {}
+            payload = {"message": QUESTIONS[i % len(QUESTIONS)]}
+            results.append(await _one(client, f"{base}/api/chat", payload, stream, headers))
+
+    async with httpx.AsyncClient(timeout=120) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(total)))
+        wall = time.perf_counter() - started
+    return results, wall
+
+
+def prompt_sizes(players: int, seasons: int) -> dict:
+    """Token estimates of _build_full_context on the same synthetic data the server uses."""
+    import synthetic_data
+    from scraper import SEASONS
+    from ai_agent import _build_full_context
+    from token_budget import estimate_tokens
+    import database as db
+
+    data = synthetic_data.make_team_data(seasons=SEASONS[:seasons], players_per_sport=players)
+    coach = db.get_all_coach_context()
+    out = {}
+    for label, is_coach in (("public", False), ("coach", True)):
+        started = time.perf_counter()
+        ctx = _build_full_context(data, coach, is_coach)
+        out[label] = {"context_tokens": estimate_tokens(ctx), "build_ms": round((time.perf_counter() - started) * 1000, 2)}
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark /api/chat against a local LLM stand-in")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--no-stream", action="store_true", help="use the JSON response instead of streaming")
+    parser.add_argument("--coach-fraction", type=float, default=0.2)
+    parser.add_argument("--players", type=int, default=25, help="players per sport per season")
+    parser.add_argument("--seasons", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.4, help="stub seconds before first token")
+    parser.add_argument("--tps", type=float, default=80, help="stub tokens per second")
+    parser.add_argument("--reply-tokens", type=int, default=120)
+    parser.add_argument("--api-port", type=int, default=8011)
+    parser.add_argument("--stub-port", type=int, default=8765)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write the report to this file")
+    parser.add_argument("--serve-api", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve_api:
+        return serve_api(args.api_port, args.players, args.seasons)
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    stub_url = f"http://127.0.0.1:{args.stub_port}"
+    base = f"http://127.0.0.1:{args.api_port}"
+    # Throwaway stores for both the server and prompt_sizes() here, so a run never touches real coach data
+    workdir = tempfile.mkdtemp(prefix="edison-bench-")
+    os.environ.update({"COACH_DB_PATH": os.path.join(workdir, "coach.db"),
+                       "AUTH_SESSION_DB": os.path.join(workdir, "sessions.db"),
+                       "OPPONENT_DB_PATH": os.path.join(workdir, "opponents.db")})
+    env = {**os.environ, "GROQ_BASE_URL": stub_url, "GROQ_API_KEY": "bench", "COACH_PASSWORD": PASSWORD,
+           "OPPONENT_PREFETCH": "0", "STAT_PROGRESSION": "0", "PYTHONUNBUFFERED": "1"}
+    procs = [
+        subprocess.Popen([sys.executable, "llm_stub.py", "--port", str(args.stub_port), "--latency", str(args.latency),
+                          "--tps", str(args.tps), "--reply-tokens", str(args.reply_tokens)],
+                         cwd=here, env=env, stdout=subprocess.DEVNULL),
+        subprocess.Popen([sys.executable, "bench_chat.py", "--serve-api", "--api-port", str(args.api_port),
+                          "--players", str(args.players), "--seasons", str(args.seasons)],
+                         cwd=here, env=env, stdout=subprocess.DEVNULL),
+    ]
+    try:
+        import httpx
+        _wait_ready(f"{stub_url}/stats")
+        _wait_ready(f"{base}/")
+        token = httpx.post(f"{base}/api/auth/login", json={"password": PASSWORD}).json().get("token", "")
+        cpu_before = httpx.get(f"{base}/__bench/cpu").json()["cpu"]
+        results, wall = asyncio.run(drive(base, args.concurrency, args.requests, not args.no_stream,
+                                          args.coach_fraction, args.seed, token))
+        cpu_after = httpx.get(f"{base}/__bench/cpu").json()["cpu"]
+        stub = httpx.get(f"{stub_url}/stats").json()
+    finally:
+        for p in procs:
+            p.terminate()
+        for p in procs:
+            p.wait(timeout=10)
+
+    def summary(rows):
+        lat = [x["latency"] for x in rows]
+        ttft = [x["ttft"] for x in rows if x["ttft"] is not None]
+        return {"count": len(rows),
+                "latency_ms": {"p50": _pct(lat, 50), "p95": _pct(lat, 95), "p99": _pct(lat, 99)},
+                "ttft_ms": {"p50": _pct(ttft, 50), "p95": _pct(ttft, 95), "p99": _pct(ttft, 99)}}
+
+    ok = [x for x in results if x["ok"]]
+    report = {
+        "config": {k: v for k, v in vars(args).items() if k not in ("serve_api", "json")},
+        "throughput_rps": round(len(ok) / wall, 2),
+        "errors": len(results) - len(ok),
+        "all": summary(ok),
+        "llm": summary([x for x in ok if x["source"] != "fast_path"]),
+        "fast_path": summary([x for x in ok if x["source"] == "fast_path"]),
+        "server_cpu_ms_per_request": round((cpu_after - cpu_before) / max(len(results), 1) * 1000, 2),
+        "prompt_tokens_sent": stub.get("prompt_tokens", {}),
+        "context_build": prompt_sizes(args.players, args.seasons),
+    }
+
+    print(f"\n📊 /api/chat — {args.requests} requests @ concurrency {args.concurrency} "
+          f"({'streaming' if not args.no_stream else 'json'})")
+    print(f"  throughput: {report['throughput_rps']} req/s | errors: {report['errors']}")
+    for label in ("all", "llm", "fast_path"):
+        s = report[label]
+        if s["count"]:
+            print(f"  {label:<9} n={s['count']:<4} latency p50/p95/p99 = {s['latency_ms']['p50']}/"
+                  f"{s['latency_ms']['p95']}/{s['latency_ms']['p99']} ms | ttft p50/p95/p99 = "
+                  f"{s['ttft_ms']['p50']}/{s['ttft_ms']['p95']}/{s['ttft_ms']['p99']} ms")
+    print(f"  server CPU: {report['server_cpu_ms_per_request']} ms/request")
+    print(f"  prompt tokens sent to LLM: {report['prompt_tokens_sent']}")
+    for label, c in report["context_build"].items():
+        print(f"  _build_full_context ({label}): ~{c['context_tokens']} tokens in {c['build_ms']} ms")
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
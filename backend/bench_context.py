@@ -0,0 +1,161 @@
+"""
+Micro-benchmark for chat context rendering.
+Compares the column-wise _df_context / _build_full_context against the old
+iterrows() implementation (kept here as the reference), checks the output is
+byte-identical, and times both on growing rosters and multi-school data.
+
+    python bench_context.py --players 25 500 2000 --schools 1 5
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+os.environ.setdefault("GROQ_API_KEY", "bench")
+
+import ai_agent
+import synthetic_data
+
+
+def _df_context_iterrows(df, sport: str, max_rows: int = 12) -> str:
+    """The original row-by-row renderer, kept verbatim as the reference."""
+    if df is None or not isinstance(df, pd.DataFrame) or df.empty:
+        return "  No data available."
+
+    lines = []
+    for _, p in df.head(max_rows).iterrows():
+        name = p.get("Player", "Unknown")
+
+        if sport in ("boys_soccer", "girls_soccer"):
+            lines.append(
+                f"  {name}: {p.get('Goals', 0)} goals, "
+                f"{p.get('Assists', 0)} assists, "
+                f"{p.get('Points', 0)} pts"
+            )
+
+        elif sport in ("boys_basketball", "girls_basketball"):
+            pts = p.get("Points", 0) or 0
+            reb = p.get("Rebounds", 0) or 0
+            ast = p.get("Assists", 0) or 0
+            gp  = p.get("GP", 1) or 1
+            lines.append(
+                f"  {name}: {pts} pts ({round(pts/gp,1)} PPG), "
+                f"{reb} reb ({round(reb/gp,1)} RPG), "
+                f"{ast} ast ({round(ast/gp,1)} APG), "
+                f"{gp} GP"
+            )
+
+        elif sport == "baseball":
+            era = p.get("ERA", None)
+            if era and float(era) > 0:
+                lines.append(
+                    f"  {name} (P): ERA {era}, "
+                    f"{p.get('Strikeouts', 0)} K, "
+                    f"{p.get('IP', 0)} IP"
+                )
+            else:
+                lines.append(
+                    f"  {name}: {p.get('AVG', '---')} AVG, "
+                    f"{p.get('RBI', 0)} RBI, "
+                    f"{p.get('H', 0)} H, "
+                    f"{p.get('AB', 0)} AB"
+                )
+
+        elif sport == "wrestling":
+            w    = p.get("Wins", 0) or 0
+            l    = p.get("Losses", 0) or 0
+            pins = p.get("Pins", 0) or 0
+            tf   = p.get("Tech Falls", 0) or 0
+            wt   = p.get("Weight", "")
+            lines.append(
+                f"  {name}: {w}W-{l}L, {pins} pins, {tf} tech falls"
+                + (f", {wt}" if wt else "")
+            )
+
+        else:
+            lines.append(f"  {name}: {dict(p)}")
+
+    return "\n".join(lines) if lines else "  No player data."
+
+
+def _goalies_iterrows(gk) -> list:
+    return [
+        f"  {row.get('Player','?')}: {row.get('Saves', 0)} saves, {row.get('Games Played', 0)} GP"
+        for _, row in gk.head(4).iterrows()
+    ]
+
+
+def _edge_frames() -> list:
+    """Frames that exercise the falsy / NaN / missing-column / dtype corners."""
+    return [
+        ("boys_basketball", pd.DataFrame({"Player": ["A", "B", "C"], "Points": [0.0, np.nan, 31.0],
+                                          "Rebounds": [2.0, 0.0, 7.0], "GP": [0, 3, np.nan]})),
+        ("boys_basketball", pd.DataFrame({"Points": [10.0, 0.0], "GP": [4, 0]})),   # numeric only, no Player
+        ("baseball", pd.DataFrame({"Player": ["P", "Q", "R"], "ERA": [0.0, np.nan, 2.15], "IP": [1.0, 2.0, 3.5]})),
+        ("baseball", pd.DataFrame({"Player": ["S"], "AB": [10], "H": [3]})),
+        ("wrestling", pd.DataFrame({"Player": ["W", "X"], "Wins": [0, 4], "Weight": ["", np.nan]})),
+        ("girls_soccer", pd.DataFrame({"Player": ["G"], "Goals": [np.int64(3)]})),
+        ("tennis", pd.DataFrame({"Player": ["T"], "Aces": [9], "Season": ["2025-2026"]})),
+    ]
+
+
+def check_identical(team_data: dict):
+    for sport, sd in team_data.items():
+        if not isinstance(sd, dict) or "history" not in sd:
+            continue
+        for season in sd["history"].values():
+            for key, df in season.items():
+                if isinstance(df, pd.DataFrame) and not df.empty:
+                    for rows in (4, 12, min(len(df), 200)):
+                        assert ai_agent._df_context(df, sport, rows) == _df_context_iterrows(df, sport, rows), (sport, key)
+                    if key == "goalies":
+                        cols, n = ai_agent._columns(df.head(4))
+                        fast = [f"  {a}: {b} saves, {c} GP" for a, b, c in zip(
+                            ai_agent._col(cols, "Player", n, "?"), ai_agent._col(cols, "Saves", n),
+                            ai_agent._col(cols, "Games Played", n))]
+                        assert fast == _goalies_iterrows(df)
+    for sport, df in _edge_frames():
+        assert ai_agent._df_context(df, sport) == _df_context_iterrows(df, sport), sport
+
+
+def _time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        best = min(best, (time.perf_counter() - started) / repeat)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark chat context rendering")
+    parser.add_argument("--players", type=int, nargs="+", default=[25, 500, 2000])
+    parser.add_argument("--schools", type=int, nargs="+", default=[1, 5])
+    parser.add_argument("--max-rows", type=int, default=12, help="rows rendered per frame (_df_context default is 12)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'players':>8} {'schools':>8} {'rows':>5} {'iterrows ms':>12} {'columnar ms':>12} {'speedup':>8}")
+    for players in args.players:
+        for schools in args.schools:
+            datasets = [synthetic_data.make_team_data(players_per_sport=players, seed=s) for s in range(schools)]
+            for td in datasets:
+                check_identical(td)
+            frames = [
+                (sport, df)
+                for td in datasets for sport, sd in td.items() if isinstance(sd, dict) and "history" in sd
+                for season in sd["history"].values() for df in season.values() if isinstance(df, pd.DataFrame)
+            ]
+            for rows in sorted({args.max_rows, players}):
+                old = _time(lambda: [_df_context_iterrows(df, sp, rows) for sp, df in frames], args.repeat)
+                new = _time(lambda: [ai_agent._df_context(df, sp, rows) for sp, df in frames], args.repeat)
+                print(f"{players:>8} {schools:>8} {rows:>5} {old:>12.2f} {new:>12.2f} {old / new:>7.1f}x")
+    print("✅ output byte-identical to the iterrows renderer")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Server-side chat sessions.
+Keeps each conversation in memory keyed by a session id so clients only send
+the new message. The newest turns are kept verbatim; older ones are folded
+into a rolling one-line summary that is capped in size, so the history part
+of the prompt stays flat however long a conversation runs.
+Bounded by LRU eviction (CHAT_SESSION_MAX) and idle expiry (CHAT_SESSION_TTL).
+"""
+
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from dotenv import load_dotenv
+
+from token_budget import (
+    MAX_HISTORY_TURNS, SUMMARY_PREFIX,
+    estimate_tokens, clip, summarize_turn,
+)
+
+load_dotenv()
+
+SESSION_TTL_SECONDS  = int(os.getenv("CHAT_SESSION_TTL", str(2 * 60 * 60)))
+MAX_SESSIONS         = int(os.getenv("CHAT_SESSION_MAX", "1000"))
+SUMMARY_TOKEN_BUDGET = int(os.getenv("CHAT_SUMMARY_TOKENS", "300"))
+
+# Ordered least → most recently used, so idle sessions collect at the front
+_sessions: "OrderedDict[str, dict]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def _sweep(now: float):
+    """Drop expired sessions from the LRU end, then enforce the size cap."""
+    while _sessions:
+        sid, sess = next(iter(_sessions.items()))
+        if now - sess["last_used"] < SESSION_TTL_SECONDS and len(_sessions) <= MAX_SESSIONS:
+            break
+        _sessions.pop(sid)
+
+
+def get_or_create(session_id: Optional[str] = None) -> Tuple[str, dict]:
+    """Return (session_id, session), starting a fresh session for unknown or expired ids."""
+    now = time.time()
+    with _lock:
+        _sweep(now)
+        sess = _sessions.get(session_id) if session_id else None
+        if sess is None:
+            session_id = secrets.token_hex(16)
+            sess = {"turns": [], "summary": [], "created_at": now, "last_used": now}
+            _sessions[session_id] = sess
+            _sweep(now)
+        else:
+            sess["last_used"] = now
+            _sessions.move_to_end(session_id)
+        return session_id, sess
+
+
+def history_for_prompt(session_id: str) -> list:
+    """Conversation history in chat-message form: rolling summary first, then recent turns."""
+    with _lock:
+        sess = _sessions.get(session_id)
+        if not sess:
+            return []
+        history = []
+        if sess["summary"]:
+            history.append({"role": "user", "content": SUMMARY_PREFIX + " | ".join(sess["summary"])})
+        history.extend(dict(t) for t in sess["turns"])
+        return history
+
+
+def record_turn(session_id: str, user_message: str, assistant_message: str):
+    """Append one exchange; anything beyond MAX_HISTORY_TURNS moves into the summary."""
+    with _lock:
+        sess = _sessions.get(session_id)
+        if not sess:
+            return
+        sess["turns"].append({"role": "user", "content": user_message})
+        sess["turns"].append({"role": "assistant", "content": assistant_message})
+        while len(sess["turns"]) > MAX_HISTORY_TURNS:
+            sess["summary"].append(clip(summarize_turn(sess["turns"].pop(0)), 60))
+        # Oldest gists fall off once the summary outgrows its budget
+        while len(sess["summary"]) > 1 and \
+                estimate_tokens(SUMMARY_PREFIX + " | ".join(sess["summary"])) > SUMMARY_TOKEN_BUDGET:
+            sess["summary"].pop(0)
+        sess["last_used"] = time.time()
+
+
+def end_session(session_id: str):
+    with _lock:
+        _sessions.pop(session_id, None)
+
+
+def stats() -> dict:
+    with _lock:
+        return {"active_sessions": len(_sessions), "max_sessions": MAX_SESSIONS, "ttl_seconds": SESSION_TTL_SECONDS}
@@ -1,61 +1,624 @@
+import base64
+import bisect
 import json
 import os
+import re
+import queue
+import sqlite3
+import threading
+import time
 import uuid
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 
+import players
+
+# SQLite (WAL mode) store for the coach portal. coach_data.json is the old
+# whole-file store; it is imported once into the database on first use.
 DB_FILE = os.path.join(os.path.dirname(__file__), "coach_data.json")
+DB_PATH = os.getenv("COACH_DB_PATH", os.path.join(os.path.dirname(__file__), "coach_data.db"))
+
+COLLECTIONS = ["player_notes", "injuries", "game_notes", "scouting_reports", "custom_player_data"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS player_notes (
+    id TEXT PRIMARY KEY, player_name TEXT, note TEXT, category TEXT, coach TEXT, created_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_player_notes_player  ON player_notes(player_name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_player_notes_created ON player_notes(created_at);
+
+CREATE TABLE IF NOT EXISTS injuries (
+    id TEXT PRIMARY KEY, player_name TEXT, injury_type TEXT, expected_return TEXT, notes TEXT,
+    active INTEGER NOT NULL DEFAULT 1, created_at TEXT, resolved_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_injuries_player  ON injuries(player_name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_injuries_active  ON injuries(active, created_at);
+CREATE INDEX IF NOT EXISTS idx_injuries_created ON injuries(created_at);
+
+CREATE TABLE IF NOT EXISTS game_notes (
+    id TEXT PRIMARY KEY, opponent TEXT, note TEXT, game_date TEXT, category TEXT, created_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_game_notes_opponent ON game_notes(opponent COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_game_notes_created  ON game_notes(created_at);
+
+CREATE TABLE IF NOT EXISTS scouting_reports (
+    id TEXT PRIMARY KEY, opponent TEXT, formation TEXT, key_players TEXT, strengths TEXT,
+    weaknesses TEXT, tactical_notes TEXT, created_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_scouting_opponent ON scouting_reports(opponent COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_scouting_created  ON scouting_reports(created_at);
+
+CREATE TABLE IF NOT EXISTS custom_player_data (
+    id TEXT PRIMARY KEY, player_name TEXT NOT NULL, data TEXT NOT NULL DEFAULT '{}',
+    created_at TEXT, updated_at TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_custom_player ON custom_player_data(player_name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_custom_created ON custom_player_data(created_at);
+
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+# Coach records about a player carry the canonical id from players.py
+PLAYER_TABLES = ("player_notes", "injuries", "custom_player_data")
+
+# Full-text index over every piece of coach-written text. The FTS rowid is the
+# source rowid * 4 + a per-table code, so triggers can find a row's entry
+# without scanning.
+SEARCH_SOURCES = {
+    # kind:           (code, table,              title column,  body expression)
+    "player_note":     (0, "player_notes",     "player_name", "{r}.note"),
+    "injury":          (1, "injuries",         "player_name", "coalesce({r}.injury_type,'') || ' ' || coalesce({r}.notes,'')"),
+    "game_note":       (2, "game_notes",       "opponent",    "{r}.note"),
+    "scouting_report": (3, "scouting_reports", "opponent",
+                        " || ' ' || ".join(f"coalesce({{r}}.{c},'')" for c in ("formation", "key_players", "strengths",
+                                                                          "weaknesses", "tactical_notes"))),
+}
+
+SEARCH_SCHEMA = "CREATE VIRTUAL TABLE IF NOT EXISTS coach_fts USING fts5(kind UNINDEXED, ref_id UNINDEXED, title, body, tokenize='porter unicode61');\n" + "".join(
+    f"""
+CREATE TRIGGER IF NOT EXISTS {table}_fts_ai AFTER INSERT ON {table} BEGIN
+    INSERT INTO coach_fts(rowid, kind, ref_id, title, body)
+    VALUES (new.rowid * 4 + {code}, '{kind}', new.id, new.{title}, {body.format(r="new")});
+END;
+CREATE TRIGGER IF NOT EXISTS {table}_fts_ad AFTER DELETE ON {table} BEGIN
+    DELETE FROM coach_fts WHERE rowid = old.rowid * 4 + {code};
+END;
+CREATE TRIGGER IF NOT EXISTS {table}_fts_au AFTER UPDATE ON {table} BEGIN
+    UPDATE coach_fts SET title = new.{title}, body = {body.format(r="new")} WHERE rowid = old.rowid * 4 + {code};
+END;
+""" for kind, (code, table, title, body) in SEARCH_SOURCES.items())
+
+# The WAL file is the append-only journal: a commit appends its pages and, with
+# synchronous=FULL, fsyncs it before returning, so every committed write survives
+# a power cut. The background compactor folds the journal back into the main file
+# off the request path. SQLite's own auto-checkpoint stays on as a backstop at
+# twice COACH_WAL_MAX_BYTES, so the journal stays bounded even if the compactor
+# stalls or dies.
+COMPACT_INTERVAL = float(os.getenv("COACH_COMPACT_INTERVAL", "30"))
+WAL_MAX_BYTES    = int(os.getenv("COACH_WAL_MAX_BYTES", str(4 * 1024 * 1024)))
+
+_local = threading.local()
+_init_lock = threading.Lock()
+_initialized = set()
+_compactor = None
+_compactions = {"runs": 0, "truncated": 0, "bytes_compacted": 0, "last": None}
+
+
+def _conn() -> sqlite3.Connection:
+    """One connection per thread (FastAPI runs sync endpoints in a threadpool)."""
+    conn = getattr(_local, "conn", None)
+    if conn is None or getattr(_local, "path", None) != DB_PATH:
+        conn = sqlite3.connect(DB_PATH, timeout=10)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        # FULL fsyncs the WAL on every commit, so a write is durable once _write() returns;
+        # the writer thread's group commit makes each batch cost one fsync instead of one per write
+        conn.execute("PRAGMA synchronous=FULL")
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        conn.execute(f"PRAGMA wal_autocheckpoint={max(2 * WAL_MAX_BYTES // page_size, 1)}")
+        _local.conn, _local.path = conn, DB_PATH
+        _init(conn)
+    return conn
+
 
-def _load() -> dict:
-    if not os.path.exists(DB_FILE):
-        return {"player_notes": [], "injuries": [], "game_notes": [], "scouting_reports": [], "custom_player_data": []}
+def _init(conn: sqlite3.Connection):
+    with _init_lock:
+        if DB_PATH in _initialized:
+            return
+        conn.executescript(SCHEMA)
+        conn.executescript(SEARCH_SCHEMA)
+        _add_player_ids(conn)
+        migrate_from_json(conn)
+        _build_search_index(conn)
+        _initialized.add(DB_PATH)
+        _start_compactor()
+
+
+def _add_player_ids(conn: sqlite3.Connection):
+    for table in PLAYER_TABLES:
+        if "player_id" not in {r[1] for r in conn.execute(f"PRAGMA table_info({table})")}:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN player_id TEXT")
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_pid ON {table}(player_id)")
+    conn.commit()
+
+
+# ── COMPACTION ──
+def _wal_bytes() -> int:
     try:
-        with open(DB_FILE, "r") as f:
+        return os.path.getsize(DB_PATH + "-wal")
+    except OSError:
+        return 0
+
+
+def compact(force: bool = False) -> dict:
+    """
+    Checkpoint the WAL journal into the main database file. A PASSIVE
+    checkpoint never blocks readers or writers; once the journal has grown past
+    COACH_WAL_MAX_BYTES (or force=True) it is checkpointed and truncated.
+    """
+    wal = _wal_bytes()
+    if not wal and not force:
+        return {"wal_bytes": 0, "checkpointed_pages": 0, "truncated": False}
+    truncate = force or wal > WAL_MAX_BYTES
+    with _cache_lock:
+        # Checkpointing touches the files without changing any rows, so keep a
+        # cache that was up to date from reloading afterwards
+        fresh = _cache["sig"] == _signature()
+        busy, _, pages = _conn().execute(f"PRAGMA wal_checkpoint({'TRUNCATE' if truncate else 'PASSIVE'})").fetchone()
+        if fresh:
+            _cache["sig"] = _signature()
+    _compactions["runs"] += 1
+    _compactions["truncated"] += int(truncate and not busy)
+    _compactions["bytes_compacted"] += wal
+    _compactions["last"] = datetime.utcnow().isoformat()
+    return {"wal_bytes": wal, "checkpointed_pages": max(pages, 0), "truncated": bool(truncate and not busy)}
+
+
+def _compact_loop():
+    while True:
+        time.sleep(COMPACT_INTERVAL)
+        try:
+            compact()
+        except Exception as e:
+            print(f"  ⚠️ Coach DB compaction failed: {e}")
+
+
+def _start_compactor():
+    global _compactor
+    if COMPACT_INTERVAL <= 0 or (_compactor and _compactor.is_alive()):
+        return
+    _compactor = threading.Thread(target=_compact_loop, name="coach-db-compactor", daemon=True)
+    _compactor.start()
+
+
+def journal_stats() -> dict:
+    return {"path": DB_PATH, "wal_bytes": _wal_bytes(), "wal_max_bytes": WAL_MAX_BYTES,
+            "compact_interval": COMPACT_INTERVAL, **_compactions}
+
+
+def _rows(sql: str, params=()) -> List[dict]:
+    return [dict(r) for r in _conn().execute(sql, params)]
+
+
+# ── MIGRATION ──
+def _load_json(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r") as f:
             return json.load(f)
     except:
-        return {"player_notes": [], "injuries": [], "game_notes": [], "scouting_reports": [], "custom_player_data": []}
+        return {}
+
+
+def migrate_from_json(conn: sqlite3.Connection, path: str = DB_FILE) -> int:
+    """One-shot import of the legacy coach_data.json. Returns the number of records imported."""
+    if conn.execute("SELECT 1 FROM meta WHERE key = 'json_migrated'").fetchone():
+        return 0
+    data = _load_json(path)
+    count = 0
+    with conn:
+        for n in data.get("player_notes", []):
+            conn.execute("INSERT OR IGNORE INTO player_notes (id, player_name, note, category, coach, created_at) "
+                         "VALUES (?,?,?,?,?,?)",
+                         (n.get("id") or str(uuid.uuid4()), n.get("player_name"), n.get("note"),
+                          n.get("category"), n.get("coach"), n.get("created_at")))
+            count += 1
+        for i in data.get("injuries", []):
+            conn.execute("INSERT OR IGNORE INTO injuries (id, player_name, injury_type, expected_return, notes, active, "
+                         "created_at, resolved_at) VALUES (?,?,?,?,?,?,?,?)",
+                         (i.get("id") or str(uuid.uuid4()), i.get("player_name"), i.get("injury_type"),
+                          i.get("expected_return"), i.get("notes"), 1 if i.get("active", True) else 0,
+                          i.get("created_at"), i.get("resolved_at")))
+            count += 1
+        for g in data.get("game_notes", []):
+            conn.execute("INSERT OR IGNORE INTO game_notes VALUES (?,?,?,?,?,?)",
+                         (g.get("id") or str(uuid.uuid4()), g.get("opponent"), g.get("note"),
+                          g.get("game_date"), g.get("category"), g.get("created_at")))
+            count += 1
+        for r in data.get("scouting_reports", []):
+            conn.execute("INSERT OR IGNORE INTO scouting_reports VALUES (?,?,?,?,?,?,?,?)",
+                         (r.get("id") or str(uuid.uuid4()), r.get("opponent"), r.get("formation"),
+                          r.get("key_players"), r.get("strengths"), r.get("weaknesses"),
+                          r.get("tactical_notes"), r.get("created_at")))
+            count += 1
+        for p in data.get("custom_player_data", []):
+            extra = {k: v for k, v in p.items() if k not in ("id", "player_name", "created_at", "updated_at")}
+            conn.execute("INSERT OR IGNORE INTO custom_player_data (id, player_name, data, created_at, updated_at) "
+                         "VALUES (?,?,?,?,?)",
+                         (p.get("id") or str(uuid.uuid4()), p.get("player_name", ""), json.dumps(extra),
+                          p.get("created_at"), p.get("updated_at")))
+            count += 1
+        conn.execute("INSERT INTO meta VALUES ('json_migrated', ?)", (datetime.utcnow().isoformat(),))
+    if count:
+        print(f"  📦 Migrated {count} coach records from {os.path.basename(path)} into {os.path.basename(DB_PATH)}")
+    return count
+
+
+# ── IN-MEMORY CACHE ──
+# Every collection is held in memory, ordered by created_at, and kept current
+# by write-through on each mutation, so reads never query the database. The
+# database files are stat()ed at most once per COACH_CACHE_CHECK_INTERVAL
+# seconds and a changed mtime/size (an edit from another process) triggers a
+# full reload.
+CACHE_CHECK_INTERVAL = float(os.getenv("COACH_CACHE_CHECK_INTERVAL", "1.0"))
+
+_cache_lock = threading.RLock()
+_cache = {"path": None, "sig": None, "checked": 0.0, "views": None}
+
+
+def _signature() -> tuple:
+    sig = []
+    for path in (DB_PATH, DB_PATH + "-wal"):
+        try:
+            st = os.stat(path)
+            sig.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            sig.append(None)
+    return tuple(sig)
+
+
+def _with_pid(row: dict) -> dict:
+    # Rows written before ids existed fall back to the name's own slug until relink_players() runs
+    if not row.get("player_id"):
+        row["player_id"] = players.player_id(row.get("player_name"))
+    return row
+
+
+def _injury(row: dict) -> dict:
+    _with_pid(row)
+    row["active"] = bool(row["active"])
+    if row.get("resolved_at") is None:
+        row.pop("resolved_at", None)
+    return row
+
+
+def _custom(row: dict) -> dict:
+    entry = {"id": row["id"], "player_name": row["player_name"], "created_at": row["created_at"],
+             "player_id": row.get("player_id") or players.player_id(row["player_name"])}
+    entry.update(json.loads(row["data"] or "{}"))
+    if row.get("updated_at"):
+        entry["updated_at"] = row["updated_at"]
+    return entry
+
+
+def _time_view(rows: List[dict]) -> dict:
+    """
+    rows arrive oldest-first with ties newest-inserted-first, so reading the
+    list backwards gives the old sorted(..., reverse=True) order: newest
+    first, ties in insertion order.
+    """
+    view = {"keys": [r.get("created_at") or "" for r in rows], "items": rows,
+            "by_id": {r["id"]: r for r in rows}, "by_player": {}}
+    for r in rows:
+        if "player_id" in r:
+            view["by_player"].setdefault(r["player_id"], []).append(r)
+    return view
+
+
+def _reload():
+    order = "ORDER BY created_at ASC, rowid DESC"
+    views = {
+        "player_notes":     _time_view([_with_pid(r) for r in _rows(f"SELECT * FROM player_notes {order}")]),
+        "injuries":         _time_view([_injury(r) for r in _rows(f"SELECT * FROM injuries {order}")]),
+        "game_notes":       _time_view(_rows(f"SELECT * FROM game_notes {order}")),
+        "scouting_reports": _time_view(_rows(f"SELECT * FROM scouting_reports {order}")),
+    }
+    custom = [_custom(r) for r in _rows("SELECT * FROM custom_player_data ORDER BY rowid")]
+    views["custom_player_data"] = {"items": custom, "by_player": {c["player_id"]: c for c in custom}}
+    _cache.update(path=DB_PATH, sig=_signature(), checked=time.monotonic(), views=views)
+
+
+def _views() -> dict:
+    with _cache_lock:
+        now = time.monotonic()
+        if _cache["views"] is None or _cache["path"] != DB_PATH:
+            _conn()
+            _reload()
+        elif now - _cache["checked"] >= CACHE_CHECK_INTERVAL:
+            _cache["checked"] = now
+            if _signature() != _cache["sig"]:
+                _reload()
+        return _cache["views"]
+
+
+def _wrote():
+    """Our own write changed the files; don't mistake that for an external edit."""
+    _cache["sig"] = _signature()
+
+
+def _insert(name: str, entry: dict):
+    view = _views()[name]
+    if entry["id"] in view["by_id"]:
+        return  # first read of this process: the reload already picked the row up
+    key = entry.get("created_at") or ""
+    i = bisect.bisect_left(view["keys"], key)
+    view["keys"].insert(i, key)
+    view["items"].insert(i, entry)
+    view["by_id"][entry["id"]] = entry
+    if "player_id" in entry:
+        view["by_player"].setdefault(entry["player_id"], []).append(entry)
+
+
+def _remove(name: str, entry_id: str):
+    view = _views()[name]
+    entry = view["by_id"].pop(entry_id, None)
+    if entry is None:
+        return
+    i = bisect.bisect_left(view["keys"], entry.get("created_at") or "")
+    while view["items"][i] is not entry:
+        i += 1
+    del view["keys"][i]
+    del view["items"][i]
+    same_player = view["by_player"].get(entry.get("player_id"), [])
+    if entry in same_player:
+        same_player.remove(entry)
+
+
+def page_cursor(entry: dict) -> str:
+    """Opaque cursor that resumes a newest-first listing just after entry."""
+    return base64.urlsafe_b64encode(f"{entry.get('created_at') or ''}|{entry['id']}".encode()).decode()
+
+
+def _cursor_start(view: dict, cursor: str) -> int:
+    """Index of the first item after the cursor, walking items backwards (newest first)."""
+    try:
+        created_at, entry_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+    except Exception:
+        raise ValueError("invalid cursor")
+    keys, items = view["keys"], view["items"]
+    lo, hi = bisect.bisect_left(keys, created_at), bisect.bisect_right(keys, created_at)
+    for i in range(lo, hi):
+        if items[i]["id"] == entry_id:
+            return i - 1
+    return lo - 1  # cursor row was deleted: continue with the next older timestamp
+
+
+def _newest_first(name: str, keep=None, limit: Optional[int] = None, cursor: Optional[str] = None,
+                  since: Optional[str] = None, until: Optional[str] = None) -> List[dict]:
+    """
+    Newest-first slice of a collection: O(log n) to find the start from the
+    cursor / `until` bound, then a walk that stops after `limit` matches or at
+    `since`. since is inclusive, until exclusive (ISO dates or timestamps).
+    """
+    view = _views()[name]
+    keys, items = view["keys"], view["items"]
+    i = len(items) - 1
+    if cursor:
+        i = _cursor_start(view, cursor)
+    if until:
+        i = min(i, bisect.bisect_left(keys, until) - 1)
+    stop = bisect.bisect_left(keys, since) if since else 0
+    out = []
+    while i >= stop and (limit is None or len(out) < limit):
+        if keep is None or keep(items[i]):
+            out.append(dict(items[i]))
+        i -= 1
+    return out
+
+
+def _contains(field: str, value: Optional[str]):
+    if not value:
+        return None
+    q = value.lower()
+    return lambda r: q in (r.get(field) or "").lower()
+
+
+def count(name: str) -> int:
+    with _cache_lock:
+        return len(_views()[name]["items"])
+
+
+# ── WRITER ──
+# All mutations go through one writer thread. Jobs that queue up while a commit
+# is in flight, or arrive within COACH_GROUP_COMMIT_MS of the first, share one
+# transaction; each job runs under its own savepoint so a failing write is
+# rolled back alone. Callers block until their batch has committed, then the
+# cache is updated in submission order.
+GROUP_COMMIT_WINDOW = float(os.getenv("COACH_GROUP_COMMIT_MS", "2")) / 1000
+GROUP_COMMIT_MAX    = int(os.getenv("COACH_GROUP_COMMIT_MAX", "256"))
+
+_write_queue = queue.Queue()
+_writer = None
+_writer_lock = threading.Lock()
+_write_stats = {"writes": 0, "commits": 0, "failed": 0, "max_batch": 0}
+
+
+def _write(fn, apply=None):
+    """Run fn(conn) on the writer thread; once committed, apply(result) updates the cache. Returns the result."""
+    job = {"fn": fn, "apply": apply, "done": threading.Event(), "result": None, "error": None}
+    _start_writer()
+    _write_queue.put(job)
+    job["done"].wait()
+    if job["error"] is not None:
+        raise job["error"]
+    return job["result"]
+
+
+def _start_writer():
+    global _writer
+    if _writer and _writer.is_alive():
+        return
+    with _writer_lock:
+        if not (_writer and _writer.is_alive()):
+            _writer = threading.Thread(target=_writer_loop, name="coach-db-writer", daemon=True)
+            _writer.start()
+
+
+def _writer_loop():
+    while True:
+        batch = [_write_queue.get()]
+        deadline = time.monotonic() + GROUP_COMMIT_WINDOW
+        while len(batch) < GROUP_COMMIT_MAX:
+            try:
+                batch.append(_write_queue.get_nowait())
+            except queue.Empty:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(_write_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+        _commit(batch)
+
+
+def _commit(batch: list):
+    try:
+        conn = _conn()
+        conn.execute("BEGIN IMMEDIATE")
+        for job in batch:
+            conn.execute("SAVEPOINT job")
+            try:
+                job["result"] = job["fn"](conn)
+                conn.execute("RELEASE job")
+            except Exception as e:
+                conn.execute("ROLLBACK TO job")
+                conn.execute("RELEASE job")
+                job["error"] = e
+        conn.commit()
+    except Exception as e:
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+        for job in batch:
+            if job["error"] is None:
+                job["error"] = e
+    ok = [job for job in batch if job["error"] is None]
+    with _cache_lock:
+        if ok:
+            _wrote()
+        for job in ok:
+            try:
+                if job["apply"]:
+                    job["apply"](job["result"])
+            except Exception as e:
+                # The row is committed; rebuild the cache from disk rather than serve a wrong view
+                print(f"  ⚠️ Coach cache update failed, reloading: {e}")
+                _cache["views"] = None
+    _write_stats["writes"] += len(batch)
+    _write_stats["commits"] += 1
+    _write_stats["failed"] += len(batch) - len(ok)
+    _write_stats["max_batch"] = max(_write_stats["max_batch"], len(batch))
+    for job in batch:
+        job["done"].set()
+
+
+def writer_stats() -> dict:
+    commits = _write_stats["commits"]
+    return {**_write_stats, "queued": _write_queue.qsize(),
+            "writes_per_commit": round(_write_stats["writes"] / commits, 2) if commits else 0.0}
+
+
+# ── SEARCH ──
+SEARCH_MAX_RESULTS = 100
+
+
+def _build_search_index(conn: sqlite3.Connection):
+    """Index rows written before the search table existed. Later writes are indexed by the triggers."""
+    if conn.execute("SELECT 1 FROM meta WHERE key = 'fts_built'").fetchone():
+        return
+    with conn:
+        conn.execute("DELETE FROM coach_fts")
+        for kind, (code, table, title, body) in SEARCH_SOURCES.items():
+            conn.execute(f"INSERT INTO coach_fts(rowid, kind, ref_id, title, body) "
+                         f"SELECT rowid * 4 + {code}, '{kind}', id, {title}, {body.format(r=table)} FROM {table}")
+        conn.execute("INSERT INTO meta VALUES ('fts_built', ?)", (datetime.utcnow().isoformat(),))
+
+
+def _match_query(q: str) -> str:
+    # Quote every term so user input can't inject FTS syntax; the last term
+    # matches as a prefix so results appear while the coach is still typing
+    terms = re.findall(r"\w+", q.lower())
+    if not terms:
+        return ""
+    return " ".join(f'"{t}"' for t in terms[:-1]) + (" " if len(terms) > 1 else "") + f'"{terms[-1]}"*'
+
+
+def search(q: str, kinds: Optional[List[str]] = None, limit: int = 20) -> List[dict]:
+    """
+    BM25-ranked search across player notes, injuries, game notes and scouting
+    reports. Every term must match; names/opponents weigh double the body text.
+    """
+    match = _match_query(q)
+    if not match:
+        return []
+    limit = max(1, min(limit, SEARCH_MAX_RESULTS))
+    where, params = "coach_fts MATCH ?", [match]
+    if kinds:
+        codes = [SEARCH_SOURCES[k][0] for k in kinds if k in SEARCH_SOURCES]
+        if not codes:
+            return []
+        where += f" AND rowid % 4 IN ({','.join('?' * len(codes))})"
+        params += codes
+    rows = _conn().execute(
+        f"SELECT kind, ref_id, bm25(coach_fts, 0, 0, 2.0, 1.0) AS score, "
+        f"snippet(coach_fts, 3, '[', ']', '…', 12) AS snippet "
+        f"FROM coach_fts WHERE {where} ORDER BY score LIMIT ?", params + [limit]).fetchall()
+    with _cache_lock:
+        views = _views()
+        results = []
+        for kind, ref_id, score, snippet in rows:
+            record = views[SEARCH_SOURCES[kind][1]]["by_id"].get(ref_id)
+            results.append({"type": kind, "id": ref_id, "score": round(-score, 4), "snippet": snippet,
+                            "record": dict(record) if record else None})
+    return results
 
-def _save(data: dict):
-    with open(DB_FILE, "w") as f:
-        json.dump(data, f, indent=2)
 
 # ── PLAYER NOTES ──
-def get_player_notes(player_name: Optional[str] = None) -> List[dict]:
-    db = _load()
-    notes = db.get("player_notes", [])
-    if player_name:
-        notes = [n for n in notes if player_name.lower() in n.get("player_name", "").lower()]
-    return sorted(notes, key=lambda x: x.get("created_at", ""), reverse=True)
+def get_player_notes(player_name: Optional[str] = None, limit: Optional[int] = None, cursor: Optional[str] = None,
+                     since: Optional[str] = None, until: Optional[str] = None) -> List[dict]:
+    with _cache_lock:
+        return _newest_first("player_notes", _contains("player_name", player_name), limit, cursor, since, until)
 
 def add_player_note(player_name: str, note: str, category: str = "general", coach: str = "Coach") -> dict:
-    db = _load()
     entry = {
         "id": str(uuid.uuid4()),
         "player_name": player_name,
         "note": note,
         "category": category,
         "coach": coach,
-        "created_at": datetime.utcnow().isoformat()
+        "created_at": datetime.utcnow().isoformat(),
+        "player_id": players.resolve_id(player_name),
     }
-    db["player_notes"].append(entry)
-    _save(db)
+    _write(lambda conn: conn.execute("INSERT INTO player_notes (id, player_name, note, category, coach, created_at, "
+                                     "player_id) VALUES (:id, :player_name, :note, :category, :coach, :created_at, "
+                                     ":player_id)", entry),
+           lambda _: _insert("player_notes", dict(entry)))
     return entry
 
 def delete_player_note(note_id: str):
-    db = _load()
-    db["player_notes"] = [n for n in db["player_notes"] if n.get("id") != note_id]
-    _save(db)
+    _write(lambda conn: conn.execute("DELETE FROM player_notes WHERE id = ?", (note_id,)),
+           lambda _: _remove("player_notes", note_id))
 
 # ── INJURIES ──
-def get_injuries(active_only: bool = True) -> List[dict]:
-    db = _load()
-    injuries = db.get("injuries", [])
-    if active_only:
-        injuries = [i for i in injuries if i.get("active", True)]
-    return sorted(injuries, key=lambda x: x.get("created_at", ""), reverse=True)
+def get_injuries(active_only: bool = True, limit: Optional[int] = None, cursor: Optional[str] = None,
+                 since: Optional[str] = None, until: Optional[str] = None) -> List[dict]:
+    with _cache_lock:
+        return _newest_first("injuries", (lambda i: i["active"]) if active_only else None, limit, cursor, since, until)
 
 def add_injury(player_name: str, injury_type: str, expected_return: Optional[str] = None, notes: str = "") -> dict:
-    db = _load()
     entry = {
         "id": str(uuid.uuid4()),
         "player_name": player_name,
@@ -63,30 +626,34 @@ def add_injury(player_name: str, injury_type: str, expected_return: Optional[str
         "expected_return": expected_return,
         "notes": notes,
         "active": True,
-        "created_at": datetime.utcnow().isoformat()
+        "created_at": datetime.utcnow().isoformat(),
+        "player_id": players.resolve_id(player_name),
     }
-    db["injuries"].append(entry)
-    _save(db)
+    _write(lambda conn: conn.execute("INSERT INTO injuries (id, player_name, injury_type, expected_return, notes, "
+                                     "active, created_at, player_id) VALUES (:id, :player_name, :injury_type, "
+                                     ":expected_return, :notes, 1, :created_at, :player_id)", entry),
+           lambda _: _insert("injuries", dict(entry)))
     return entry
 
 def resolve_injury(injury_id: str):
-    db = _load()
-    for i in db["injuries"]:
-        if i.get("id") == injury_id:
-            i["active"] = False
-            i["resolved_at"] = datetime.utcnow().isoformat()
-    _save(db)
+    resolved_at = datetime.utcnow().isoformat()
+
+    def apply(_):
+        entry = _views()["injuries"]["by_id"].get(injury_id)
+        if entry:
+            entry["active"] = False
+            entry["resolved_at"] = resolved_at
+
+    _write(lambda conn: conn.execute("UPDATE injuries SET active = 0, resolved_at = ? WHERE id = ?",
+                                     (resolved_at, injury_id)), apply)
 
 # ── GAME NOTES ──
-def get_game_notes(opponent: Optional[str] = None) -> List[dict]:
-    db = _load()
-    notes = db.get("game_notes", [])
-    if opponent:
-        notes = [n for n in notes if opponent.lower() in n.get("opponent", "").lower()]
-    return sorted(notes, key=lambda x: x.get("created_at", ""), reverse=True)
+def get_game_notes(opponent: Optional[str] = None, limit: Optional[int] = None, cursor: Optional[str] = None,
+                   since: Optional[str] = None, until: Optional[str] = None) -> List[dict]:
+    with _cache_lock:
+        return _newest_first("game_notes", _contains("opponent", opponent), limit, cursor, since, until)
 
 def add_game_note(opponent: str, note: str, game_date: Optional[str] = None, category: str = "general") -> dict:
-    db = _load()
     entry = {
         "id": str(uuid.uuid4()),
         "opponent": opponent,
@@ -95,22 +662,20 @@ def add_game_note(opponent: str, note: str, game_date: Optional[str] = None, cat
         "category": category,
         "created_at": datetime.utcnow().isoformat()
     }
-    db["game_notes"].append(entry)
-    _save(db)
+    _write(lambda conn: conn.execute("INSERT INTO game_notes VALUES (:id, :opponent, :note, :game_date, "
+                                     ":category, :created_at)", entry),
+           lambda _: _insert("game_notes", dict(entry)))
     return entry
 
 # ── SCOUTING REPORTS ──
-def get_scouting_reports(opponent: Optional[str] = None) -> List[dict]:
-    db = _load()
-    reports = db.get("scouting_reports", [])
-    if opponent:
-        reports = [r for r in reports if opponent.lower() in r.get("opponent", "").lower()]
-    return sorted(reports, key=lambda x: x.get("created_at", ""), reverse=True)
+def get_scouting_reports(opponent: Optional[str] = None, limit: Optional[int] = None, cursor: Optional[str] = None,
+                         since: Optional[str] = None, until: Optional[str] = None) -> List[dict]:
+    with _cache_lock:
+        return _newest_first("scouting_reports", _contains("opponent", opponent), limit, cursor, since, until)
 
 def add_scouting_report(opponent: str, formation: Optional[str] = None, key_players: Optional[str] = None,
                          strengths: Optional[str] = None, weaknesses: Optional[str] = None,
                          tactical_notes: Optional[str] = None) -> dict:
-    db = _load()
     entry = {
         "id": str(uuid.uuid4()),
         "opponent": opponent,
@@ -121,45 +686,195 @@ def add_scouting_report(opponent: str, formation: Optional[str] = None, key_play
         "tactical_notes": tactical_notes,
         "created_at": datetime.utcnow().isoformat()
     }
-    db["scouting_reports"].append(entry)
-    _save(db)
+    _write(lambda conn: conn.execute("INSERT INTO scouting_reports VALUES (:id, :opponent, :formation, :key_players, "
+                                     ":strengths, :weaknesses, :tactical_notes, :created_at)", entry),
+           lambda _: _insert("scouting_reports", dict(entry)))
     return entry
 
 # ── CUSTOM PLAYER DATA ──
 def get_custom_player_data(player_name: Optional[str] = None) -> List[dict]:
-    db = _load()
-    players = db.get("custom_player_data", [])
-    if player_name:
-        players = [p for p in players if player_name.lower() in p.get("player_name", "").lower()]
-    return players
+    with _cache_lock:
+        rows = _views()["custom_player_data"]["items"]
+        if player_name:
+            q = player_name.lower()
+            return [dict(p) for p in rows if q in p.get("player_name", "").lower()]
+        return [dict(p) for p in rows]
 
-def upsert_custom_player_data(player_name: str, **kwargs) -> dict:
-    db = _load()
-    players = db.get("custom_player_data", [])
-    existing = next((p for p in players if p["player_name"].lower() == player_name.lower()), None)
+def _upsert_custom(conn: sqlite3.Connection, player_name: str, updates: dict, now: str) -> dict:
+    # Read inside the write transaction so two upserts for the same player in
+    # one batch merge instead of both inserting
+    pid = players.resolve_id(player_name)
+    # An imported export carries its source database's id/created_at: they only name a new row,
+    # never replace an existing player's (the UPDATE below is keyed on that row's id)
+    updates = dict(updates)
+    origin = {k: updates.pop(k) for k in ("id", "created_at") if k in updates}
+    row = conn.execute("SELECT * FROM custom_player_data WHERE player_id = ? OR player_name = ? COLLATE NOCASE "
+                       "ORDER BY player_id = ? DESC LIMIT 1", (pid, player_name, pid)).fetchone()
+    if row:
+        entry = {**_custom(dict(row)), **updates, "player_id": pid, "updated_at": now}
+    else:
+        known = players.get_player(pid)
+        taken = origin.get("id") and conn.execute("SELECT 1 FROM custom_player_data WHERE id = ?",
+                                                  (origin["id"],)).fetchone()
+        entry = {"id": origin["id"] if origin.get("id") and not taken else str(uuid.uuid4()),
+                 "player_name": known["name"] if known else player_name,
+                 "created_at": origin.get("created_at") or now, "player_id": pid, **updates}
+    data = {k: v for k, v in entry.items() if k not in ("id", "player_name", "created_at", "updated_at", "player_id")}
+    if row:
+        conn.execute("UPDATE custom_player_data SET data = ?, updated_at = ?, player_id = ? WHERE id = ?",
+                     (json.dumps(data), now, pid, entry["id"]))
+    else:
+        conn.execute("INSERT INTO custom_player_data (id, player_name, data, created_at, player_id) VALUES (?,?,?,?,?)",
+                     (entry["id"], entry["player_name"], json.dumps(data), entry["created_at"], pid))
+    return entry
+
+def _apply_custom(entry: dict):
+    view = _views()["custom_player_data"]
+    existing = view["by_player"].get(entry["player_id"])
+    if not existing or existing["id"] != entry["id"]:
+        # The row was keyed under an older id (relinked since) or this is the first write for it
+        existing = next((c for c in view["items"] if c["id"] == entry["id"]), None)
     if existing:
-        for k, v in kwargs.items():
-            if v is not None:
-                existing[k] = v
-        existing["updated_at"] = datetime.utcnow().isoformat()
-        entry = existing
+        view["by_player"].pop(existing["player_id"], None)
+        existing.clear()
+        existing.update(entry)
     else:
-        entry = {"id": str(uuid.uuid4()), "player_name": player_name, "created_at": datetime.utcnow().isoformat()}
-        for k, v in kwargs.items():
-            if v is not None:
-                entry[k] = v
-        players.append(entry)
-    db["custom_player_data"] = players
-    _save(db)
+        existing = dict(entry)
+        view["items"].append(existing)
+    view["by_player"][existing["player_id"]] = existing
+
+def upsert_custom_player_data(player_name: str, **kwargs) -> dict:
+    now = datetime.utcnow().isoformat()
+    updates = {k: v for k, v in kwargs.items() if v is not None}
+    entry = _write(lambda conn: _upsert_custom(conn, player_name, updates, now), _apply_custom)
+    return dict(entry)
+
+# ── PLAYER IDENTITY ──
+def get_player_records(pid: str) -> dict:
+    """Everything the coaches have recorded about one player id (dict lookups, no name scans)."""
+    with _cache_lock:
+        views = _views()
+        newest = lambda rows: sorted((dict(r) for r in rows), key=lambda r: r.get("created_at") or "", reverse=True)
+        custom = views["custom_player_data"]["by_player"].get(pid)
+        return {
+            "notes": newest(views["player_notes"]["by_player"].get(pid, [])),
+            "injuries": [i for i in newest(views["injuries"]["by_player"].get(pid, [])) if i["active"]],
+            "custom": dict(custom) if custom else None,
+        }
+
+
+def _relink(conn: sqlite3.Connection) -> int:
+    changed = 0
+    for table in PLAYER_TABLES:
+        for rowid, name, pid in conn.execute(f"SELECT rowid, player_name, player_id FROM {table}").fetchall():
+            if pid and players.is_known(pid):
+                continue
+            new = players.resolve_id(name)
+            if new != pid and (players.is_known(new) or not pid):
+                conn.execute(f"UPDATE {table} SET player_id = ? WHERE rowid = ?", (new, rowid))
+                changed += 1
+    return changed
+
+
+def relink_players() -> int:
+    """
+    Point coach records at canonical ids once the roster index is (re)built;
+    records written before the scrape finished only had their name's slug.
+    """
+    def reload(_):
+        _cache["views"] = None
+    changed = _write(_relink, reload)
+    if changed:
+        print(f"  🪪 Linked {changed} coach records to player ids")
+    return changed
+
+
+# ── BULK IMPORT / EXPORT ──
+# Stored columns per collection (custom_player_data keeps its extra fields in the data JSON)
+COLUMNS = {
+    "player_notes":     ["id", "player_name", "note", "category", "coach", "created_at", "player_id"],
+    "injuries":         ["id", "player_name", "injury_type", "expected_return", "notes", "active", "created_at",
+                         "resolved_at", "player_id"],
+    "game_notes":       ["id", "opponent", "note", "game_date", "category", "created_at"],
+    "scouting_reports": ["id", "opponent", "formation", "key_players", "strengths", "weaknesses", "tactical_notes",
+                         "created_at"],
+}
+
+
+def _import_entry(collection: str, row: dict, now: str) -> dict:
+    entry = {c: row.get(c) for c in COLUMNS[collection]}
+    entry["id"] = entry["id"] or str(uuid.uuid4())
+    entry["created_at"] = entry["created_at"] or now
+    if "player_id" in entry:
+        entry["player_id"] = players.resolve_id(entry["player_name"])
+    if collection == "injuries":
+        entry["active"] = entry["active"] is None or str(entry["active"]).lower() in ("1", "true", "yes")
     return entry
 
+
+def import_rows(collection: str, rows: List[dict]) -> int:
+    """
+    Apply one batch of already-validated rows in a single transaction: all of
+    them land or none do. Rows that carry an existing id replace that record,
+    so re-importing an export is idempotent; custom player data merges per
+    player like upsert_custom_player_data.
+    """
+    if not rows:
+        return 0
+    now = datetime.utcnow().isoformat()
+    if collection == "custom_player_data":
+        def upsert_all(conn):
+            return [_upsert_custom(conn, r["player_name"], {k: v for k, v in r.items()
+                                                            if k != "player_name" and v is not None}, now)
+                    for r in rows]
+        return len(_write(upsert_all, lambda entries: [_apply_custom(e) for e in entries]))
+    if collection not in COLUMNS:
+        raise ValueError(f"unknown collection '{collection}'")
+    cols = COLUMNS[collection]
+    entries = [_import_entry(collection, r, now) for r in rows]
+
+    def insert_all(conn):
+        # DELETE + INSERT rather than INSERT OR REPLACE so the search-index triggers fire
+        conn.executemany(f"DELETE FROM {collection} WHERE id = ?", [(e["id"],) for e in entries])
+        conn.executemany(f"INSERT INTO {collection} ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})",
+                         [tuple(int(e[c]) if c == "active" else e[c] for c in cols) for e in entries])
+
+    def apply(_):
+        for e in entries:
+            _remove(collection, e["id"])
+            _insert(collection, _injury(dict(e)) if collection == "injuries" else dict(e))
+
+    _write(insert_all, apply)
+    return len(entries)
+
+
+def export_rows(collection: str):
+    """(field names, iterator of rows oldest-first) over a point-in-time snapshot of the collection."""
+    if collection not in COLLECTIONS:
+        raise ValueError(f"unknown collection '{collection}'")
+    with _cache_lock:
+        items = list(_views()[collection]["items"])
+    if collection == "custom_player_data":
+        fields = ["id", "player_name", "player_id", "created_at", "updated_at"]
+        for item in items:
+            fields += [k for k in item if k not in fields]
+        return fields, (dict(i) for i in items)
+    return COLUMNS[collection], (dict(i) for i in items)
+
+
 # ── ALL COACH CONTEXT (for AI) ──
+# Chat only shows the newest few of each collection, so only those are copied per request
+CONTEXT_INJURIES = int(os.getenv("COACH_CONTEXT_INJURIES", "20"))
+CONTEXT_NOTES    = int(os.getenv("COACH_CONTEXT_NOTES", "10"))
+CONTEXT_SCOUTING = int(os.getenv("COACH_CONTEXT_SCOUTING", "3"))
+
 def get_all_coach_context() -> dict:
-    db = _load()
-    return {
-        "active_injuries": get_injuries(active_only=True),
-        "player_notes": get_player_notes(),
-        "scouting_reports": get_scouting_reports(),
-        "game_notes": get_game_notes(),
-        "custom_player_data": get_custom_player_data()
-    }
\ No newline at end of file
+    """Newest first, like the list endpoints."""
+    with _cache_lock:
+        return {
+            "active_injuries": get_injuries(active_only=True, limit=CONTEXT_INJURIES),
+            "player_notes": get_player_notes(limit=CONTEXT_NOTES),
+            "scouting_reports": get_scouting_reports(limit=CONTEXT_SCOUTING),
+            "game_notes": get_game_notes(limit=CONTEXT_NOTES),
+            "custom_player_data": get_custom_player_data()
+        }
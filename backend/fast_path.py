@@ -0,0 +1,245 @@
+"""
+Rule-based fast path for the chat endpoint.
+Recognises simple stat lookups (top scorer, team record, a player's numbers)
+and answers them straight from the in-memory team_data frames with templated
+prose. Anything that doesn't match a template returns None and falls through
+to the LLM in ai_agent.get_ai_response.
+"""
+
+import re
+import numpy as np
+import pandas as pd
+
+from ai_agent import _df_context
+from schedule import SPORT_LABELS
+
+SPORT_PATTERNS = [
+    ("boys_soccer",      re.compile(r"\bboys'?\s+soccer\b")),
+    ("girls_soccer",     re.compile(r"\bgirls'?\s+soccer\b")),
+    ("boys_basketball",  re.compile(r"\bboys'?\s+(basketball|hoops)\b")),
+    ("girls_basketball", re.compile(r"\bgirls'?\s+(basketball|hoops)\b")),
+    ("baseball",         re.compile(r"\bbaseball\b")),
+    ("wrestling",        re.compile(r"\bwrestl(ing|ers?)\b")),
+]
+
+# Which frame holds each sport's roster, in lookup order
+SPORT_FRAMES = {
+    "boys_soccer":      ("field_players", "goalies"),
+    "girls_soccer":     ("field_players", "goalies"),
+    "boys_basketball":  ("players",),
+    "girls_basketball": ("players",),
+    "baseball":         ("batters", "pitchers"),
+    "wrestling":        ("wrestlers",),
+}
+
+# stat keyword → {sport: (frame, column, label, ascending)}
+_SOCCER   = ("boys_soccer", "girls_soccer")
+_HOOPS    = ("boys_basketball", "girls_basketball")
+STATS = [
+    (re.compile(r"\bgoals?\b"),        {s: ("field_players", "Goals", "goals", False) for s in _SOCCER}),
+    (re.compile(r"\bassists?\b"),      {**{s: ("field_players", "Assists", "assists", False) for s in _SOCCER},
+                                        **{s: ("players", "Assists", "assists", False) for s in _HOOPS}}),
+    (re.compile(r"\brebounds?\b"),     {s: ("players", "Rebounds", "rebounds", False) for s in _HOOPS}),
+    (re.compile(r"\bsaves?\b"),        {s: ("goalies", "Saves", "saves", False) for s in _SOCCER}),
+    (re.compile(r"\brbis?\b"),         {"baseball": ("batters", "RBI", "RBI", False)}),
+    (re.compile(r"\bhome runs?\b|\bhrs?\b"), {"baseball": ("batters", "HR", "home runs", False)}),
+    (re.compile(r"\bhits\b"),          {"baseball": ("batters", "H", "hits", False)}),
+    (re.compile(r"\b(batting )?(average|avg)\b"), {"baseball": ("batters", "AVG", "AVG", False)}),
+    (re.compile(r"\bstrikeouts?\b|\bks\b"), {"baseball": ("pitchers", "Strikeouts", "strikeouts", False)}),
+    (re.compile(r"\bera\b"),           {"baseball": ("pitchers", "ERA", "ERA", True)}),
+    (re.compile(r"\bpins?\b"),         {"wrestling": ("wrestlers", "Pins", "pins", False)}),
+    (re.compile(r"\bwins\b"),          {"wrestling": ("wrestlers", "Wins", "wins", False)}),
+    (re.compile(r"\bpoints?\b|\bpts\b"), {**{s: ("field_players", "Points", "points", False) for s in _SOCCER},
+                                          **{s: ("players", "Points", "points", False) for s in _HOOPS}}),
+]
+
+# "top scorer" means goals in soccer and points in basketball
+SCORER_STATS = {
+    **{s: ("field_players", "Goals", "goals", False) for s in _SOCCER},
+    **{s: ("players", "Points", "points", False) for s in _HOOPS},
+}
+
+SCORER_RE  = re.compile(r"\b(top|leading|best|highest|lead(ing)?)\s+(goal\s*)?scorers?\b|\bscored the most\b")
+LEADER_RE  = re.compile(r"\b(who|which player|whos)\b.*\b(most|leads?|leading|top|best|highest|lowest|leader)\b"
+                        r"|\b(leaders?|leading|top \d+)\b")
+TOP_N_RE   = re.compile(r"\btop (\d{1,2})\b")
+RECORD_RE  = re.compile(r"\b(record|win[- ]loss)\b")
+PLAYER_Q_RE = re.compile(r"\b(how many|how much|stats?|numbers|what is|what's|whats|does|has|have)\b")
+
+# Questions the templates can't answer faithfully — always go to the LLM
+SKIP_RE = re.compile(
+    r"\b(why|how come|compare|comparison|versus|vs\.?|should|predict|prediction|better|worse|trend|"
+    r"last (season|year)|previous|history|historical|career|all[- ]time|injur\w*|scouting|opponent|"
+    r"next game|upcoming|schedule|plan|strategy|\d{4})\b"
+)
+
+_stats = {"total": 0, "fast_path": 0, "by_intent": {}}
+_name_cache = {"team_data": None, "index": []}
+
+
+def _detect_sports(text: str) -> list:
+    return [key for key, pat in SPORT_PATTERNS if pat.search(text)]
+
+
+def _frame(team_data: dict, sport: str, key: str):
+    cs = (team_data.get(sport) or {}).get("current_stats") or {}
+    df = cs.get(key)
+    return df if isinstance(df, pd.DataFrame) and not df.empty else None
+
+
+def _season(team_data: dict, sport: str) -> str:
+    cs = (team_data.get(sport) or {}).get("current_stats") or {}
+    return cs.get("season", "this season")
+
+
+def _name_index(team_data: dict) -> list:
+    """(full_name_lower, last_name_lower, sport, frame_key, row_label) for every current player.
+    Rebuilt only when team_data is replaced by a fresh scrape."""
+    if _name_cache["team_data"] is team_data:
+        return _name_cache["index"]
+    index = []
+    for sport, keys in SPORT_FRAMES.items():
+        for key in keys:
+            df = _frame(team_data, sport, key)
+            if df is None or "Player" not in df.columns:
+                continue
+            for label, name in df["Player"].items():
+                full = str(name).strip().lower()
+                if len(full) < 3:
+                    continue
+                last = full.split()[-1]
+                index.append((full, last if len(last) >= 4 else None, sport, key, label))
+    _name_cache["team_data"] = team_data
+    _name_cache["index"] = index
+    return index
+
+
+def _stat_for(text: str, sport: str):
+    for pat, by_sport in STATS:
+        if sport in by_sport and pat.search(text):
+            return by_sport[sport]
+    return None
+
+
+# ── Templates ──
+
+def _answer_record(team_data: dict, sport: str):
+    games = ((team_data.get(sport) or {}).get("fixtures") or {}).get("games")
+    if not isinstance(games, pd.DataFrame) or games.empty or "Outcome" not in games.columns:
+        return None
+    results = [o for o in games["Outcome"].tolist() if o != "—"]
+    if not results:
+        return f"Edison {SPORT_LABELS[sport]} hasn't played any games yet this season."
+    w, l, t = results.count("W"), results.count("L"), results.count("T")
+    streak = 0
+    for r in reversed(results):
+        if r != results[-1]:
+            break
+        streak += 1
+    record = f"{w}-{l}-{t}" if t else f"{w}-{l}"
+    return (
+        f"Edison {SPORT_LABELS[sport]} is {record} this season "
+        f"({round(w / len(results) * 100, 1)}% wins over {len(results)} games), "
+        f"currently on a {streak}{results[-1]} streak."
+    )
+
+
+def _answer_leader(team_data: dict, sport: str, stat: tuple, n: int):
+    key, col, label, ascending = stat
+    df = _frame(team_data, sport, key)
+    if df is None or col not in df.columns:
+        return None
+    players = df["Player"].to_numpy()
+    values = df[col].to_numpy()
+    if col == "ERA" and "IP" in df.columns:
+        keep = df["IP"].to_numpy() > 0
+        players, values = players[keep], values[keep]
+    if not len(values):
+        return None
+    # Stable argsort keeps the same tie order as DataFrame.nlargest / nsmallest
+    order = np.argsort(values if ascending else -values, kind="stable")[:n]
+    fmt = lambda v: f"{v:g}" if isinstance(v, float) else str(v)
+    sport_label = SPORT_LABELS[sport]
+    if n == 1:
+        word = "lowest" if ascending else "most"
+        return f"{players[order[0]]} leads Edison {sport_label} with the {word} {label} this season: {fmt(values[order[0]].item())}."
+    lines = [f"Edison {sport_label} leaders in {label} this season:"]
+    lines += [f"{i}. {players[j]} — {fmt(values[j].item())}" for i, j in enumerate(order, 1)]
+    return "\n".join(lines)
+
+
+def _answer_player(team_data: dict, text: str, sports: list):
+    words = set(re.findall(r"[a-z'\-]+", text))
+    matches = []
+    for full, last, sport, key, label in _name_index(team_data):
+        if sports and sport not in sports:
+            continue
+        if full in text or (last and last in words):
+            matches.append((full, sport, key, label))
+    if not matches:
+        return None
+    # A full name in the question beats surname matches ("Chloe Miller", not every Miller)
+    matches = [m for m in matches if m[0] in text] or matches
+    # Same player in several frames (e.g. batter and pitcher) is fine; two different players is not
+    if len({(full, sport) for full, sport, _, _ in matches}) > 1:
+        return None
+    _, sport, _, _ = matches[0]
+    stat = _stat_for(text, sport)
+    if stat:
+        hit = next((m for m in matches if m[2] == stat[0]), None)
+        if hit:
+            df = _frame(team_data, sport, stat[0])
+            row = df.loc[hit[3]]
+            if stat[1] in df.columns:
+                v = row[stat[1]]
+                v = f"{v:g}" if isinstance(v, float) else v
+                return f"{row['Player']} has {v} {stat[2]} this season for Edison {SPORT_LABELS[sport]}."
+    _, sport, key, label = matches[0]
+    df = _frame(team_data, sport, key)
+    line = _df_context(df.loc[[label]], sport).strip()
+    return f"{line} ({SPORT_LABELS[sport]}, {_season(team_data, sport)})."
+
+
+def try_answer(message: str, team_data: dict):
+    """Return (intent, answer) if the message is a simple stat lookup, else None."""
+    _stats["total"] += 1
+    if not team_data or not message:
+        return None
+    text = message.lower().strip()
+    if len(text) > 160 or SKIP_RE.search(text):
+        return None
+
+    sports = _detect_sports(text)
+    if len(sports) > 1:
+        return None
+    sport = sports[0] if sports else None
+    hit = None
+
+    if sport and RECORD_RE.search(text):
+        hit = ("record", _answer_record(team_data, sport))
+    elif sport and (SCORER_RE.search(text) or LEADER_RE.search(text)):
+        stat = SCORER_STATS.get(sport) if SCORER_RE.search(text) else _stat_for(text, sport)
+        if stat:
+            m = TOP_N_RE.search(text)
+            n = min(int(m.group(1)), 10) if m else 1
+            hit = ("leader", _answer_leader(team_data, sport, stat, max(n, 1)))
+    elif PLAYER_Q_RE.search(text):
+        hit = ("player_stats", _answer_player(team_data, text, sports))
+
+    if not hit or not hit[1]:
+        return None
+    _stats["fast_path"] += 1
+    _stats["by_intent"][hit[0]] = _stats["by_intent"].get(hit[0], 0) + 1
+    return hit
+
+
+def get_stats() -> dict:
+    """How much chat traffic the fast path has absorbed since startup."""
+    total = _stats["total"]
+    return {
+        "total_messages": total,
+        "fast_path_answers": _stats["fast_path"],
+        "llm_fallthrough": total - _stats["fast_path"],
+        "fast_path_pct": round(_stats["fast_path"] / total * 100, 1) if total else 0,
+        "by_intent": dict(_stats["by_intent"]),
+    }
@@ -0,0 +1,112 @@
+"""
+iCalendar (.ics) feeds of the calendar, per sport and for the whole program.
+Each feed is rendered once per calendar version and kept as raw and gzipped
+bytes with a validator (ETag / Last-Modified), so the polling of subscribed
+calendar apps is answered with a 304 or the cached bytes — no re-rendering.
+"""
+
+import gzip
+import hashlib
+import os
+import threading
+from datetime import date, datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+import schedule
+from players import normalize
+
+REFRESH_MINUTES = int(os.getenv("ICS_REFRESH_MINUTES", "60"))   # hint to calendar apps on how often to poll
+MAX_AGE         = int(os.getenv("ICS_MAX_AGE", "300"))           # Cache-Control max-age for proxies and browsers
+SCHOOL          = "Edison"
+
+_lock = threading.Lock()
+_feeds = {"version": None, "feeds": {}}   # feed key ("all" or sport) → rendered feed
+
+
+def _escape(text) -> str:
+    return (str(text or "").replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+            .replace("\n", "\\n"))
+
+
+def _fold(line: str) -> str:
+    """RFC 5545 lines are at most 75 octets; longer ones continue on lines starting with a space."""
+    raw = line.encode()
+    if len(raw) <= 75:
+        return line
+    parts, start = [], 0
+    while start < len(raw):
+        end = min(start + (75 if not parts else 74), len(raw))
+        while end < len(raw) and (raw[end] & 0xC0) == 0x80:   # don't split a UTF-8 sequence
+            end -= 1
+        parts.append(raw[start:end].decode())
+        start = end
+    return "\r\n ".join(parts)
+
+
+def _event(g: dict, uid: str, stamp: str) -> list:
+    label = schedule.SPORT_LABELS.get(g["sport"], g["sport"])
+    where = "@" if g["location"] == "Away" else "vs"
+    summary = f"{SCHOOL} {label} {where} {g['opponent']}" + (f" ({g['result']})" if g["played"] and g["result"] else "")
+    day = date.fromisoformat(g["date"])
+    details = [f"{label} — {g['location']} game against {g['opponent']}"]
+    if g["played"]:
+        details.append(f"Result: {g['result']} | Record: {g['record']}")
+    return ["BEGIN:VEVENT", f"UID:{uid}", f"DTSTAMP:{stamp}",
+            f"DTSTART;VALUE=DATE:{day:%Y%m%d}", f"DTEND;VALUE=DATE:{day + timedelta(days=1):%Y%m%d}",
+            f"SUMMARY:{_escape(summary)}", f"DESCRIPTION:{_escape(chr(10).join(details))}",
+            f"LOCATION:{_escape(g['location'])}", "TRANSP:TRANSPARENT", "END:VEVENT"]
+
+
+def _render(sport: Optional[str], built_at: float) -> dict:
+    name = f"{SCHOOL} {schedule.SPORT_LABELS[sport]}" if sport else f"{SCHOOL} Athletics"
+    stamp = datetime.fromtimestamp(built_at, timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//Edison Athletics//Schedule//EN", "CALSCALE:GREGORIAN",
+             "METHOD:PUBLISH", f"X-WR-CALNAME:{_escape(name)}", "X-WR-TIMEZONE:America/New_York",
+             f"REFRESH-INTERVAL;VALUE=DURATION:PT{REFRESH_MINUTES}M", f"X-PUBLISHED-TTL:PT{REFRESH_MINUTES}M"]
+    seen = {}
+    for g in schedule.between(sport=sport):
+        # Stable across rebuilds so calendar apps update events in place; n separates doubleheaders
+        key = f"{g['sport']}-{g['date']}-{normalize(g['opponent']).replace(' ', '-')}"
+        seen[key] = seen.get(key, 0) + 1
+        lines += _event(g, f"{key}-{seen[key]}@edison-athletics", stamp)
+    lines.append("END:VCALENDAR")
+    body = ("\r\n".join(_fold(l) for l in lines) + "\r\n").encode()
+    return {"body": body, "gzip": gzip.compress(body, compresslevel=9, mtime=0), "events": sum(seen.values()),
+            "etag": f'W/"{hashlib.sha1(body).hexdigest()[:20]}"',
+            "last_modified": format_datetime(datetime.fromtimestamp(int(built_at), timezone.utc), usegmt=True),
+            "built_at": int(built_at)}
+
+
+def feed(sport: Optional[str] = None) -> dict:
+    """The rendered feed for one sport (or all sports), rendering it only if the calendar changed since."""
+    version, built_at = schedule.version()
+    key = sport or "all"
+    with _lock:
+        if _feeds["version"] != version:
+            _feeds.update(version=version, feeds={})
+        rendered = _feeds["feeds"].get(key)
+        if rendered is None:
+            rendered = _feeds["feeds"][key] = _render(sport, built_at)
+    return rendered
+
+
+def not_modified(headers, rendered: dict) -> bool:
+    """True when the client's If-None-Match / If-Modified-Since already matches the rendered feed."""
+    inm = headers.get("if-none-match")
+    if inm:
+        tags = {t.strip().removeprefix("W/") for t in inm.split(",")}
+        return "*" in tags or rendered["etag"].removeprefix("W/") in tags
+    ims = headers.get("if-modified-since")
+    if ims:
+        try:
+            return parsedate_to_datetime(ims).timestamp() >= rendered["built_at"]
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def stats() -> dict:
+    return {"version": _feeds["version"], "rendered": {k: {"events": f["events"], "bytes": len(f["body"]),
+                                                           "gzip_bytes": len(f["gzip"])}
+                                                       for k, f in _feeds["feeds"].items()}}
@@ -0,0 +1,114 @@
+"""
+Import-time report for the API.
+Runs `python -X importtime -c "import api"` in a fresh interpreter (best of
+--runs), then reports the total, api.py's direct imports and the heaviest
+packages. It exits non-zero when the total is over budget or when a module
+that should load lazily (LLM client, scraper stack) is imported eagerly, so
+it can gate CI and a slow cold start gets caught before deploy.
+
+    python import_report.py                       # budget from API_IMPORT_BUDGET_MS (default 1500)
+    python import_report.py --budget 900 --runs 5 --json import_time.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+IMPORT_BUDGET_MS = float(os.getenv("API_IMPORT_BUDGET_MS", "1500"))
+# Must not be imported by `import api`; each is loaded on first use
+LAZY_MODULES = ("groq", "requests", "bs4", "lxml")
+
+
+def _parse(stderr: str) -> list:
+    """[(depth, module, self µs, cumulative µs)] from -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((depth, name.strip(), int(self_us), int(cum_us)))
+    return rows
+
+
+def measure(module: str = "api") -> list:
+    here = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory() as tmp:
+        # A throwaway coach DB so the report never touches real data
+        env = {**os.environ, "GROQ_API_KEY": os.getenv("GROQ_API_KEY", "import-report"),
+               "COACH_DB_PATH": os.path.join(tmp, "coach.db"), "AUTH_SESSION_DB": os.path.join(tmp, "sessions.db")}
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                              cwd=here, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    return _parse(proc.stderr)
+
+
+def report(rows: list, module: str = "api", top: int = 15) -> dict:
+    root = next(r for r in rows if r[1] == module and r[0] <= 1)
+    direct, packages = [], {}
+    # -X importtime prints children before their parent, so a module's direct imports are
+    # the rows one level deeper that precede it and follow its previous sibling
+    root_i = rows.index(root)
+    for depth, name, _, cum in reversed(rows[:root_i]):
+        if depth < root[0] + 1:
+            break
+        if depth == root[0] + 1:
+            direct.append((name, cum))
+    for _, name, self_us, _ in rows:
+        pkg = name.split(".")[0]
+        packages[pkg] = packages.get(pkg, 0) + self_us
+    imported = {name.split(".")[0] for _, name, _, _ in rows}
+    return {
+        "module": module,
+        "total_ms": round(root[3] / 1000, 1),
+        "direct_ms": {n: round(c / 1000, 1) for n, c in sorted(direct, key=lambda x: -x[1])},
+        "packages_ms": {p: round(us / 1000, 1) for p, us in sorted(packages.items(), key=lambda x: -x[1])[:top]},
+        "eager_lazy_modules": sorted(m for m in LAZY_MODULES if m in imported),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure and budget the API's import time")
+    parser.add_argument("--module", default="api")
+    parser.add_argument("--budget", type=float, default=IMPORT_BUDGET_MS, help="fail above this many ms")
+    parser.add_argument("--runs", type=int, default=3, help="report the fastest of N fresh interpreters")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+
+    runs = [report(measure(args.module), args.module, args.top) for _ in range(max(args.runs, 1))]
+    best = min(runs, key=lambda r: r["total_ms"])
+    best["runs_ms"] = [r["total_ms"] for r in runs]
+    best["budget_ms"] = args.budget
+
+    print(f"\n⏱️  import {args.module}: {best['total_ms']} ms (best of {len(runs)}: {best['runs_ms']}) "
+          f"| budget {args.budget:.0f} ms")
+    print("  direct imports:")
+    for name, ms in best["direct_ms"].items():
+        print(f"    {name:<28} {ms:>8} ms")
+    print("  heaviest packages (self time):")
+    for name, ms in best["packages_ms"].items():
+        print(f"    {name:<28} {ms:>8} ms")
+
+    failed = False
+    if best["eager_lazy_modules"]:
+        print(f"  ❌ imported eagerly, should load on first use: {', '.join(best['eager_lazy_modules'])}")
+        failed = True
+    if best["total_ms"] > args.budget:
+        print(f"  ❌ over budget by {best['total_ms'] - args.budget:.0f} ms")
+        failed = True
+    if not failed:
+        print("  ✅ within budget")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(best, f, indent=2)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Local stand-in for the Groq chat completions API.
+Speaks the same /openai/v1/chat/completions protocol (JSON and SSE streaming)
+with configurable time-to-first-token and token rate, so /api/chat can be
+load-tested without spending Groq quota or adding network variance.
+
+    python llm_stub.py --port 8765 --latency 0.4 --tps 80 --reply-tokens 120
+    GROQ_BASE_URL=http://127.0.0.1:8765 GROQ_API_KEY=stub uvicorn api:app
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+from token_budget import message_tokens
+
+STUB_LATENCY      = float(os.getenv("LLM_STUB_LATENCY", "0.4"))   # seconds before the first token
+STUB_TPS          = float(os.getenv("LLM_STUB_TPS", "80"))        # generated tokens per second
+STUB_REPLY_TOKENS = int(os.getenv("LLM_STUB_REPLY_TOKENS", "120"))
+
+app = FastAPI(title="Groq completions stand-in")
+
+_stats = {"requests": 0, "streamed": 0, "by_model": {}, "prompt_tokens": []}
+
+REPLY_WORDS = ("The Edison Eagles have been strong this season and the numbers in the context "
+               "back that up with steady scoring from the starters and solid depth off the bench ").split()
+
+
+def _reply_tokens(n: int) -> list:
+    # One word ≈ one token is close enough for pacing
+    return [REPLY_WORDS[i % len(REPLY_WORDS)] + " " for i in range(n)]
+
+
+@app.post("/openai/v1/chat/completions")
+async def completions(request: Request):
+    body = await request.json()
+    model = body.get("model", "stub")
+    prompt_tokens = message_tokens(body.get("messages", []))
+    n_tokens = min(STUB_REPLY_TOKENS, int(body.get("max_tokens") or STUB_REPLY_TOKENS))
+    tokens = _reply_tokens(n_tokens)
+    completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+    created = int(time.time())
+
+    _stats["requests"] += 1
+    _stats["by_model"][model] = _stats["by_model"].get(model, 0) + 1
+    _stats["prompt_tokens"].append(prompt_tokens)
+    del _stats["prompt_tokens"][:-10000]
+
+    if body.get("stream"):
+        _stats["streamed"] += 1
+
+        async def sse():
+            await asyncio.sleep(STUB_LATENCY)
+            for i, tok in enumerate(tokens):
+                chunk = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                         "choices": [{"index": 0, "delta": {"role": "assistant", "content": tok} if i == 0 else {"content": tok},
+                                      "finish_reason": None}]}
+                yield f"data: {json.dumps(chunk)}\n\n"
+                if STUB_TPS > 0:
+                    await asyncio.sleep(1 / STUB_TPS)
+            done = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                    "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+            yield f"data: {json.dumps(done)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(sse(), media_type="text/event-stream")
+
+    await asyncio.sleep(STUB_LATENCY + (n_tokens / STUB_TPS if STUB_TPS > 0 else 0))
+    return {
+        "id": completion_id, "object": "chat.completion", "created": created, "model": model,
+        "choices": [{"index": 0, "finish_reason": "stop",
+                     "message": {"role": "assistant", "content": "".join(tokens).strip()}}],
+        "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": n_tokens,
+                  "total_tokens": prompt_tokens + n_tokens},
+    }
+
+
+@app.get("/stats")
+def stats():
+    pt = sorted(_stats["prompt_tokens"])
+    return {
+        "requests": _stats["requests"], "streamed": _stats["streamed"], "by_model": dict(_stats["by_model"]),
+        "prompt_tokens": {"p50": pt[len(pt) // 2], "max": pt[-1], "mean": round(sum(pt) / len(pt), 1)} if pt else {},
+        "config": {"latency": STUB_LATENCY, "tokens_per_second": STUB_TPS, "reply_tokens": STUB_REPLY_TOKENS},
+    }
+
+
+if __name__ == "__main__":
+    import uvicorn
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=STUB_LATENCY, help="seconds before the first token")
+    parser.add_argument("--tps", type=float, default=STUB_TPS, help="tokens per second after the first")
+    parser.add_argument("--reply-tokens", type=int, default=STUB_REPLY_TOKENS)
+    args = parser.parse_args()
+    STUB_LATENCY, STUB_TPS, STUB_REPLY_TOKENS = args.latency, args.tps, args.reply_tokens
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
@@ -0,0 +1,271 @@
+"""
+API load test on synthetic data.
+Generates team_data for N schools (one API process per school, since each
+deployment serves a single school) plus a large coach_data file per school,
+starts the Groq stand-in for chat, then drives a weighted mix of the public,
+coach and chat endpoints at a fixed concurrency. Reports throughput, latency
+percentiles per scenario and each server's memory/CPU from /metrics.
+
+    python loadtest.py --schools 2 --players 200 --seasons 5 --notes 20000 --concurrency 32 --requests 5000
+    python loadtest.py --scenarios overview,leaderboard,history --json load.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("GROQ_API_KEY", "bench")
+
+from bench_chat import QUESTIONS, _pct, _wait_ready
+
+SPORTS = ["boys_soccer", "girls_soccer", "boys_basketball", "girls_basketball", "baseball", "wrestling"]
+SEARCH_TERMS = ["defense", "practice", "press", "counter", "leadership", "corners", "finishing", "minutes"]
+PASSWORD = "loadtest"
+
+# name → (weight, needs coach login); see _request for what each one sends
+SCENARIOS = {
+    "overview":        (20, False),
+    "leaderboard":     (15, False),
+    "history":         (10, False),
+    "schedule":        (15, False),
+    "player_search":   (10, False),
+    "coach_search":    (8, True),
+    "coach_notes":     (8, True),
+    "coach_dashboard": (4, True),
+    "chat":            (10, False),
+}
+
+
+# ── SERVER ──
+def serve_api(port: int, school: int, args):
+    """Child-process mode: one school's synthetic team_data and coach DB behind api.py."""
+    import uvicorn
+    import synthetic_data
+    from scraper import SEASONS
+
+    name = synthetic_data.school_names(school + 1)[school]
+    data = synthetic_data.make_schools(school + 1, SEASONS[:args.seasons], args.players, args.games, args.seed)[name]
+
+    import api
+    import database as db
+    api.scrape_all_data = lambda: data
+
+    with open(args.coach_file) as f:
+        coach = json.load(f)
+    started = time.perf_counter()
+    imported = sum(db.import_rows(collection, rows) for collection, rows in coach.items())
+    print(f"  📥 {name}: imported {imported} coach records in {time.perf_counter() - started:.1f}s")
+    uvicorn.run(api.app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def _server_metrics(client, base: str) -> dict:
+    wanted = ("process_resident_memory_bytes", "process_cpu_seconds_total", "team_data_memory_bytes")
+    out = {}
+    for line in client.get(f"{base}/metrics").text.splitlines():
+        name, _, value = line.partition(" ")
+        if name in wanted:
+            out[name] = float(value)
+    return out
+
+
+# ── LOAD ──
+def _request(scenario: str, r: random.Random, school: dict) -> tuple:
+    """(method, path, json body) for one request of the scenario."""
+    sport = r.choice(SPORTS)
+    if scenario == "overview":
+        return "GET", f"/api/{sport}/overview", None
+    if scenario == "leaderboard":
+        return "GET", f"/api/{sport}/leaderboard?limit={r.choice([8, 25])}", None
+    if scenario == "history":
+        return "GET", f"/api/{sport}/history", None
+    if scenario == "schedule":
+        return "GET", f"/api/{sport}/schedule?filter={r.choice(['all', 'upcoming', 'recent'])}", None
+    if scenario == "player_search":
+        return "GET", f"/api/players/search/{r.choice(school['players'])}", None
+    if scenario == "coach_search":
+        return "GET", f"/api/coach/search?q={r.choice(SEARCH_TERMS)}", None
+    if scenario == "coach_notes":
+        return "GET", "/api/coach/player-notes?limit=50", None
+    if scenario == "coach_dashboard":
+        return "GET", "/api/coach/dashboard", None
+    return "POST", "/api/chat", {"message": r.choice(QUESTIONS), "coach": r.random() < 0.2}
+
+
+async def drive(schools: list, scenarios: dict, concurrency: int, total: int, seed: int) -> tuple:
+    import httpx
+    r = random.Random(seed)
+    names, weights = list(scenarios), [w for w, _ in scenarios.values()]
+    plan = []
+    for i in range(total):
+        scenario = r.choices(names, weights)[0]
+        school = schools[i % len(schools)]
+        plan.append((scenario, school, *_request(scenario, r, school)))
+    queue = asyncio.Queue()
+    for item in plan:
+        queue.put_nowait(item)
+    results = []
+
+    async def worker():
+        while not queue.empty():
+            scenario, school, method, path, body = queue.get_nowait()
+            # Coach chats are the ~20% sent with a session; the server picks the lane from it
+            coach = scenarios[scenario][1] or bool(body and body.pop("coach", False))
+            headers = {"Authorization": f"Bearer {school['token']}"} if coach else {}
+            started = time.perf_counter()
+            try:
+                resp = await client.request(method, school["base"] + path, json=body, headers=headers)
+                await resp.aread()
+                ok, size = resp.status_code < 400, len(resp.content)
+            except httpx.HTTPError:
+                ok, size = False, 0
+            results.append({"scenario": scenario, "school": school["name"], "ok": ok, "bytes": size,
+                            "latency": time.perf_counter() - started})
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(timeout=120, limits=limits) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        wall = time.perf_counter() - started
+    return results, wall
+
+
+def summary(rows: list, wall: float) -> dict:
+    ok = [x for x in rows if x["ok"]]
+    lat = [x["latency"] for x in ok]
+    return {"count": len(rows), "errors": len(rows) - len(ok), "rps": round(len(ok) / wall, 1) if wall else 0,
+            "latency_ms": {"p50": _pct(lat, 50), "p95": _pct(lat, 95), "p99": _pct(lat, 99),
+                           "max": round(max(lat) * 1000, 1) if lat else None},
+            "avg_kb": round(sum(x["bytes"] for x in ok) / len(ok) / 1024, 1) if ok else 0}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the API on synthetic schools, coach data and a stub LLM")
+    parser.add_argument("--schools", type=int, default=1, help="schools to simulate, one API process each")
+    parser.add_argument("--seasons", type=int, default=5)
+    parser.add_argument("--players", type=int, default=25, help="players per sport per season")
+    parser.add_argument("--games", type=int, default=18, help="games per season")
+    parser.add_argument("--notes", type=int, default=5000, help="coach player notes per school (other "
+                                                                 "collections scale from this)")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--scenarios", help=f"comma-separated subset of {','.join(SCENARIOS)}")
+    parser.add_argument("--latency", type=float, default=0.4, help="stub seconds before first token")
+    parser.add_argument("--tps", type=float, default=80, help="stub tokens per second")
+    parser.add_argument("--api-port", type=int, default=8021, help="first school's port; the others follow")
+    parser.add_argument("--stub-port", type=int, default=8765)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--keep-data", help="write the generated coach_data files here instead of a temp dir")
+    parser.add_argument("--json", help="also write the report to this file")
+    parser.add_argument("--serve-api", type=int, default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--coach-file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve_api is not None:
+        return serve_api(args.api_port, args.serve_api, args)
+
+    wanted = [s.strip() for s in args.scenarios.split(",")] if args.scenarios else list(SCENARIOS)
+    unknown = set(wanted) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    scenarios = {k: SCENARIOS[k] for k in wanted}
+
+    import httpx
+    import synthetic_data
+    from scraper import SEASONS
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    workdir = args.keep_data or tempfile.mkdtemp(prefix="edison-load-")
+    os.makedirs(workdir, exist_ok=True)
+    stub_url = f"http://127.0.0.1:{args.stub_port}"
+
+    print(f"🏗️  Generating {args.schools} school(s): {args.seasons} seasons × {args.players} players/sport, "
+          f"{args.notes} coach notes each → {workdir}")
+    team = synthetic_data.make_schools(args.schools, SEASONS[:args.seasons], args.players, args.games, args.seed)
+    schools = []
+    for i, (name, data) in enumerate(team.items()):
+        coach_file = os.path.join(workdir, f"coach_data_{i}.json")
+        coach = synthetic_data.make_coach_data(data, notes=args.notes, injuries=max(args.notes // 100, 1),
+                                               game_notes=max(args.notes // 20, 1),
+                                               scouting_reports=max(args.notes // 50, 1),
+                                               custom_players=max(args.notes // 50, 1), seed=args.seed + i)
+        synthetic_data.write_coach_data(coach_file, coach)
+        schools.append({"name": name, "base": f"http://127.0.0.1:{args.api_port + i}", "coach_file": coach_file,
+                        "db": os.path.join(workdir, f"coach_{i}.db"),
+                        "players": sorted({n["player_name"] for n in coach["player_notes"]})[:200] or ["Smith"]})
+    del team
+
+    # Synthetic data: no opponent prefetch (those schools aren't on nj.com) and no stat progression records
+    env = {**os.environ, "GROQ_BASE_URL": stub_url, "GROQ_API_KEY": "bench", "COACH_PASSWORD": PASSWORD,
+           "OPPONENT_PREFETCH": "0", "STAT_PROGRESSION": "0", "PYTHONUNBUFFERED": "1",
+           "OPPONENT_DB_PATH": os.path.join(workdir, "opponents.db")}
+    procs = [subprocess.Popen([sys.executable, "llm_stub.py", "--port", str(args.stub_port),
+                               "--latency", str(args.latency), "--tps", str(args.tps)],
+                              cwd=here, env=env, stdout=subprocess.DEVNULL)]
+    for i, school in enumerate(schools):
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(school["db"] + suffix):
+                os.remove(school["db"] + suffix)
+        procs.append(subprocess.Popen(
+            [sys.executable, "loadtest.py", "--serve-api", str(i), "--api-port", str(args.api_port + i),
+             "--coach-file", school["coach_file"], "--seasons", str(args.seasons), "--players", str(args.players),
+             "--games", str(args.games), "--seed", str(args.seed)],
+            cwd=here, env={**env, "COACH_DB_PATH": school["db"]},
+            stdout=open(os.path.join(workdir, f"server_{i}.log"), "w"), stderr=subprocess.STDOUT))
+    try:
+        _wait_ready(f"{stub_url}/stats")
+        before = {}
+        for school in schools:
+            _wait_ready(f"{school['base']}/", timeout=600)
+            school["token"] = httpx.post(f"{school['base']}/api/auth/login",
+                                         json={"password": PASSWORD}).json().get("token", "")
+            before[school["name"]] = _server_metrics(httpx, school["base"])
+        print(f"🚀 {args.requests} requests @ concurrency {args.concurrency} across {len(schools)} server(s)")
+        results, wall = asyncio.run(drive(schools, scenarios, args.concurrency, args.requests, args.seed))
+        servers = {}
+        for school in schools:
+            after = _server_metrics(httpx, school["base"])
+            cpu = after.get("process_cpu_seconds_total", 0) - before[school["name"]].get("process_cpu_seconds_total", 0)
+            served = sum(1 for x in results if x["school"] == school["name"])
+            servers[school["name"]] = {
+                "rss_mb": round(after.get("process_resident_memory_bytes", 0) / 2**20, 1),
+                "team_data_mb": round(after.get("team_data_memory_bytes", 0) / 2**20, 1),
+                "cpu_ms_per_request": round(cpu / max(served, 1) * 1000, 2)}
+    finally:
+        for p in procs:
+            p.terminate()
+        for p in procs:
+            p.wait(timeout=10)
+
+    report = {
+        "config": {k: v for k, v in vars(args).items() if k not in ("serve_api", "coach_file", "json")},
+        "wall_seconds": round(wall, 2),
+        "overall": summary(results, wall),
+        "scenarios": {s: summary([x for x in results if x["scenario"] == s], wall) for s in scenarios},
+        "servers": servers,
+    }
+
+    o = report["overall"]
+    print(f"\n📊 {o['count']} requests in {report['wall_seconds']}s — {o['rps']} req/s, {o['errors']} errors, "
+          f"p50/p95/p99 = {o['latency_ms']['p50']}/{o['latency_ms']['p95']}/{o['latency_ms']['p99']} ms")
+    print(f"  {'scenario':<16} {'n':>6} {'err':>4} {'req/s':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} {'avg KB':>7}")
+    for name, s in report["scenarios"].items():
+        lat = s["latency_ms"]
+        print(f"  {name:<16} {s['count']:>6} {s['errors']:>4} {s['rps']:>7} {lat['p50'] or '-':>8} "
+              f"{lat['p95'] or '-':>8} {lat['p99'] or '-':>8} {lat['max'] or '-':>8} {s['avg_kb']:>7}")
+    for name, s in servers.items():
+        print(f"  🖥️  {name}: RSS {s['rss_mb']} MB (team_data {s['team_data_mb']} MB), "
+              f"{s['cpu_ms_per_request']} ms CPU/request")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
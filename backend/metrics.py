@@ -0,0 +1,220 @@
+"""
+Prometheus metrics for the API, without extra dependencies.
+A pure-ASGI middleware records per-route latency and response-size
+histograms, status counts and in-flight requests; ai_agent records chat
+timings. Gauges that are costly to keep live (team_data footprint, process
+memory, scheduler lanes) are read only when /metrics is scraped.
+"""
+
+import bisect
+import os
+import resource
+import threading
+import time
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SIZE_BUCKETS    = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+TOKEN_BUCKETS   = (100, 250, 500, 1_000, 2_000, 4_000, 6_000, 8_000, 16_000)
+
+_lock = threading.Lock()
+_metrics = {}     # name → {"type", "help", "buckets", "series": {labels tuple → value or [counts, sum, count]}}
+_collectors = []  # callables returning [(name, type, help, {labels: value})] at scrape time
+
+
+def _metric(name: str, kind: str, help: str, buckets=None) -> dict:
+    m = _metrics.get(name)
+    if m is None:
+        m = _metrics[name] = {"type": kind, "help": help, "buckets": buckets, "series": {}}
+    return m
+
+
+def counter(name: str, help: str):
+    _metric(name, "counter", help)
+
+def gauge(name: str, help: str):
+    _metric(name, "gauge", help)
+
+def histogram(name: str, help: str, buckets=LATENCY_BUCKETS):
+    _metric(name, "histogram", help, tuple(buckets))
+
+
+def inc(name: str, labels: tuple = (), value: float = 1):
+    series = _metrics[name]["series"]
+    with _lock:
+        series[labels] = series.get(labels, 0) + value
+
+def set_gauge(name: str, value: float, labels: tuple = ()):
+    _metrics[name]["series"][labels] = value
+
+def observe(name: str, value: float, labels: tuple = ()):
+    m = _metrics[name]
+    i = bisect.bisect_left(m["buckets"], value)
+    with _lock:
+        s = m["series"].get(labels)
+        if s is None:
+            s = m["series"][labels] = [[0] * (len(m["buckets"]) + 1), 0.0, 0]
+        s[0][i] += 1
+        s[1] += value
+        s[2] += 1
+
+
+def collector(fn):
+    """Register fn() → [(name, type, help, {labels tuple: value})], evaluated on every scrape."""
+    _collectors.append(fn)
+    return fn
+
+
+# ── HTTP ──
+HTTP_LABELS = ("method", "route", "status")
+counter("http_requests_total", "HTTP requests by route and status")
+histogram("http_request_duration_seconds", "Time from request start to the last response byte")
+histogram("http_response_size_bytes", "Response body size", SIZE_BUCKETS)
+gauge("http_requests_in_flight", "Requests currently being handled")
+set_gauge("http_requests_in_flight", 0)
+
+# ── Chat ──
+histogram("chat_context_build_seconds", "Time to build and budget the chat prompt")
+histogram("chat_llm_queue_wait_seconds", "Time waiting for a scheduler slot, by lane")
+histogram("chat_llm_seconds", "LLM call duration, by model tier")
+histogram("chat_llm_first_token_seconds", "Time to the first streamed token, by model tier")
+histogram("chat_prompt_tokens", "Estimated prompt tokens sent to the LLM", TOKEN_BUCKETS)
+histogram("chat_completion_tokens", "Estimated tokens in LLM replies", TOKEN_BUCKETS)
+counter("chat_fast_path_total", "Chat questions answered by the rule-based fast path, by intent")
+
+# ── team_data ──
+_team = {"loaded_at": None, "bytes": 0, "frames": 0}
+
+
+def set_team_data(team_data: dict):
+    """Call whenever team_data is (re)loaded; the footprint is measured once here, not per scrape."""
+    import pandas as pd
+    seen, total, frames = set(), 0, 0
+    stack = [team_data]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        if isinstance(obj, pd.DataFrame):
+            total += int(obj.memory_usage(index=True, deep=True).sum())
+            frames += 1
+        elif isinstance(obj, dict):
+            stack.extend(obj.values())
+    _team.update(loaded_at=time.time(), bytes=total, frames=frames)
+
+
+@collector
+def _process_and_data():
+    rss = 0
+    try:
+        with open("/proc/self/statm") as f:
+            rss = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    loaded = _team["loaded_at"]
+    return [
+        ("process_resident_memory_bytes", "gauge", "Resident set size", {(): rss}),
+        ("process_cpu_seconds_total", "counter", "User + system CPU time", {(): usage.ru_utime + usage.ru_stime}),
+        ("team_data_loaded", "gauge", "1 once scraped data is available", {(): 1 if loaded else 0}),
+        ("team_data_age_seconds", "gauge", "Seconds since team_data was loaded", {(): time.time() - loaded if loaded else 0}),
+        ("team_data_memory_bytes", "gauge", "In-memory size of the team_data DataFrames", {(): _team["bytes"]}),
+        ("team_data_frames", "gauge", "DataFrames held in team_data", {(): _team["frames"]}),
+    ]
+
+
+# ── Middleware ──
+class MetricsMiddleware:
+    """Pure ASGI (not BaseHTTPMiddleware) so streaming responses pass through untouched."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        started = time.perf_counter()
+        state = {"status": 500, "bytes": 0}
+        inc("http_requests_in_flight")
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                state["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                state["bytes"] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            inc("http_requests_in_flight", value=-1)
+            # The route template (/api/{sport}/stats), not the raw path, keeps label cardinality bounded
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            method = scope["method"]
+            inc("http_requests_total", (method, route, str(state["status"])))
+            observe("http_request_duration_seconds", time.perf_counter() - started, (method, route))
+            observe("http_response_size_bytes", state["bytes"], (method, route))
+
+
+# ── Exposition ──
+_LABEL_NAMES = {
+    "http_requests_total": HTTP_LABELS,
+    "http_request_duration_seconds": ("method", "route"),
+    "http_response_size_bytes": ("method", "route"),
+    "chat_llm_queue_wait_seconds": ("lane",),
+    "chat_llm_seconds": ("tier",),
+    "chat_llm_first_token_seconds": ("tier",),
+    "chat_fast_path_total": ("intent",),
+}
+
+
+def label_names(name: str, names: tuple):
+    _LABEL_NAMES[name] = names
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _fmt_labels(name: str, labels: tuple, extra: str = "") -> str:
+    names = _LABEL_NAMES.get(name, ())
+    parts = [f'{k}="{_escape(v)}"' for k, v in zip(names, labels)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _num(v) -> str:
+    return "+Inf" if v == float("inf") else repr(float(v)) if isinstance(v, float) else str(v)
+
+
+def render() -> str:
+    lines = []
+    with _lock:
+        snapshot = {n: {**m, "series": {k: ([list(v[0]), v[1], v[2]] if isinstance(v, list) else v)
+                                        for k, v in m["series"].items()}} for n, m in _metrics.items()}
+    for name, m in snapshot.items():
+        lines.append(f"# HELP {name} {m['help']}")
+        lines.append(f"# TYPE {name} {m['type']}")
+        for labels, v in sorted(m["series"].items()):
+            if m["type"] != "histogram":
+                lines.append(f"{name}{_fmt_labels(name, labels)} {_num(v)}")
+                continue
+            counts, total, n = v
+            cumulative = 0
+            for bound, c in zip(list(m["buckets"]) + [float("inf")], counts):
+                cumulative += c
+                le = f'le="{_num(bound)}"'
+                lines.append(f"{name}_bucket{_fmt_labels(name, labels, le)} {cumulative}")
+            lines.append(f"{name}_sum{_fmt_labels(name, labels)} {_num(total)}")
+            lines.append(f"{name}_count{_fmt_labels(name, labels)} {n}")
+    for fn in _collectors:
+        try:
+            for name, kind, help, series in fn():
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, v in series.items():
+                    lines.append(f"{name}{_fmt_labels(name, labels)} {_num(v)}")
+        except Exception as e:
+            lines.append(f"# collector {getattr(fn, '__name__', fn)} failed: {e}")
+    return "\n".join(lines) + "\n"
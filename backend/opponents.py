@@ -0,0 +1,277 @@
+"""
+Opponent scouting data, cached.
+Opponent stats come from the same nj.com pages as ours, so each fetch is one
+or more slow scrapes. Results are kept per (sport, opponent) in a small SQLite
+table that every process shares (the snapshot loader and all API workers), with
+a bounded in-memory LRU in front of it. An entry is fresh for
+OPPONENT_TTL_HOURS; after that it is still served for OPPONENT_STALE_HOURS
+while a background refresh runs, then dropped. Concurrent requests in one
+process share a single scrape. After every scrape the opponents on each sport's
+current schedule are prefetched by a small worker pool — by the snapshot
+loader in multi-worker mode, so nj.com sees each opponent once, not once per
+worker.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+import pandas as pd
+
+from players import normalize
+
+OPPONENT_TTL       = float(os.getenv("OPPONENT_TTL_HOURS", "12")) * 3600
+OPPONENT_STALE     = float(os.getenv("OPPONENT_STALE_HOURS", "24")) * 3600      # served while refreshing, then dropped
+OPPONENT_MISS_TTL  = float(os.getenv("OPPONENT_MISS_TTL_MINUTES", "60")) * 60   # remember "no data" this long
+OPPONENT_CACHE_MAX = int(os.getenv("OPPONENT_CACHE_MAX", "512"))                # entries, in memory and on disk
+OPPONENT_DB_PATH   = os.getenv("OPPONENT_DB_PATH", os.path.join(os.path.dirname(__file__), "opponents.db"))
+PREFETCH_ENABLED   = os.getenv("OPPONENT_PREFETCH", "1") == "1"
+PREFETCH_WORKERS   = int(os.getenv("OPPONENT_PREFETCH_WORKERS", "2"))            # be polite to nj.com
+SPORT_SLUGS = {"boys_soccer": "boyssoccer", "girls_soccer": "girlssoccer", "boys_basketball": "boysbasketball",
+               "girls_basketball": "girlsbasketball", "baseball": "baseball", "wrestling": "wrestling"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS opponent_cache (
+    sport TEXT, team_key TEXT, team TEXT, data TEXT, fetched_at REAL, expires REAL, drop_at REAL,
+    PRIMARY KEY (sport, team_key)
+);
+CREATE INDEX IF NOT EXISTS idx_opponent_cache_drop ON opponent_cache(drop_at);
+"""
+
+_lock = threading.Lock()
+_cache = OrderedDict()   # (sport, normalised team) → {"team", "data", "frame", "fetched_at", "expires", "drop_at"}, LRU last
+_inflight = {}           # (sport, normalised team) → Event set when that scrape finishes
+_queued = set()          # keys submitted to the pool and not yet started
+_pool = None
+_local = threading.local()
+_initialized = set()
+_stats = {"hits": 0, "stale_hits": 0, "misses": 0, "shared_hits": 0, "scrapes": 0, "errors": 0, "evicted": 0,
+          "prefetched": 0, "prefetch_runs": 0}
+
+
+def _key(team: str, sport: str) -> tuple:
+    return sport, normalize(team)
+
+
+# ── SHARED STORE ──
+def _conn() -> sqlite3.Connection:
+    conn = getattr(_local, "conn", None)
+    if conn is None or getattr(_local, "path", None) != OPPONENT_DB_PATH:
+        conn = sqlite3.connect(OPPONENT_DB_PATH, timeout=10, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")   # a lost cache row only means one more scrape
+        _local.conn, _local.path = conn, OPPONENT_DB_PATH
+        with _lock:
+            if OPPONENT_DB_PATH not in _initialized:
+                conn.executescript(SCHEMA)
+                _initialized.add(OPPONENT_DB_PATH)
+    return conn
+
+
+def _entry(team: str, sport: str, data: Optional[dict], fetched_at: float) -> dict:
+    expires = fetched_at + (OPPONENT_TTL if data else OPPONENT_MISS_TTL)
+    return {"team": team, "sport": sport, "data": data, "fetched_at": fetched_at, "expires": expires,
+            "drop_at": expires + (OPPONENT_STALE if data else 0),
+            "frame": pd.DataFrame(data["players"]) if data else None}
+
+
+def _store(key: tuple, entry: dict):
+    try:
+        conn = _conn()
+        conn.execute("INSERT OR REPLACE INTO opponent_cache VALUES (?, ?, ?, ?, ?, ?, ?)",
+                     (*key, entry["team"], json.dumps(entry["data"], default=str) if entry["data"] else None,
+                      entry["fetched_at"], entry["expires"], entry["drop_at"]))
+        conn.execute("DELETE FROM opponent_cache WHERE drop_at <= ? OR rowid NOT IN "
+                     "(SELECT rowid FROM opponent_cache ORDER BY fetched_at DESC LIMIT ?)",
+                     (time.time(), OPPONENT_CACHE_MAX))
+    except sqlite3.Error as e:
+        print(f"  ⚠️ Opponent cache write failed: {e}")
+
+
+def _load(key: tuple) -> Optional[dict]:
+    try:
+        row = _conn().execute("SELECT team, data, fetched_at FROM opponent_cache WHERE sport = ? AND team_key = ? "
+                              "AND drop_at > ?", (*key, time.time())).fetchone()
+    except sqlite3.Error:
+        return None
+    if not row:
+        return None
+    return _entry(row[0], key[0], json.loads(row[1]) if row[1] else None, row[2])
+
+
+# ── IN-MEMORY LRU ──
+def _remember(key: tuple, entry: dict):
+    with _lock:
+        _cache[key] = entry
+        _cache.move_to_end(key)
+        while len(_cache) > OPPONENT_CACHE_MAX:
+            _cache.popitem(last=False)
+            _stats["evicted"] += 1
+
+
+def _lookup(key: tuple) -> Optional[dict]:
+    """The usable entry for a key from memory, else from the shared store; expired entries are dropped."""
+    now = time.time()
+    with _lock:
+        entry = _cache.get(key)
+        if entry and entry["drop_at"] <= now:
+            del _cache[key]
+            entry = None
+        if entry:
+            _cache.move_to_end(key)
+            return entry
+    entry = _load(key)
+    if entry:
+        _stats["shared_hits"] += 1
+        _remember(key, entry)
+    return entry
+
+
+# ── SCRAPING ──
+def _executor() -> ThreadPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(max_workers=max(PREFETCH_WORKERS, 1), thread_name_prefix="opponent-fetch")
+    return _pool
+
+
+def _schedule(key: tuple, team: str, sport: str, done=None):
+    """Scrape in the background, at most once per key however often it is asked for."""
+    with _lock:
+        if key in _queued or key in _inflight:
+            return
+        _queued.add(key)
+
+    def run():
+        with _lock:
+            _queued.discard(key)
+        entry = _lookup(key)
+        if entry and entry["expires"] > time.time():
+            return   # scraped meanwhile by a request or another process
+        _fetch(key, team, sport)
+        if done:
+            done()
+
+    _executor().submit(run)
+
+
+def _fetch(key: tuple, team: str, sport: str) -> Optional[dict]:
+    """Scrape one opponent unless another thread already is, in which case wait for its result."""
+    with _lock:
+        event = _inflight.get(key)
+        owner = event is None
+        if owner:
+            event = _inflight[key] = threading.Event()
+    if not owner:
+        event.wait()
+        return _lookup(key)
+    try:
+        from scraper import scrape_opponent_data
+        started = time.time()
+        try:
+            data = scrape_opponent_data(team, SPORT_SLUGS[sport])
+        except Exception as e:
+            print(f"  ⚠️ Opponent scrape failed for {team} ({sport}): {e}")
+            _stats["errors"] += 1
+            data = None
+        _stats["scrapes"] += 1
+        entry = _entry(team, sport, data, started)
+        _remember(key, entry)
+        _store(key, entry)
+        return entry
+    finally:
+        with _lock:
+            _inflight.pop(key, None)
+        event.set()
+
+
+def get(team: str, sport: str = "boys_soccer", wait: bool = True) -> Optional[dict]:
+    """
+    The cache entry for an opponent ("data" is None when nj.com had nothing).
+    Fresh entries return at once; stale ones return at once and refresh in the
+    background. With nothing cached, wait=True scrapes now and wait=False
+    queues the scrape and returns None.
+    """
+    if sport not in SPORT_SLUGS:
+        raise ValueError(f"unknown sport '{sport}'")
+    key = _key(team, sport)
+    entry = _lookup(key)
+    if entry and entry["expires"] > time.time():
+        _stats["hits"] += 1
+        return entry
+    if entry:
+        _stats["stale_hits"] += 1
+        _schedule(key, team, sport)
+        return entry
+    _stats["misses"] += 1
+    if not wait:
+        _schedule(key, team, sport)
+        return None
+    return _fetch(key, team, sport)
+
+
+def cached(team: str, sport: str) -> Optional[dict]:
+    """Whatever usable entry is cached for the opponent, fresh or not; never scrapes."""
+    return _lookup(_key(team, sport))
+
+
+def mentioned(text: str) -> List[dict]:
+    """Cached opponents (with data) whose name appears in the text, e.g. a chat question."""
+    norm = f" {normalize(text)} "
+    with _lock:
+        keys = set(_cache)
+    try:
+        keys.update(_conn().execute("SELECT sport, team_key FROM opponent_cache WHERE data IS NOT NULL "
+                                    "AND drop_at > ?", (time.time(),)).fetchall())
+    except sqlite3.Error:
+        pass
+    found = [_lookup(k) for k in keys if k[1] and f" {k[1]} " in norm]
+    return [e for e in found if e and e["data"]]
+
+
+def schedule_opponents(team_data: dict) -> List[tuple]:
+    """(sport, opponent) for every opponent on each sport's current schedule."""
+    pairs = []
+    for sport in SPORT_SLUGS:
+        games = ((team_data.get(sport) or {}).get("fixtures") or {}).get("games")
+        if isinstance(games, pd.DataFrame) and not games.empty and "Opponent" in games.columns:
+            pairs += [(sport, o) for o in dict.fromkeys(games["Opponent"].tolist()) if isinstance(o, str) and o]
+    return pairs
+
+
+def prefetch(team_data: dict) -> int:
+    """Queue background scrapes for every scheduled opponent not already fresh in the cache. Returns the count."""
+    if not PREFETCH_ENABLED:
+        return 0
+    now = time.time()
+    todo = [(s, o) for s, o in schedule_opponents(team_data)
+            if not (e := _lookup(_key(o, s))) or e["expires"] <= now]
+    _stats["prefetch_runs"] += 1
+
+    def counted():
+        _stats["prefetched"] += 1
+
+    for sport, team in todo:
+        _schedule(_key(team, sport), team, sport, counted)
+    if todo:
+        print(f"  🔭 Prefetching {len(todo)} opponent rosters in the background")
+    return len(todo)
+
+
+def stats() -> dict:
+    now = time.time()
+    with _lock:
+        entries = list(_cache.values())
+    try:
+        shared = _conn().execute("SELECT COUNT(*) FROM opponent_cache WHERE drop_at > ?", (now,)).fetchone()[0]
+    except sqlite3.Error:
+        shared = None
+    return {**_stats, "cached": len(entries), "max_entries": OPPONENT_CACHE_MAX, "shared": shared,
+            "with_data": sum(1 for e in entries if e["data"]), "fresh": sum(1 for e in entries if e["expires"] > now),
+            "in_flight": len(_inflight), "queued": len(_queued), "ttl_hours": OPPONENT_TTL / 3600,
+            "prefetch": PREFETCH_ENABLED}
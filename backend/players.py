@@ -0,0 +1,128 @@
+"""
+Canonical player identities.
+Every scraped player gets a stable id derived from their normalised full name
+(the same student keeps one id across seasons and sports). The ids live in this
+index, not in the roster frames, so API responses built from the frames keep
+their scraped columns. An alias index maps full names, last
+names and first names to ids so coach input like "okafor" resolves to one
+player with a dict lookup, and an ambiguous first name resolves to nobody
+instead of the first roster row that happens to contain it.
+"""
+
+import re
+import threading
+import unicodedata
+from typing import List, Optional
+
+import pandas as pd
+
+ROSTER_FRAMES = ("field_players", "goalies", "players", "batters", "pitchers", "wrestlers")
+
+_lock = threading.Lock()
+_index = {
+    "players": {},   # id → {"name", "sports", "seasons"}
+    "aliases": {},   # normalised alias → set of ids
+    "where":   {},   # id → [(sport, season, frame key, row position)]
+}
+
+
+def normalize(name) -> str:
+    """'  Emmanuel  O'Kafor-Jr. ' → 'emmanuel okafor jr'"""
+    if not isinstance(name, str):
+        return ""
+    name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode()
+    name = re.sub(r"['’.]", "", name.lower())
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", name).split())
+
+
+def player_id(name) -> str:
+    return normalize(name).replace(" ", "-")
+
+
+def _aliases(norm: str) -> set:
+    parts = norm.split()
+    out = {norm}
+    if len(parts) > 1:
+        out.add(parts[-1])                                # last name
+        out.add(parts[0])                                 # first name
+        out.add(f"{parts[0]} {parts[-1]}")                # drops middle names / suffixes
+        out.add(f"{parts[0][0]} {parts[-1]}")             # "j smith"
+    return out
+
+
+def build_index(team_data: dict) -> dict:
+    """Assign ids to every player in team_data's roster frames and rebuild the alias index."""
+    players, aliases, where = {}, {}, {}
+    for sport, sd in team_data.items():
+        if not isinstance(sd, dict) or "history" not in sd:
+            continue
+        for season, frames in sd["history"].items():
+            for key in ROSTER_FRAMES:
+                df = frames.get(key) if isinstance(frames, dict) else None
+                if not isinstance(df, pd.DataFrame) or "Player" not in df.columns:
+                    continue
+                ids = [player_id(n) for n in df["Player"].tolist()]
+                for pos, (pid, name) in enumerate(zip(ids, df["Player"].tolist())):
+                    if not pid:
+                        continue
+                    info = players.setdefault(pid, {"name": name, "sports": set(), "seasons": set()})
+                    info["sports"].add(sport)
+                    info["seasons"].add(season)
+                    where.setdefault(pid, []).append((sport, season, key, pos))
+                    for alias in _aliases(normalize(name)):
+                        aliases.setdefault(alias, set()).add(pid)
+    with _lock:
+        _index.update(players=players, aliases=aliases, where=where)
+    print(f"  🪪 Indexed {len(players)} players under {len(aliases)} aliases")
+    return stats()
+
+
+def resolve(name: str, sport: Optional[str] = None) -> List[str]:
+    """All player ids the text could mean, most specific match first; [] if unknown."""
+    norm = normalize(name)
+    if not norm:
+        return []
+    players = _index["players"]
+    pid = norm.replace(" ", "-")
+    if pid in players and (sport is None or sport in players[pid]["sports"]):
+        return [pid]
+    ids = _index["aliases"].get(norm, ())
+    if sport:
+        ids = [i for i in ids if sport in players[i]["sports"]]
+    return sorted(ids)
+
+
+def resolve_id(name: str, sport: Optional[str] = None) -> str:
+    """The single player id the name refers to, or its own slug when unknown or ambiguous."""
+    ids = resolve(name, sport)
+    return ids[0] if len(ids) == 1 else player_id(name)
+
+
+def is_known(pid: str) -> bool:
+    return pid in _index["players"]
+
+
+def get_player(pid: str) -> Optional[dict]:
+    info = _index["players"].get(pid)
+    if not info:
+        return None
+    return {"id": pid, "name": info["name"], "sports": sorted(info["sports"]), "seasons": sorted(info["seasons"])}
+
+
+def locate(pid: str, team_data: dict, sport: Optional[str] = None, season: Optional[str] = None) -> list:
+    """(sport, season, frame key, row) for each roster row of the player, newest season first."""
+    rows = []
+    for sp, se, key, pos in sorted(_index["where"].get(pid, ()), key=lambda w: w[1], reverse=True):
+        if (sport and sp != sport) or (season and se != season):
+            continue
+        try:
+            rows.append((sp, se, key, team_data[sp]["history"][se][key].iloc[pos]))
+        except (KeyError, IndexError):
+            continue
+    return rows
+
+
+def stats() -> dict:
+    aliases = _index["aliases"]
+    return {"players": len(_index["players"]), "aliases": len(aliases),
+            "ambiguous_aliases": sum(1 for ids in aliases.values() if len(ids) > 1)}
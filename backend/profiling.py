@@ -0,0 +1,141 @@
+"""
+Opt-in request profiling.
+With PROFILE_REQUESTS=1 (or PROFILE_SAMPLE_RATE > 0) a middleware profiles a
+random fraction of requests, plus any request from a logged-in coach that
+sends "X-Debug-Profile: 1". A sampling profiler walks every thread's stack
+each PROFILE_INTERVAL_MS while the request runs — sync endpoints execute in
+the threadpool, so only looking at the event-loop thread would miss them —
+and stores folded stacks (flamegraph.pl / speedscope format) in a ring buffer
+of the last PROFILE_BUFFER profiles. When neither variable is set the
+middleware is never installed, so there is no per-request cost at all.
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+
+SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+ENABLED     = os.getenv("PROFILE_REQUESTS", "0") == "1" or SAMPLE_RATE > 0
+INTERVAL    = float(os.getenv("PROFILE_INTERVAL_MS", "5")) / 1000
+BUFFER_SIZE = int(os.getenv("PROFILE_BUFFER", "50"))
+MAX_DEPTH   = 64
+HEADER      = b"x-debug-profile"
+
+_profiles = deque(maxlen=BUFFER_SIZE)
+_active = {}        # profile id → profile being recorded
+_lock = threading.Lock()
+_sampler = None
+
+# A thread whose innermost frame is in one of these is parked, not working
+_IDLE_FILES = ("threading.py", "queue.py", "selectors.py", "base_events.py", "thread.py", "_worker.py")
+# Background loops sleeping between runs (database compactor, session sweeper, snapshot watcher)
+_IDLE_LOOPS = {("database.py", "_compact_loop"), ("auth.py", "_sweep_loop"), ("snapshot.py", "loop")}
+
+
+def _fold(frame) -> str:
+    parts = []
+    while frame is not None and len(parts) < MAX_DEPTH:
+        code = frame.f_code
+        parts.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}")
+        frame = frame.f_back
+    return ";".join(reversed(parts))
+
+
+def _sample_loop():
+    me = threading.get_ident()
+    while True:
+        time.sleep(INTERVAL)
+        with _lock:
+            if not _active:
+                continue
+            profiles = list(_active.values())
+        names = {t.ident: t.name for t in threading.enumerate()}
+        stacks = []
+        for tid, frame in sys._current_frames().items():
+            code = frame.f_code
+            if tid == me or code.co_filename.endswith(_IDLE_FILES) \
+                    or (os.path.basename(code.co_filename), code.co_name) in _IDLE_LOOPS:
+                continue
+            stacks.append(f"{names.get(tid, tid)};{_fold(frame)}")
+        for p in profiles:
+            p["samples"] += 1
+            for stack in stacks:
+                p["stacks"][stack] = p["stacks"].get(stack, 0) + 1
+
+
+def _start_sampler():
+    global _sampler
+    if not (_sampler and _sampler.is_alive()):
+        _sampler = threading.Thread(target=_sample_loop, name="request-profiler", daemon=True)
+        _sampler.start()
+
+
+def _authorized(headers: dict) -> bool:
+    auth_header = headers.get(b"authorization", b"").decode()
+    if not auth_header.startswith("Bearer "):
+        return False
+    from auth import validate_token
+    return validate_token(auth_header[len("Bearer "):]) is not None
+
+
+class ProfilingMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        headers = dict(scope.get("headers") or [])
+        requested = headers.get(HEADER, b"") in (b"1", b"true") and _authorized(headers)
+        if not requested and not (SAMPLE_RATE > 0 and random.random() < SAMPLE_RATE):
+            return await self.app(scope, receive, send)
+
+        profile = {"id": uuid.uuid4().hex[:12], "method": scope["method"], "path": scope["path"],
+                   "query": scope.get("query_string", b"").decode(), "reason": "header" if requested else "sampled",
+                   "started_at": time.time(), "status": None, "duration_ms": None,
+                   "samples": 0, "stacks": {}, "concurrent": 0}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                profile["status"] = message["status"]
+                message = {**message, "headers": list(message.get("headers", [])) +
+                           [(b"x-profile-id", profile["id"].encode())]}
+            await send(message)
+
+        with _lock:
+            _active[profile["id"]] = profile
+            profile["concurrent"] = len(_active) - 1
+        _start_sampler()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profile["duration_ms"] = round((time.perf_counter() - started) * 1000, 2)
+            with _lock:
+                _active.pop(profile["id"], None)
+                _profiles.append(profile)
+
+
+def list_profiles() -> list:
+    with _lock:
+        return [{k: v for k, v in p.items() if k != "stacks"} | {"stacks": len(p["stacks"])}
+                for p in reversed(_profiles)]
+
+
+def get_profile(profile_id: str):
+    with _lock:
+        return next((p for p in _profiles if p["id"] == profile_id), None)
+
+
+def folded(profile: dict) -> str:
+    """One 'frame;frame;frame count' line per distinct stack, heaviest first."""
+    return "\n".join(f"{stack} {n}" for stack, n in sorted(profile["stacks"].items(), key=lambda kv: -kv[1])) + "\n"
+
+
+def stats() -> dict:
+    return {"enabled": ENABLED, "sample_rate": SAMPLE_RATE, "interval_ms": INTERVAL * 1000,
+            "buffer_size": BUFFER_SIZE, "stored": len(_profiles), "in_progress": len(_active)}
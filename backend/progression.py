@@ -0,0 +1,195 @@
+"""
+In-season stat progression.
+Every scrape overwrites the current season's frames, so on each refresh
+record() stores how each player's numbers changed since the last recorded
+state: one row per (player, stat) that moved, in SQLite. Storage grows with
+the amount of change rather than roster size × refreshes, and a refresh where
+nothing moved stores nothing. trajectory() rebuilds a player's (or the team's)
+season as a cumulative sum of those deltas, pivoted to one row per snapshot.
+"""
+
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Optional
+
+import pandas as pd
+
+from players import player_id
+
+PROGRESSION_DB_PATH = os.getenv("PROGRESSION_DB_PATH", os.path.join(os.path.dirname(__file__), "progression.db"))
+ENABLED             = os.getenv("STAT_PROGRESSION", "1") == "1"
+EPSILON             = 1e-9   # float noise from re-parsed averages is not a change
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS stat_snapshots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, sport TEXT, season TEXT, frame TEXT, taken_at TEXT, changes INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_stat_snapshots_series ON stat_snapshots(sport, season, frame, id);
+
+CREATE TABLE IF NOT EXISTS stat_deltas (
+    snapshot_id INTEGER NOT NULL, player_id TEXT NOT NULL, stat TEXT NOT NULL, delta REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_stat_deltas_snapshot ON stat_deltas(snapshot_id);
+CREATE INDEX IF NOT EXISTS idx_stat_deltas_player   ON stat_deltas(player_id, snapshot_id);
+
+CREATE TABLE IF NOT EXISTS stat_players (player_id TEXT PRIMARY KEY, name TEXT);
+"""
+
+# Stats frames per sport, primary frame first; "Season" and text columns are never recorded
+FRAMES = {"boys_soccer": ("field_players", "goalies"), "girls_soccer": ("field_players", "goalies"),
+          "boys_basketball": ("players",), "girls_basketball": ("players",),
+          "baseball": ("batters", "pitchers"), "wrestling": ("wrestlers",)}
+# Rates don't add up across players, so the team trajectory leaves them out
+RATE_STATS = {"AVG", "SLG", "ERA"}
+# Per-game figures derived from a player's reconstructed totals
+PER_GAME = {"PPG": ("Points", "GP"), "RPG": ("Rebounds", "GP"), "APG": ("Assists", "GP")}
+
+_local = threading.local()
+_init_lock = threading.Lock()
+_initialized = set()
+_write_lock = threading.Lock()
+
+
+def _conn() -> sqlite3.Connection:
+    """One connection per thread; the snapshot loader and API workers may share the file."""
+    conn = getattr(_local, "conn", None)
+    if conn is None or getattr(_local, "path", None) != PROGRESSION_DB_PATH:
+        conn = sqlite3.connect(PROGRESSION_DB_PATH, timeout=10, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        _local.conn, _local.path = conn, PROGRESSION_DB_PATH
+        with _init_lock:
+            if PROGRESSION_DB_PATH not in _initialized:
+                conn.executescript(SCHEMA)
+                _initialized.add(PROGRESSION_DB_PATH)
+    return conn
+
+
+def _frame(sd: dict, frame: str) -> Optional[pd.DataFrame]:
+    df = (sd.get("current_stats") or {}).get(frame)
+    if not isinstance(df, pd.DataFrame) or df.empty or "Player" not in df.columns:
+        return None
+    return df
+
+
+def _values(df: pd.DataFrame) -> tuple:
+    """(Series of value by (player id, stat), {player id: name}) for every numeric column."""
+    ids = df["Player"].map(player_id)
+    numeric = df.select_dtypes("number").set_index(ids.rename("player_id"))
+    numeric = numeric[(numeric.index != "") & ~numeric.index.duplicated()]
+    values = numeric.rename_axis(columns="stat").stack().dropna().astype(float)
+    names = dict(zip(ids, df["Player"]))
+    return values, names
+
+
+def _recorded(conn: sqlite3.Connection, sport: str, season: str, frame: str) -> pd.Series:
+    """The last recorded state of a series: the sum of every delta so far."""
+    rows = conn.execute(
+        "SELECT d.player_id, d.stat, SUM(d.delta) FROM stat_deltas d JOIN stat_snapshots s ON s.id = d.snapshot_id "
+        "WHERE s.sport = ? AND s.season = ? AND s.frame = ? GROUP BY d.player_id, d.stat",
+        (sport, season, frame)).fetchall()
+    index = pd.MultiIndex.from_tuples([(p, s) for p, s, _ in rows], names=["player_id", "stat"])
+    return pd.Series([v for _, _, v in rows], index=index, dtype=float)
+
+
+def record(team_data: dict, taken_at: Optional[str] = None) -> dict:
+    """Store what changed in every sport's current-season stats since the last record(). Returns counts."""
+    if not ENABLED:
+        return {}
+    taken_at = taken_at or datetime.utcnow().isoformat(timespec="seconds")
+    summary = {"snapshots": 0, "deltas": 0, "unchanged": 0}
+    conn = _conn()
+    with _write_lock:
+        for sport, frames in FRAMES.items():
+            sd = team_data.get(sport) or {}
+            season = (sd.get("current_stats") or {}).get("season")
+            for frame in frames:
+                df = _frame(sd, frame)
+                if df is None or not season:
+                    continue
+                values, names = _values(df)
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    # A player who drops off the page counts as going back to zero
+                    delta = values.sub(_recorded(conn, sport, season, frame), fill_value=0)
+                    delta = delta[delta.abs() > EPSILON]
+                    if delta.empty:
+                        summary["unchanged"] += 1
+                        conn.execute("COMMIT")
+                        continue
+                    snapshot_id = conn.execute(
+                        "INSERT INTO stat_snapshots (sport, season, frame, taken_at, changes) VALUES (?, ?, ?, ?, ?)",
+                        (sport, season, frame, taken_at, len(delta))).lastrowid
+                    conn.executemany("INSERT INTO stat_deltas VALUES (?, ?, ?, ?)",
+                                     [(snapshot_id, p, s, d) for (p, s), d in delta.items()])
+                    conn.executemany("INSERT OR REPLACE INTO stat_players VALUES (?, ?)", names.items())
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+                summary["snapshots"] += 1
+                summary["deltas"] += len(delta)
+    print(f"  📈 Stat progression: {summary['deltas']} changes across {summary['snapshots']} frames"
+          + (f" ({summary['unchanged']} unchanged)" if summary["unchanged"] else ""))
+    return summary
+
+
+def trajectory(sport: str, season: str, frame: Optional[str] = None, pid: Optional[str] = None,
+               stat: Optional[str] = None) -> Optional[dict]:
+    """
+    Cumulative values at every snapshot of a series: the player's when pid is
+    given, otherwise team totals. None when nothing was recorded.
+    """
+    if sport not in FRAMES:
+        return None
+    frame = frame or FRAMES[sport][0]
+    conn = _conn()
+    snapshots = pd.read_sql_query(
+        "SELECT id, taken_at FROM stat_snapshots WHERE sport = ? AND season = ? AND frame = ? ORDER BY id",
+        conn, params=(sport, season, frame))
+    if snapshots.empty:
+        return None
+    sql = ("SELECT d.snapshot_id, d.stat, d.delta FROM stat_deltas d JOIN stat_snapshots s ON s.id = d.snapshot_id "
+           "WHERE s.sport = ? AND s.season = ? AND s.frame = ?")
+    params = [sport, season, frame]
+    if pid:
+        sql += " AND d.player_id = ?"
+        params.append(pid)
+    if stat:
+        sql += " AND d.stat = ?"
+        params.append(stat)
+    deltas = pd.read_sql_query(sql, conn, params=params)
+    if pid and deltas.empty:
+        return None
+    if not pid:
+        deltas = deltas[~deltas["stat"].isin(RATE_STATS)]
+
+    # One row per snapshot, one column per stat; snapshots where nothing moved carry the previous value
+    series = (deltas.pivot_table(index="snapshot_id", columns="stat", values="delta", aggfunc="sum")
+              .reindex(snapshots["id"], fill_value=0).fillna(0).cumsum())
+    if pid:
+        series = series.loc[series.ne(0).any(axis=1).cummax()]   # start at the player's first appearance
+        for name, (num, den) in PER_GAME.items():
+            if num in series.columns and den in series.columns and not stat:
+                series[name] = (series[num] / series[den].where(series[den] > 0)).round(2)
+    series = series.round(3)
+    taken = snapshots.set_index("id")["taken_at"]
+    points = [{"taken_at": taken[i], **{k: (None if pd.isna(v) else v) for k, v in row.items()}}
+              for i, row in zip(series.index, series.to_dict("records"))]
+    return {"sport": sport, "season": season, "frame": frame, "stats": list(series.columns),
+            "snapshots": len(points), "points": points}
+
+
+def player_name(pid: str) -> Optional[str]:
+    row = _conn().execute("SELECT name FROM stat_players WHERE player_id = ?", (pid,)).fetchone()
+    return row[0] if row else None
+
+
+def stats() -> dict:
+    conn = _conn()
+    snapshots, deltas = conn.execute("SELECT COUNT(*), COALESCE(SUM(changes), 0) FROM stat_snapshots").fetchone()
+    last = conn.execute("SELECT MAX(taken_at) FROM stat_snapshots").fetchone()[0]
+    return {"enabled": ENABLED, "path": PROGRESSION_DB_PATH, "snapshots": snapshots, "deltas": deltas,
+            "players": conn.execute("SELECT COUNT(*) FROM stat_players").fetchone()[0], "last_recorded": last}
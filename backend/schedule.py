@@ -0,0 +1,225 @@
+"""
+Unified, date-indexed calendar of every sport's games.
+build_index() parses each fixtures row's display date ("Sat, Sep 6") against
+its season and merges every sport and season into one list sorted by date,
+with parallel sorted date keys per sport and per opponent, so date-range,
+next-N and per-opponent queries are binary searches plus a slice instead of a
+scan of every frame; the fixtures frames themselves stay as scraped. A
+(sport, opponent) table backs the all-time head-to-head.
+"""
+
+import re
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import List, Optional
+
+import pandas as pd
+
+from players import normalize
+
+SPORTS = ["boys_soccer", "girls_soccer", "boys_basketball", "girls_basketball", "baseball", "wrestling"]
+SPORT_LABELS = {
+    "boys_soccer":      "Boys Soccer",
+    "girls_soccer":     "Girls Soccer",
+    "boys_basketball":  "Boys Basketball",
+    "girls_basketball": "Girls Basketball",
+    "baseball":         "Baseball",
+    "wrestling":        "Wrestling",
+}
+MONTH_NUMBERS = {m: i + 1 for i, m in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"])}
+DATE_PARTS = re.compile(r"\b(?:(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+(\d{1,2})"
+                        r"|(\d{1,2})/(\d{1,2})(?:/(\d{2,4}))?)\b", re.I)
+
+_lock = threading.Lock()
+_index = {
+    "all":       {"dates": [], "games": []},
+    "sports":    {},   # sport → view
+    "opponents": {},   # normalised opponent → view
+    "names":     {},   # normalised opponent → display name
+    "h2h":       {},   # (sport, normalised opponent) → every game, dated or not, oldest season first
+    "undated":   [],   # rows whose date could not be parsed
+    "version":   0,    # bumped on every rebuild; derived caches (ics feeds) key on it
+    "built_at":  0.0,
+}
+
+
+def _view(games: list) -> dict:
+    return {"dates": [g["date"] for g in games], "games": games}
+
+
+def parse_game_date(s: str, season: Optional[str]) -> str:
+    """'Sat, Sep 6' in season '2025-2026' → '2025-09-06'. Jul–Dec fall in the first year, Jan–Jun in the second; '' if unparseable."""
+    m = DATE_PARTS.search(s or "")
+    if not m:
+        return ""
+    if m.group(1):
+        month, day, year = MONTH_NUMBERS[m.group(1).lower()], int(m.group(2)), None
+    else:
+        month, day = int(m.group(3)), int(m.group(4))
+        year = int(m.group(5)) if m.group(5) else None
+        if year is not None and year < 100:
+            year += 2000
+    if year is None:
+        if not (season or "")[:4].isdigit():
+            return ""
+        first = int(season[:4])
+        year = first if month >= 7 else first + 1
+    try:
+        return date(year, month, day).isoformat()
+    except ValueError:
+        return ""
+
+
+def _entry(sport: str, row: dict, season: Optional[str]) -> dict:
+    season = row.get("Season") or season or ""
+    return {"date": parse_game_date(row.get("Date", ""), season), "sport": sport, "display_date": row.get("Date", ""),
+            "opponent": row.get("Opponent", ""), "location": row.get("Location", ""),
+            "result": row.get("Result", ""), "outcome": row.get("Outcome", "—"), "record": row.get("Record", ""),
+            "season": season, "played": row.get("Outcome", "—") != "—"}
+
+
+def build_index(team_data: dict) -> dict:
+    """Merge every sport's fixtures into the calendar; call whenever team_data is (re)loaded."""
+    games, undated = [], []
+    for sport in SPORTS:
+        sd = team_data.get(sport) or {}
+        seasons = sd.get("fixture_history") or {None: sd.get("fixtures") or {}}
+        for season in sorted(seasons, key=str):
+            df = (seasons[season] or {}).get("games")
+            if not isinstance(df, pd.DataFrame) or df.empty:
+                continue
+            for row in df.to_dict("records"):
+                entry = _entry(sport, row, season)
+                (games if entry["date"] else undated).append(entry)
+    # Stable sort keeps each sport's scraped order for same-day games
+    games.sort(key=lambda g: g["date"])
+    by_sport, by_opp, names, h2h = {}, {}, {}, {}
+    for g in games:
+        by_sport.setdefault(g["sport"], []).append(g)
+        key = normalize(g["opponent"])
+        if key:
+            by_opp.setdefault(key, []).append(g)
+            names.setdefault(key, g["opponent"])
+    for g in sorted(games + undated, key=lambda g: (g["season"], g["date"])):
+        key = normalize(g["opponent"])
+        if key:
+            h2h.setdefault((g["sport"], key), []).append(g)
+            names.setdefault(key, g["opponent"])
+    with _lock:
+        _index.update(all=_view(games), sports={s: _view(v) for s, v in by_sport.items()},
+                      opponents={k: _view(v) for k, v in by_opp.items()}, names=names, h2h=h2h, undated=undated,
+                      version=_index["version"] + 1, built_at=time.time())
+    print(f"  📅 Calendar: {len(games)} dated games across {len(by_sport)} sports, {len(names)} opponents"
+          + (f" ({len(undated)} undated)" if undated else ""))
+    return stats()
+
+
+def _select(sport: Optional[str] = None) -> dict:
+    if sport:
+        return _index["sports"].get(sport, {"dates": [], "games": []})
+    return _index["all"]
+
+
+def between(start: Optional[str] = None, end: Optional[str] = None, sport: Optional[str] = None,
+            view: Optional[dict] = None) -> List[dict]:
+    """Games with start <= date <= end (ISO dates, both inclusive, either open)."""
+    view = view or _select(sport)
+    lo = bisect_left(view["dates"], start) if start else 0
+    hi = bisect_right(view["dates"], end) if end else len(view["dates"])
+    return view["games"][lo:hi]
+
+
+def upcoming(n: int = 5, after: Optional[str] = None, sport: Optional[str] = None) -> List[dict]:
+    """The next n games on or after `after` (default today)."""
+    view = _select(sport)
+    lo = bisect_left(view["dates"], after or date.today().isoformat())
+    return view["games"][lo:lo + n]
+
+
+def recent(n: int = 10, before: Optional[str] = None, sport: Optional[str] = None) -> List[dict]:
+    """The last n games strictly before `before` (default today), oldest first."""
+    view = _select(sport)
+    hi = bisect_left(view["dates"], before or date.today().isoformat())
+    return view["games"][max(0, hi - n):hi]
+
+
+def opponents(name: str) -> List[str]:
+    """Normalised opponent keys the text refers to: an exact name, else every opponent containing it."""
+    q = normalize(name)
+    if not q:
+        return []
+    if q in _index["names"]:
+        return [q]
+    return sorted(k for k in _index["names"] if q in k)
+
+
+def against(name: str, sport: Optional[str] = None, start: Optional[str] = None,
+            end: Optional[str] = None) -> List[dict]:
+    """Every dated game against the opponent(s) matching `name`, by date."""
+    keys, games = opponents(name), []
+    for key in keys:
+        view = _index["opponents"].get(key, {"dates": [], "games": []})
+        games += [g for g in between(start, end, view=view) if not sport or g["sport"] == sport]
+    return games if len(keys) == 1 else sorted(games, key=lambda g: g["date"])
+
+
+# ── HEAD TO HEAD ──
+SCORE = re.compile(r"(\d+)\s*-\s*(\d+)")
+SCORE_UNITS = {"boys_soccer": "goals", "girls_soccer": "goals", "boys_basketball": "points",
+               "girls_basketball": "points", "baseball": "runs", "wrestling": "team points"}
+
+
+def _score(g: dict) -> Optional[tuple]:
+    """(ours, theirs) from a result like 'W 3-1'; the winner's score is listed first."""
+    m = SCORE.search(g["result"] or "") if g["played"] else None
+    if not m:
+        return None
+    hi, lo = sorted((int(m.group(1)), int(m.group(2))), reverse=True)
+    return (lo, hi) if g["outcome"] == "L" else (hi, lo)
+
+
+def _tally(games: list) -> dict:
+    played = [g for g in games if g["played"]]
+    scores = [s for s in map(_score, played) if s]
+    record = {o: sum(g["outcome"] == o for g in played) for o in "WLT"}
+    scored, allowed = sum(s[0] for s in scores), sum(s[1] for s in scores)
+    return {"games_played": len(played), "record": record,
+            "record_str": f"{record['W']}-{record['L']}" + (f"-{record['T']}" if record["T"] else ""),
+            "scored": scored, "allowed": allowed, "differential": scored - allowed,
+            "avg_margin": round((scored - allowed) / len(scores), 2) if scores else None}
+
+
+def head_to_head(sport: str, name: str) -> Optional[dict]:
+    """All-time record, score differential and games for one sport against the opponent(s) matching `name`."""
+    keys = [k for k in opponents(name) if (sport, k) in _index["h2h"]]
+    if not keys:
+        return None
+    games = [g for k in keys for g in _index["h2h"][(sport, k)]]
+    if len(keys) > 1:
+        games.sort(key=lambda g: (g["season"], g["date"]))
+    seasons = {}
+    for g in games:
+        seasons.setdefault(g["season"], []).append(g)
+    return {"sport": sport, "opponent": name, "matched": [opponent_name(k) for k in keys],
+            "units": SCORE_UNITS.get(sport, "points"), **_tally(games),
+            "by_season": {season: _tally(gs) for season, gs in sorted(seasons.items(), reverse=True)},
+            "last_meeting": next((g for g in reversed(games) if g["played"]), None), "games": games}
+
+
+def version() -> tuple:
+    """(version, built_at) of the current calendar."""
+    return _index["version"], _index["built_at"]
+
+
+def opponent_name(key: str) -> str:
+    return _index["names"].get(key, key)
+
+
+def stats() -> dict:
+    dates = _index["all"]["dates"]
+    return {"games": len(dates), "undated": len(_index["undated"]), "opponents": len(_index["names"]),
+            "sports": {s: len(v["dates"]) for s, v in _index["sports"].items()},
+            "first": dates[0] if dates else None, "last": dates[-1] if dates else None}
@@ -1,8 +1,7 @@
 import re
-import requests
-from bs4 import BeautifulSoup
 import pandas as pd
 
+SCHOOL  = 'edison-edison'   # nj.com school slug; opponents use their own
 HEADERS = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'}
 
 SEASONS = ["2025-2026", "2024-2025", "2023-2024", "2022-2023", "2021-2022"]
@@ -20,6 +19,9 @@ MONTH_ABBREVS = re.compile(
 
 
 def _get(url):
+    # requests and bs4 load on the first scrape, not when api.py imports SEASONS
+    import requests
+    from bs4 import BeautifulSoup
     try:
         r = requests.get(url, headers=HEADERS, timeout=12)
         r.raise_for_status()
@@ -95,8 +97,8 @@ def _scrape_meta(soup):
 # SOCCER
 # ──────────────────────────────────────────────
 
-def scrape_soccer_stats(sport_slug, year):
-    url = f"https://highschoolsports.nj.com/school/edison-edison/{sport_slug}/season/{year}/stats"
+def scrape_soccer_stats(sport_slug, year, school=SCHOOL):
+    url = f"https://highschoolsports.nj.com/school/{school}/{sport_slug}/season/{year}/stats"
     soup = _get(url)
     if not soup:
         return None
@@ -159,9 +161,9 @@ def scrape_soccer_stats(sport_slug, year):
 #          idx:  0     1    2    3    4    5    6    7    8    9    10
 # ──────────────────────────────────────────────
 
-def scrape_basketball_stats(gender='boys', year=CURRENT_SEASON):
+def scrape_basketball_stats(gender='boys', year=CURRENT_SEASON, school=SCHOOL):
     slug = 'boysbasketball' if gender == 'boys' else 'girlsbasketball'
-    url  = f"https://highschoolsports.nj.com/school/edison-edison/{slug}/season/{year}/stats"
+    url  = f"https://highschoolsports.nj.com/school/{school}/{slug}/season/{year}/stats"
     soup = _get(url)
     if not soup:
         return None
@@ -209,9 +211,9 @@ def scrape_basketball_stats(gender='boys', year=CURRENT_SEASON):
 # Profile URL: /player/{slug}/girlsbasketball/season/{year}
 # ──────────────────────────────────────────────
 
-def _get_roster_links(sport_slug, year):
+def _get_roster_links(sport_slug, year, school=SCHOOL):
     """Get list of (player_name, player_url) from roster page."""
-    url  = f"https://highschoolsports.nj.com/school/edison-edison/{sport_slug}/season/{year}/roster"
+    url  = f"https://highschoolsports.nj.com/school/{school}/{sport_slug}/season/{year}/roster"
     soup = _get(url)
     if not soup:
         return []
@@ -287,9 +289,9 @@ def _parse_featured_stats(soup, year):
     return result if result else None
 
 
-def scrape_girls_basketball_stats(year=CURRENT_SEASON):
+def scrape_girls_basketball_stats(year=CURRENT_SEASON, school=SCHOOL):
     """Scrape girls basketball by visiting each player's profile page."""
-    roster = _get_roster_links('girlsbasketball', year)
+    roster = _get_roster_links('girlsbasketball', year, school)
     print(f"  📋 Girls basketball roster: {len(roster)} players found for {year}")
     players = []
 
@@ -342,9 +344,9 @@ def scrape_girls_basketball_stats(year=CURRENT_SEASON):
 # Weight class appears as: "2025-2026 144 pound" in page text
 # ──────────────────────────────────────────────
 
-def scrape_wrestling_stats(year=CURRENT_SEASON):
+def scrape_wrestling_stats(year=CURRENT_SEASON, school=SCHOOL):
     """Scrape wrestling by visiting each player's profile page."""
-    roster = _get_roster_links('wrestling', year)
+    roster = _get_roster_links('wrestling', year, school)
     print(f"  📋 Wrestling roster: {len(roster)} players found for {year}")
     wrestlers = []
 
@@ -420,8 +422,8 @@ def scrape_wrestling_stats(year=CURRENT_SEASON):
 # Cols pitching: Player | PIT | IP | H | R | ER | BB | K | HB | ERA
 # ──────────────────────────────────────────────
 
-def scrape_baseball_stats(year=BASEBALL_SEASON):
-    url  = f"https://highschoolsports.nj.com/school/edison-edison/baseball/season/{year}/stats"
+def scrape_baseball_stats(year=BASEBALL_SEASON, school=SCHOOL):
+    url  = f"https://highschoolsports.nj.com/school/{school}/baseball/season/{year}/stats"
     soup = _get(url)
     if not soup:
         return None
@@ -501,7 +503,7 @@ def _is_valid_date(s):
 
 
 def scrape_fixtures(sport_slug, year):
-    url  = f"https://highschoolsports.nj.com/school/edison-edison/{sport_slug}/season/{year}"
+    url  = f"https://highschoolsports.nj.com/school/{SCHOOL}/{sport_slug}/season/{year}"
     soup = _get(url)
     if not soup:
         return {'coach': 'Unknown', 'record': None, 'games': pd.DataFrame()}
@@ -564,34 +566,44 @@ def scrape_fixtures(sport_slug, year):
     return {'coach': coach_name, 'record': record_str, 'games': pd.DataFrame(games)}
 
 
+def scrape_fixture_history(sport_slug):
+    """scrape_fixtures for every season in SEASONS, keyed by season."""
+    return {season: scrape_fixtures(sport_slug, season) for season in SEASONS}
+
+
 # ──────────────────────────────────────────────
 # OPPONENT SCRAPER
 # ──────────────────────────────────────────────
 
+# Per-sport stats scraper, called as f(year, school slug)
+OPPONENT_SCRAPERS = {
+    'boyssoccer':      lambda year, school: scrape_soccer_stats('boyssoccer', year, school),
+    'girlssoccer':     lambda year, school: scrape_soccer_stats('girlssoccer', year, school),
+    'boysbasketball':  lambda year, school: scrape_basketball_stats('boys', year, school),
+    'girlsbasketball': scrape_girls_basketball_stats,
+    'baseball':        scrape_baseball_stats,
+    'wrestling':       scrape_wrestling_stats,
+}
+
+
+def school_slug(team_name):
+    """'J.P. Stevens' → 'jp-stevens-jp-stevens' (nj.com repeats the school name as town-school)."""
+    slug = re.sub(r'[^a-z0-9]+', '-', team_name.lower().replace('.', '')).strip('-')
+    return f"{slug}-{slug}"
+
+
 def scrape_opponent_data(team_name, sport_slug='boyssoccer', year=None):
-    year = year or CURRENT_SEASON
-    slug = team_name.lower().replace(' ', '-')
-    url  = f"https://highschoolsports.nj.com/school/{slug}-{slug}/{sport_slug}/season/{year}/stats"
-    soup = _get(url)
-    if not soup:
+    """An opponent's stats for one sport and season, as JSON-ready rows; None if nothing was found."""
+    year = year or (BASEBALL_SEASON if sport_slug == 'baseball' else CURRENT_SEASON)
+    scrape = OPPONENT_SCRAPERS.get(sport_slug)
+    data = scrape(year, school_slug(team_name)) if scrape else None
+    frames = {k: v for k, v in (data or {}).items() if isinstance(v, pd.DataFrame)}
+    if not any(not df.empty for df in frames.values()):
         return None
-    tables = soup.find_all('table', class_='table-stats')
-    if not tables:
-        return None
-    players = []
-    for row in tables[0].find('tbody').find_all('tr'):
-        cols = row.find_all('td')
-        if len(cols) >= 4:
-            try:
-                players.append({
-                    'Player':  (cols[0].find('a') or cols[0]).text.strip(),
-                    'Goals':   _safe_int(cols, 1),
-                    'Assists': _safe_int(cols, 2),
-                    'Points':  _safe_int(cols, 3),
-                })
-            except:
-                continue
-    return {'team': team_name, 'players': players, 'season': year}
+    # The first frame is the main roster (field players, players, batters, wrestlers)
+    records = {k: df.astype(object).where(df.notna(), None).to_dict('records') for k, df in frames.items()}
+    return {'team': team_name, 'sport': sport_slug, 'season': year,
+            'players': next(iter(records.values())), 'frames': records}
 
 
 # ──────────────────────────────────────────────
@@ -609,11 +621,13 @@ def scrape_all_data():
         data = scrape_soccer_stats('boyssoccer', season)
         if data:
             bs_history[season] = data
+    bs_fixtures = scrape_fixture_history('boyssoccer')
     result['boys_soccer'] = {
         'current_stats':  bs_history.get(CURRENT_SEASON),
         'previous_stats': bs_history.get(PREVIOUS_SEASON),
         'history':        bs_history,
-        'fixtures':       scrape_fixtures('boyssoccer', CURRENT_SEASON),
+        'fixtures':       bs_fixtures[CURRENT_SEASON],
+        'fixture_history': bs_fixtures,
     }
     # Backwards compat keys used by old endpoints
     result['current_stats']  = result['boys_soccer']['current_stats']
@@ -627,10 +641,12 @@ def scrape_all_data():
         data = scrape_soccer_stats('girlssoccer', season)
         if data:
             gs_history[season] = data
+    gs_fixtures = scrape_fixture_history('girlssoccer')
     result['girls_soccer'] = {
         'current_stats': gs_history.get(CURRENT_SEASON),
         'history':       gs_history,
-        'fixtures':      scrape_fixtures('girlssoccer', CURRENT_SEASON),
+        'fixtures':      gs_fixtures[CURRENT_SEASON],
+        'fixture_history': gs_fixtures,
     }
 
     # ── Boys Basketball ──
@@ -640,10 +656,12 @@ def scrape_all_data():
         data = scrape_basketball_stats('boys', season)
         if data:
             bb_history[season] = data
+    bb_fixtures = scrape_fixture_history('boysbasketball')
     result['boys_basketball'] = {
         'current_stats': bb_history.get(CURRENT_SEASON),
         'history':       bb_history,
-        'fixtures':      scrape_fixtures('boysbasketball', CURRENT_SEASON),
+        'fixtures':      bb_fixtures[CURRENT_SEASON],
+        'fixture_history': bb_fixtures,
     }
 
     # ── Girls Basketball ──
@@ -653,10 +671,12 @@ def scrape_all_data():
         data = scrape_girls_basketball_stats(season)
         if data:
             gb_history[season] = data
+    gb_fixtures = scrape_fixture_history('girlsbasketball')
     result['girls_basketball'] = {
         'current_stats': gb_history.get(CURRENT_SEASON),
         'history':       gb_history,
-        'fixtures':      scrape_fixtures('girlsbasketball', CURRENT_SEASON),
+        'fixtures':      gb_fixtures[CURRENT_SEASON],
+        'fixture_history': gb_fixtures,
     }
 
     # ── Baseball ──
@@ -666,10 +686,12 @@ def scrape_all_data():
         data = scrape_baseball_stats(season)
         if data:
             bsb_history[season] = data
+    bsb_fixtures = scrape_fixture_history('baseball')
     result['baseball'] = {
         'current_stats': bsb_history.get(BASEBALL_SEASON),
         'history':       bsb_history,
-        'fixtures':      scrape_fixtures('baseball', BASEBALL_SEASON),
+        'fixtures':      bsb_fixtures[BASEBALL_SEASON],
+        'fixture_history': bsb_fixtures,
     }
 
     # ── Wrestling ──
@@ -679,10 +701,12 @@ def scrape_all_data():
         data = scrape_wrestling_stats(season)
         if data:
             wr_history[season] = data
+    wr_fixtures = scrape_fixture_history('wrestling')
     result['wrestling'] = {
         'current_stats': wr_history.get(CURRENT_SEASON),
         'history':       wr_history,
-        'fixtures':      scrape_fixtures('wrestling', CURRENT_SEASON),
+        'fixtures':      wr_fixtures[CURRENT_SEASON],
+        'fixture_history': wr_fixtures,
     }
 
     print('\n✅ All sports scraped!')
@@ -0,0 +1,188 @@
+"""
+Shared, read-only team_data snapshots for multi-worker deployments.
+One loader process scrapes and publishes a snapshot directory; every API
+worker attaches to it instead of scraping. Numeric columns are .npy files
+opened with mmap_mode="r", so the OS page cache holds a single copy shared by
+all workers; text columns are small and decoded per worker.
+
+    python snapshot.py --dir /srv/edison/snapshot                 # scrape once and publish
+    python snapshot.py --dir /srv/edison/snapshot --every 3600    # keep refreshing hourly
+    TEAM_DATA_SNAPSHOT=/srv/edison/snapshot uvicorn api:app --workers 4
+"""
+
+import argparse
+import json
+import os
+import shutil
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+SNAPSHOT_DIR   = os.getenv("TEAM_DATA_SNAPSHOT", "")
+SNAPSHOT_WAIT  = float(os.getenv("TEAM_DATA_SNAPSHOT_WAIT", "300"))   # seconds a worker waits for the loader
+SNAPSHOT_POLL  = float(os.getenv("TEAM_DATA_SNAPSHOT_POLL", "30"))    # seconds between checks for a newer one
+SNAPSHOT_KEEP  = 3
+CURRENT = "CURRENT"
+
+
+# ── WRITE ──
+def _write_frame(df: pd.DataFrame, folder: str, name: str) -> dict:
+    meta = {"columns": [], "rows": len(df),
+            "index": None if isinstance(df.index, pd.RangeIndex) and df.index.start == 0 and df.index.step == 1
+            else df.index.tolist()}
+    for i, col in enumerate(df.columns):
+        s = df.iloc[:, i]
+        entry = {"name": col, "dtype": str(s.dtype)}
+        if isinstance(s.dtype, np.dtype) and s.dtype.kind in "biuf":
+            entry["file"] = f"{name}.{i}.npy"
+            np.save(os.path.join(folder, entry["file"]), s.to_numpy())
+        else:
+            entry["values"] = [None if v is None or (isinstance(v, float) and v != v) else v for v in s.tolist()]
+        meta["columns"].append(entry)
+    return meta
+
+
+def write_snapshot(team_data: dict, root: str = SNAPSHOT_DIR) -> str:
+    """Write team_data under root/<version>/ and atomically point root/CURRENT at it."""
+    os.makedirs(root, exist_ok=True)
+    version = time.strftime("%Y%m%dT%H%M%S", time.gmtime()) + f"-{os.getpid()}"
+    tmp = os.path.join(root, f".{version}.tmp")
+    os.makedirs(tmp)
+    frames, seen = {}, {}
+
+    def encode(obj, path):
+        if isinstance(obj, pd.DataFrame):
+            if id(obj) not in frames:
+                frames[id(obj)] = {"name": f"f{len(frames)}", **_write_frame(obj, tmp, f"f{len(frames)}")}
+            return {"__frame__": frames[id(obj)]["name"]}
+        if isinstance(obj, dict):
+            # team_data shares objects (current_stats is also history[season]); keep them shared
+            if id(obj) in seen:
+                return {"__ref__": seen[id(obj)]}
+            seen[id(obj)] = path
+            return {"__dict__": [[k, encode(v, path + [k])] for k, v in obj.items()]}
+        if isinstance(obj, (list, tuple)):
+            return [encode(v, path + [i]) for i, v in enumerate(obj)]
+        return obj
+
+    manifest = {"version": version, "created_at": time.time(), "data": encode(team_data, []),
+                "frames": {f["name"]: f for f in frames.values()}}
+    with open(os.path.join(tmp, "manifest.json"), "w") as f:
+        json.dump(manifest, f, default=str)
+    os.rename(tmp, os.path.join(root, version))
+    pointer = os.path.join(root, f".{CURRENT}.{os.getpid()}")
+    with open(pointer, "w") as f:
+        f.write(version)
+    os.replace(pointer, os.path.join(root, CURRENT))
+
+    # Older versions can go: workers that still map them keep the pages until they switch
+    versions = sorted(d for d in os.listdir(root) if not d.startswith(".") and d != CURRENT)
+    for old in versions[:-SNAPSHOT_KEEP]:
+        shutil.rmtree(os.path.join(root, old), ignore_errors=True)
+    return version
+
+
+# ── READ ──
+def _read_frame(meta: dict, folder: str) -> pd.DataFrame:
+    data = {}
+    for col in meta["columns"]:
+        if "file" in col:
+            # Plain ndarray view over the read-only mapping; no bytes are copied
+            data[col["name"]] = np.load(os.path.join(folder, col["file"]), mmap_mode="r").view(np.ndarray)
+        else:
+            # Pin the written dtype; inferring turns object text columns into strings with NA cells (pd.NA on 2.x)
+            data[col["name"]] = pd.Series(col["values"], dtype=object if col["dtype"] == "object" else col["dtype"])
+    df = pd.DataFrame(data, columns=[c["name"] for c in meta["columns"]], copy=False)
+    if not meta["columns"]:
+        df = pd.DataFrame(index=range(meta["rows"]))
+    if meta["index"] is not None:
+        df.index = meta["index"]
+    return df
+
+
+def current_version(root: str = SNAPSHOT_DIR) -> str:
+    try:
+        with open(os.path.join(root, CURRENT)) as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+
+def load_snapshot(root: str = SNAPSHOT_DIR, wait: float = SNAPSHOT_WAIT) -> tuple:
+    """(version, team_data) for the current snapshot, waiting up to `wait` seconds for the loader to publish one."""
+    deadline = time.time() + wait
+    while not current_version(root):
+        if time.time() > deadline:
+            raise RuntimeError(f"No team_data snapshot in {root} after {wait:.0f}s — is the loader running?")
+        time.sleep(1)
+    version = current_version(root)
+    folder = os.path.join(root, version)
+    with open(os.path.join(folder, "manifest.json")) as f:
+        manifest = json.load(f)
+    frames = {name: _read_frame(meta, folder) for name, meta in manifest["frames"].items()}
+    shared = {}
+
+    def decode(obj, path):
+        if isinstance(obj, dict):
+            if "__frame__" in obj:
+                return frames[obj["__frame__"]]
+            if "__ref__" in obj:
+                return shared[tuple(obj["__ref__"])]
+            out = shared[tuple(path)] = {}
+            for k, v in obj["__dict__"]:
+                out[k] = decode(v, path + [k])
+            return out
+        if isinstance(obj, list):
+            return [decode(v, path + [i]) for i, v in enumerate(obj)]
+        return obj
+
+    return version, decode(manifest["data"], [])
+
+
+def watch(on_change, root: str = SNAPSHOT_DIR, version: str = "", poll: float = SNAPSHOT_POLL):
+    """Call on_change(version, team_data) from a daemon thread whenever the loader publishes a newer snapshot."""
+    def loop():
+        seen = version
+        while True:
+            time.sleep(poll)
+            try:
+                if current_version(root) not in ("", seen):
+                    seen, data = load_snapshot(root, wait=0)
+                    on_change(seen, data)
+            except Exception as e:
+                print(f"  ⚠️ Snapshot reload failed: {e}")
+    thread = threading.Thread(target=loop, name="team-data-snapshot-watch", daemon=True)
+    thread.start()
+    return thread
+
+
+# ── LOADER ──
+def main():
+    parser = argparse.ArgumentParser(description="Scrape team data and publish a shared snapshot for API workers")
+    parser.add_argument("--dir", default=SNAPSHOT_DIR or os.path.join(os.path.dirname(__file__), "snapshot"))
+    parser.add_argument("--every", type=float, default=0, help="re-scrape and republish every N seconds (0 = once)")
+    args = parser.parse_args()
+
+    from scraper import scrape_all_data
+    import opponents
+    import progression
+    while True:
+        started = time.time()
+        try:
+            data = scrape_all_data()
+            progression.record(data)
+            version = write_snapshot(data, args.dir)
+            # Once here, not in every worker: the workers read the shared opponent cache
+            opponents.prefetch(data)
+            print(f"📸 Published team_data snapshot {version} in {time.time() - started:.1f}s")
+        except Exception as e:
+            print(f"❌ Snapshot failed: {e}")
+        if args.every <= 0:
+            break
+        time.sleep(max(0, args.every - (time.time() - started)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+Synthetic team_data for offline benchmarking.
+Produces the same structure and DataFrame columns as scraper.scrape_all_data()
+so api.py and ai_agent.py can run without touching nj.com, plus coach portal
+data shaped like coach_data.json for load-testing the coach endpoints.
+"""
+
+import json
+import random
+import uuid
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from scraper import SEASONS, CURRENT_SEASON, PREVIOUS_SEASON, BASEBALL_SEASON
+
+FIRST_NAMES = ["Emmanuel", "Jake", "Luis", "Aiden", "Marcus", "Noah", "Ethan", "Daniel", "Kevin", "Omar",
+               "Sofia", "Ava", "Maya", "Chloe", "Priya", "Isabella", "Grace", "Nina", "Zoe", "Leah"]
+LAST_NAMES  = ["Ortiz", "Miller", "Patel", "Nguyen", "Johnson", "Garcia", "Kim", "Rodriguez", "Smith", "Singh",
+               "Brown", "Lopez", "Chen", "Williams", "Davis", "Martinez", "Shah", "Walker", "Young", "Hall"]
+OPPONENTS   = ["J.P. Stevens", "Piscataway", "South Plainfield", "Old Bridge", "Sayreville", "East Brunswick",
+               "Metuchen", "New Brunswick", "Perth Amboy", "Woodbridge", "Colonia", "Monroe", "North Brunswick"]
+MONTHS      = ["Sep", "Oct", "Nov", "Dec", "Jan", "Feb", "Mar", "Apr", "May"]
+YEARS       = ["Fr", "So", "Jr", "Sr"]
+
+
+def _name(r: random.Random) -> str:
+    return f"{r.choice(FIRST_NAMES)} {r.choice(LAST_NAMES)}"
+
+
+def _pos(r: random.Random, positions) -> str:
+    return f"{r.choice(YEARS)}/{r.choice(positions)}"
+
+
+def _soccer(r, n, year):
+    field = []
+    for _ in range(n):
+        g, a = r.randint(0, 14), r.randint(0, 10)
+        field.append({'Player': _name(r), 'Year/Position': _pos(r, ["F", "M", "D"]),
+                      'Goals': g, 'Assists': a, 'Points': g * 2 + a, 'Season': year})
+    goalies = [{'Player': _name(r), 'Year/Position': _pos(r, ["GK"]),
+                'Saves': r.randint(0, 120), 'Games Played': r.randint(1, 20), 'Season': year} for _ in range(3)]
+    return {'field_players': pd.DataFrame(field), 'goalies': pd.DataFrame(goalies), 'season': year}
+
+
+def _basketball(r, n, year):
+    players = []
+    for _ in range(n):
+        gp = r.randint(0, 24)
+        players.append({'Player': _name(r), 'Year/Position': _pos(r, ["G", "F", "C"]),
+                        'Points': float(r.randint(0, 22) * gp), 'Rebounds': float(r.randint(0, 10) * gp),
+                        'Assists': float(r.randint(0, 7) * gp), 'Blocks': float(r.randint(0, 30)),
+                        'Steals': float(r.randint(0, 40)), 'GP': gp, 'FGM_2': float(r.randint(0, 120)),
+                        'FGM_3': float(r.randint(0, 50)), 'FTM': float(r.randint(0, 60)),
+                        'FTA': float(r.randint(0, 80)), 'Season': year})
+    return {'players': pd.DataFrame(players), 'season': year}
+
+
+def _baseball(r, n, year):
+    batters, pitchers = [], []
+    for _ in range(n):
+        ab = r.randint(0, 80); h = r.randint(0, ab) // 2
+        batters.append({'Player': _name(r), 'Year/Position': _pos(r, ["C", "SS", "OF", "1B", "2B", "3B"]),
+                        'AB': ab, 'R': r.randint(0, 20), 'H': h, 'RBI': r.randint(0, 25),
+                        '2B': r.randint(0, 8), '3B': r.randint(0, 3), 'HR': r.randint(0, 6),
+                        'BB': r.randint(0, 15), 'AVG': round(h / ab, 3) if ab else 0,
+                        'SLG': round(r.random() * 0.7, 3), 'Season': year})
+    for _ in range(max(n // 3, 1)):
+        ip = float(r.randint(0, 60))
+        er = r.randint(0, 25)
+        pitchers.append({'Player': _name(r), 'Year/Position': _pos(r, ["P"]), 'IP': ip,
+                         'H': r.randint(0, 60), 'ER': er, 'BB': r.randint(0, 25),
+                         'Strikeouts': r.randint(0, 70), 'ERA': round(er * 7 / ip, 2) if ip else 0, 'Season': year})
+    return {'batters': pd.DataFrame(batters), 'pitchers': pd.DataFrame(pitchers), 'season': year}
+
+
+def _wrestling(r, n, year):
+    wrestlers = []
+    for _ in range(n):
+        w = r.randint(0, 30)
+        wrestlers.append({'Player': _name(r), 'Weight': f"{r.choice([106, 113, 120, 126, 132, 138, 144, 150, 157, 165, 175, 190, 215, 285])} lb",
+                          'Wins': w, 'Losses': r.randint(0, 15), 'Pins': r.randint(0, w),
+                          'Tech Falls': r.randint(0, 4), 'Season': year})
+    return {'wrestlers': pd.DataFrame(wrestlers), 'season': year}
+
+
+def _fixtures(r, n_games, year, played_fraction=0.6, opponents=OPPONENTS):
+    games, w, l = [], 0, 0
+    for i in range(n_games):
+        played = i < int(n_games * played_fraction)
+        outcome = r.choice(["W", "W", "L", "T"]) if played else '—'
+        w += outcome == "W"; l += outcome == "L"
+        opp = r.choice(opponents)
+        date = f"{MONTHS[i * len(MONTHS) // n_games]} {r.randint(1, 28)}"
+        games.append({'Date': date, 'Opponent': opp, 'Location': r.choice(["Home", "Away"]),
+                      'Result': f"{outcome} {r.randint(0, 5)}-{r.randint(0, 5)}" if played else '',
+                      'Outcome': outcome, 'Record': f"{w}-{l}" if played else '—', 'Season': year})
+    return {'coach': _name(r), 'record': f"{w}-{l}", 'games': pd.DataFrame(games)}
+
+
+SPORT_BUILDERS = {
+    "boys_soccer":      (_soccer, CURRENT_SEASON),
+    "girls_soccer":     (_soccer, CURRENT_SEASON),
+    "boys_basketball":  (_basketball, CURRENT_SEASON),
+    "girls_basketball": (_basketball, CURRENT_SEASON),
+    "baseball":         (_baseball, BASEBALL_SEASON),
+    "wrestling":        (_wrestling, CURRENT_SEASON),
+}
+
+
+def make_team_data(seasons=None, players_per_sport: int = 25, games_per_season: int = 18, seed: int = 0,
+                   opponents=OPPONENTS) -> dict:
+    """Build a team_data dict shaped exactly like scrape_all_data() output."""
+    r = random.Random(seed)
+    past = random.Random(f"{seed}-fixtures")   # separate stream so the current-season data stays as before
+    seasons = seasons or SEASONS
+    result = {}
+    for sport, (builder, current) in SPORT_BUILDERS.items():
+        history = {year: builder(r, players_per_sport, year) for year in seasons}
+        fixtures = _fixtures(r, games_per_season, current, opponents=opponents)
+        result[sport] = {
+            'current_stats': history.get(current),
+            'history':       history,
+            'fixtures':      fixtures,
+            'fixture_history': {year: fixtures if year == current else
+                                _fixtures(past, games_per_season, year, played_fraction=1.0, opponents=opponents)
+                                for year in seasons},
+        }
+    result['boys_soccer']['previous_stats'] = result['boys_soccer']['history'].get(PREVIOUS_SEASON)
+    # Backwards compat keys used by old endpoints
+    result['current_stats']  = result['boys_soccer']['current_stats']
+    result['previous_stats'] = result['boys_soccer']['previous_stats']
+    result['fixtures']       = result['boys_soccer']['fixtures']
+    return result
+
+
+# ── SCHOOLS ──
+TOWNS = ["Edison", "Piscataway", "Metuchen", "Woodbridge", "Sayreville", "Old Bridge", "Monroe", "Colonia",
+         "Perth Amboy", "Carteret", "Rahway", "Linden", "Cranford", "Westfield", "Plainfield", "Somerville"]
+
+
+def school_names(n: int) -> list:
+    """Edison first, then neighbouring towns; numbered once the list runs out."""
+    return [TOWNS[i % len(TOWNS)] + (f" {i // len(TOWNS) + 1}" if i >= len(TOWNS) else "") for i in range(n)]
+
+
+def make_schools(n: int, seasons=None, players_per_sport: int = 25, games_per_season: int = 18, seed: int = 0) -> dict:
+    """{school: team_data} for n schools that play each other; school i is seeded seed+i, so its rosters don't depend on n."""
+    names = school_names(max(n, 2))
+    return {name: make_team_data(seasons, players_per_sport, games_per_season, seed=seed + i,
+                                 opponents=[o for o in names if o != name] if n > 1 else OPPONENTS)
+            for i, name in enumerate(names[:n])}
+
+
+# ── COACH DATA ──
+NOTE_CATEGORIES = ["general", "tactical", "fitness", "academic", "attitude"]
+INJURY_TYPES    = ["Ankle sprain", "Hamstring strain", "Concussion", "Shin splints", "Wrist fracture", "Knee bruise"]
+FORMATIONS      = ["4-4-2", "4-3-3", "3-5-2", "2-3 zone", "Man-to-man", "1-3-1 press"]
+NOTE_PHRASES    = ["needs to track back on defense", "first touch has improved a lot", "great leadership in practice",
+                   "should work on the weak foot", "tired late in games, watch minutes", "reads the press well",
+                   "communication on set pieces", "finishing under pressure", "ready for a bigger role",
+                   "film session on positioning", "strong week of practice", "late to warmups twice"]
+SCOUT_PHRASES   = ["quick counter attack down the left", "tall back line, weak on the ground", "presses high early",
+                   "relies on their number 10", "struggles against zone defense", "deep bench, rotates often",
+                   "dangerous on corners", "slow to transition back"]
+
+
+def _roster_names(team_data: dict) -> list:
+    names = set()
+    for sport, sd in team_data.items():
+        if isinstance(sd, dict) and "history" in sd:
+            for frames in sd["history"].values():
+                for df in frames.values():
+                    if isinstance(df, pd.DataFrame) and "Player" in df.columns:
+                        names.update(df["Player"].tolist())
+    return sorted(names) or ["Team"]
+
+
+def make_coach_data(team_data: dict, notes: int = 1000, injuries: int = 50, game_notes: int = 200,
+                    scouting_reports: int = 100, custom_players: int = 100, days: int = 365, seed: int = 0) -> dict:
+    """Coach portal records shaped like coach_data.json, referencing players and opponents in team_data."""
+    r = random.Random(seed)
+    roster = _roster_names(team_data)
+    opponents = sorted({o for sd in team_data.values() if isinstance(sd, dict) and "fixtures" in sd
+                        for o in sd["fixtures"]["games"]["Opponent"].tolist()}) or OPPONENTS
+    now = datetime(2026, 6, 1)
+
+    def when():
+        return (now - timedelta(seconds=r.randint(0, days * 86400))).isoformat()
+
+    def text(phrases, k=2):
+        return "; ".join(r.sample(phrases, k))
+
+    data = {
+        "player_notes": [{"id": str(uuid.UUID(int=r.getrandbits(128))), "player_name": r.choice(roster),
+                          "note": text(NOTE_PHRASES), "category": r.choice(NOTE_CATEGORIES), "coach": "Coach",
+                          "created_at": when()} for _ in range(notes)],
+        "injuries": [{"id": str(uuid.UUID(int=r.getrandbits(128))), "player_name": r.choice(roster),
+                      "injury_type": r.choice(INJURY_TYPES), "expected_return": f"{r.randint(1, 6)} weeks",
+                      "notes": text(NOTE_PHRASES, 1), "active": r.random() < 0.3, "created_at": when(),
+                      "resolved_at": None} for _ in range(injuries)],
+        "game_notes": [{"id": str(uuid.UUID(int=r.getrandbits(128))), "opponent": r.choice(opponents),
+                        "note": text(NOTE_PHRASES + SCOUT_PHRASES, 3), "game_date": None,
+                        "category": r.choice(NOTE_CATEGORIES), "created_at": when()} for _ in range(game_notes)],
+        "scouting_reports": [{"id": str(uuid.UUID(int=r.getrandbits(128))), "opponent": r.choice(opponents),
+                              "formation": r.choice(FORMATIONS), "key_players": _name(r),
+                              "strengths": text(SCOUT_PHRASES), "weaknesses": text(SCOUT_PHRASES),
+                              "tactical_notes": text(SCOUT_PHRASES, 1), "created_at": when()}
+                             for _ in range(scouting_reports)],
+        "custom_player_data": [{"player_name": name, "gpa": round(r.uniform(2.0, 4.0), 2),
+                                "40yd": round(r.uniform(4.4, 6.0), 2), "minutes": r.randint(0, 900)}
+                               for name in r.sample(roster, min(custom_players, len(roster)))],
+    }
+    for i in data["injuries"]:
+        if not i["active"]:
+            i["resolved_at"] = i["created_at"]
+    return data
+
+
+def write_coach_data(path: str, data: dict):
+    with open(path, "w") as f:
+        json.dump(data, f)
@@ -0,0 +1,67 @@
+"""
+Shared fixtures. Every store the backend writes to (coach DB, sessions, stat
+progression, opponent cache) is pointed at a temp directory before any
+backend module is imported, so the suite never touches real data.
+
+    cd backend && python -m pytest -q tests
+"""
+
+import os
+import sys
+import tempfile
+import threading
+
+import pytest
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+
+_tmp = tempfile.mkdtemp(prefix="edison-tests-")
+os.environ.update({
+    "GROQ_API_KEY": "test", "COACH_PASSWORD": "test-password",
+    "COACH_DB_PATH": os.path.join(_tmp, "coach.db"), "AUTH_SESSION_DB": os.path.join(_tmp, "sessions.db"),
+    "PROGRESSION_DB_PATH": os.path.join(_tmp, "progression.db"), "OPPONENT_DB_PATH": os.path.join(_tmp, "opponents.db"),
+    "COACH_COMPACT_INTERVAL": "0", "OPPONENT_PREFETCH": "0", "STAT_PROGRESSION": "0",
+})
+
+import synthetic_data  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def team_data():
+    """Synthetic team data with the roster index built, as the API holds it after loading."""
+    import players
+    data = synthetic_data.make_team_data()
+    players.build_index(data)
+    return data
+
+
+@pytest.fixture
+def coach_db(tmp_path, monkeypatch):
+    """The database module on an empty coach DB of its own (no coach_data.json migration)."""
+    import functools
+    import database as db
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "coach.db"))
+    # migrate_from_json's default path is bound at import, so point the function itself at nothing
+    monkeypatch.setattr(db, "migrate_from_json",
+                        functools.partial(db.migrate_from_json, path=str(tmp_path / "coach_data.json")))
+    monkeypatch.setattr(db, "CACHE_CHECK_INTERVAL", 0.0)
+    yield db
+
+
+@pytest.fixture
+def client(coach_db, monkeypatch):
+    """A TestClient on the API with synthetic data loaded, and a coach token."""
+    from fastapi.testclient import TestClient
+    import api
+    monkeypatch.setattr(api, "scrape_all_data", lambda: synthetic_data.make_team_data())
+    with TestClient(api.app) as c:
+        # Wait for the whole loader (relinking coach records included), not just "/" reporting data,
+        # so no background write outlives the test's DB_PATH
+        for thread in threading.enumerate():
+            if thread.name == "team-data-loader":
+                thread.join(timeout=30)
+        assert c.get("/").json()["sports_loaded"]
+        token = c.post("/api/auth/login", json={"password": "test-password"}).json()["token"]
+        c.headers["Authorization"] = f"Bearer {token}"
+        yield c
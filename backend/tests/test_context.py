@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ai_agent import _build_full_context, _df_context
+
+# Exact lines the pre-vectorisation (iterrows) renderer produced for these frames
+CASES = [
+    ("boys_soccer",
+     {"Player": ["Alex Kim", "Sam Ortiz"], "Goals": [12, 0], "Assists": [4, 7], "Points": [28, 7],
+      "Season": ["2025-2026"] * 2},
+     "  Alex Kim: 12 goals, 4 assists, 28 pts\n"
+     "  Sam Ortiz: 0 goals, 7 assists, 7 pts"),
+    ("girls_soccer",
+     {"Player": ["Mia Chen"], "Goals": [3]},
+     "  Mia Chen: 3 goals, 0 assists, 0 pts"),
+    ("girls_basketball",
+     {"Player": ["Jo Park", "Lee Ray", "Kai Moss"], "Points": [212.0, 0.0, np.nan], "Rebounds": [88.0, 5.0, 14.0],
+      "Assists": [41.0, 2.0, 0.0], "GP": [20, 0, 7]},
+     "  Jo Park: 212.0 pts (10.6 PPG), 88.0 reb (4.4 RPG), 41.0 ast (2.0 APG), 20 GP\n"
+     "  Lee Ray: 0 pts (0.0 PPG), 5.0 reb (5.0 RPG), 2.0 ast (2.0 APG), 1 GP\n"
+     "  Kai Moss: nan pts (nan PPG), 14.0 reb (2.0 RPG), 0 ast (0.0 APG), 7 GP"),
+    ("baseball",
+     {"Player": ["Ace Diaz", "Ben Lowe", "Cal Yu"], "ERA": [2.15, 0.0, np.nan], "Strikeouts": [64, 0, 0],
+      "IP": [51.1, 0.0, 0.0], "AVG": [0.211, 0.342, 0.298], "RBI": [3, 22, 15], "H": [8, 41, 30], "AB": [38, 120, 101]},
+     "  Ace Diaz (P): ERA 2.15, 64 K, 51.1 IP\n"
+     "  Ben Lowe: 0.342 AVG, 22 RBI, 41 H, 120 AB\n"
+     "  Cal Yu: 0.298 AVG, 15 RBI, 30 H, 101 AB"),
+    ("wrestling",
+     {"Player": ["Dev Shah", "Eli Ross"], "Wins": [24, 0], "Losses": [3, 2], "Pins": [11, 0], "Tech Falls": [4, 0],
+      "Weight": ["138 lbs", ""]},
+     "  Dev Shah: 24W-3L, 11 pins, 4 tech falls, 138 lbs\n"
+     "  Eli Ross: 0W-2L, 0 pins, 0 tech falls"),
+    ("lacrosse",
+     {"Player": ["Fay Lin"], "Goals": [5]},
+     "  Fay Lin: {'Player': 'Fay Lin', 'Goals': 5}"),
+]
+
+
+@pytest.mark.parametrize("sport,frame,expected", CASES, ids=[c[0] for c in CASES])
+def test_df_context_output(sport, frame, expected):
+    assert _df_context(pd.DataFrame(frame), sport) == expected
+
+
+def test_df_context_limits_and_empty():
+    df = pd.DataFrame(CASES[0][1])
+    assert _df_context(df, "boys_soccer", max_rows=1) == "  Alex Kim: 12 goals, 4 assists, 28 pts"
+    assert _df_context(pd.DataFrame(), "boys_soccer") == "  No data available."
+    assert _df_context(None, "boys_soccer") == "  No data available."
+
+
+def test_goalkeeper_lines():
+    gk = pd.DataFrame({"Player": ["Gus Hale", "Ivy Nu"], "Saves": [88, 0], "Games Played": [14, 2]})
+    data = {"boys_soccer": {"current_stats": {"field_players": pd.DataFrame(CASES[0][1]), "goalies": gk}}}
+    assert "Goalkeepers:\n  Gus Hale: 88 saves, 14 GP\n  Ivy Nu: 0 saves, 2 GP" in _build_full_context(data, {}, False)
@@ -0,0 +1,145 @@
+import sqlite3
+import threading
+from datetime import datetime
+
+import pytest
+
+
+# ── CACHE ──
+def test_writes_go_through_the_cache(coach_db):
+    note = coach_db.add_player_note("P", "cached")
+    coach_db.upsert_custom_player_data("P", position="GK")
+    cached = coach_db.get_player_notes(), coach_db.get_custom_player_data("P")
+    assert note in cached[0] and cached[1][0]["position"] == "GK"
+    coach_db._cache["views"] = None   # rebuild from disk
+    assert (coach_db.get_player_notes(), coach_db.get_custom_player_data("P")) == cached
+
+
+def test_external_edit_is_picked_up(coach_db):
+    coach_db.add_player_note("P", "ours")
+    conn = sqlite3.connect(coach_db.DB_PATH)
+    conn.execute("INSERT INTO player_notes (id, player_name, note, category, coach, created_at) VALUES (?,?,?,?,?,?)",
+                 ("external", "P", "theirs", "general", "Other", datetime.utcnow().isoformat()))
+    conn.commit()
+    conn.close()
+    assert "external" in {n["id"] for n in coach_db.get_player_notes()}
+
+
+# ── WRITER ──
+def test_concurrent_writes_match_the_database(coach_db):
+    def writer(t):
+        for i in range(40):
+            note = coach_db.add_player_note(f"Player {t}", f"{t}-{i}")
+            if i % 10 == 0:
+                coach_db.delete_player_note(note["id"])
+            coach_db.upsert_custom_player_data("Shared Player", **{f"field_{t}": i})
+
+    threads = [threading.Thread(target=writer, args=(t,)) for t in range(12)]
+    [t.start() for t in threads]
+    [t.join() for t in threads]
+
+    cached = {n["id"] for n in coach_db.get_player_notes()}
+    custom = coach_db.get_custom_player_data("Shared Player")
+    assert len(cached) == 12 * 36
+    assert len(custom) == 1 and all(custom[0][f"field_{t}"] == 39 for t in range(12))
+
+    coach_db._cache["views"] = None   # rebuild from disk
+    assert {n["id"] for n in coach_db.get_player_notes()} == cached
+    assert coach_db.get_custom_player_data("Shared Player") == custom
+    stats = coach_db.writer_stats()
+    assert stats["failed"] == 0 and stats["writes"] >= stats["commits"]
+
+
+def test_failed_write_rolls_back_alone(coach_db):
+    def bad(conn):
+        conn.execute("INSERT INTO player_notes (id) VALUES ('half-written')")
+        raise RuntimeError("boom")
+
+    errors = []
+
+    def run_bad():
+        try:
+            coach_db._write(bad)
+        except RuntimeError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run_bad)] + \
+              [threading.Thread(target=coach_db.add_player_note, args=(f"P{i}", "ok")) for i in range(10)]
+    [t.start() for t in threads]
+    [t.join() for t in threads]
+    assert len(errors) == 1
+    coach_db._cache["views"] = None
+    notes = coach_db.get_player_notes()
+    assert len(notes) == 10 and all(n["id"] != "half-written" for n in notes)
+
+
+# ── PAGINATION ──
+def _add_notes(db, n, player="Player"):
+    return [db.add_player_note(f"{player} {i % 3}", f"note {i}") for i in range(n)]
+
+
+def _pages(db, limit, **kw):
+    pages, cursor = [], None
+    while True:
+        page = db.get_player_notes(limit=limit, cursor=cursor, **kw)
+        if not page:
+            return pages
+        pages.append(page)
+        if len(page) < limit:
+            return pages
+        cursor = db.page_cursor(page[-1])
+
+
+def test_cursor_pages_cover_every_note_once_newest_first(coach_db):
+    _add_notes(coach_db, 25)
+    everything = coach_db.get_player_notes()
+    pages = _pages(coach_db, 10)
+    assert [len(p) for p in pages] == [10, 10, 5]
+    assert [n["id"] for p in pages for n in p] == [n["id"] for n in everything]
+    assert everything == sorted(everything, key=lambda n: n["created_at"], reverse=True)
+
+
+def test_cursor_ties_on_created_at(coach_db):
+    # Imported rows can share a timestamp; the cursor must still neither skip nor repeat
+    rows = [{"id": f"n{i}", "player_name": "Tie", "note": str(i), "created_at": "2025-10-01T00:00:00"} for i in range(7)]
+    coach_db.import_rows("player_notes", rows)
+    ids = [n["id"] for p in _pages(coach_db, 3) for n in p]
+    assert sorted(ids) == sorted(r["id"] for r in rows) and len(ids) == 7
+
+
+def test_cursor_survives_deleting_the_cursor_row(coach_db):
+    _add_notes(coach_db, 12)
+    everything = [n["id"] for n in coach_db.get_player_notes()]
+    first = coach_db.get_player_notes(limit=5)
+    coach_db.delete_player_note(first[-1]["id"])
+    rest = coach_db.get_player_notes(cursor=coach_db.page_cursor(first[-1]))
+    assert [n["id"] for n in rest] == everything[5:]
+
+
+def test_cursor_with_filters_and_bad_cursor(coach_db):
+    _add_notes(coach_db, 15)
+    pages = _pages(coach_db, 2, player_name="Player 1")
+    assert [n["player_name"] for p in pages for n in p] == ["Player 1"] * 5
+    with pytest.raises(ValueError):
+        coach_db.get_player_notes(cursor="not-a-cursor")
+
+
+def test_since_until_bounds(coach_db):
+    rows = [{"id": f"d{d}", "player_name": "P", "note": "x", "created_at": f"2025-10-{d:02d}T12:00:00"}
+            for d in range(1, 11)]
+    coach_db.import_rows("player_notes", rows)
+    got = coach_db.get_player_notes(since="2025-10-03", until="2025-10-06")
+    assert [n["id"] for n in got] == ["d5", "d4", "d3"]
+
+
+def test_chat_context_gets_the_newest_items(coach_db, team_data):
+    from ai_agent import _build_full_context
+    for i in range(15):
+        coach_db.add_player_note("P", f"n{i:02d}")
+        coach_db.add_scouting_report(f"Opponent {i:02d}")
+    ctx = coach_db.get_all_coach_context()
+    assert [n["note"] for n in ctx["player_notes"]] == [f"n{i:02d}" for i in range(14, 4, -1)]
+    assert [s["opponent"] for s in ctx["scouting_reports"]] == ["Opponent 14", "Opponent 13", "Opponent 12"]
+    text = _build_full_context(team_data, ctx, is_coach=True)
+    assert "n14" in text and "n05" in text and "n04" not in text
+    assert "vs Opponent 14" in text and "vs Opponent 11" not in text
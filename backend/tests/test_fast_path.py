@@ -0,0 +1,54 @@
+import fast_path
+
+
+def _soccer(team_data):
+    return team_data["boys_soccer"]["current_stats"]["field_players"]
+
+
+def test_record(team_data):
+    intent, answer = fast_path.try_answer("What's the boys soccer record?", team_data)
+    games = team_data["boys_soccer"]["fixtures"]["games"]
+    played = games[games["Outcome"] != "—"]["Outcome"]
+    w, l = (played == "W").sum(), (played == "L").sum()
+    assert intent == "record"
+    assert f"is {w}-{l}" in answer
+
+
+def test_top_scorer(team_data):
+    intent, answer = fast_path.try_answer("Who is the top scorer for boys soccer?", team_data)
+    top = _soccer(team_data).nlargest(1, "Goals").iloc[0]
+    assert intent == "leader"
+    assert answer.startswith(top["Player"]) and str(top["Goals"]) in answer
+
+
+def test_top_n_leaders(team_data):
+    intent, answer = fast_path.try_answer("top 3 goal scorers boys soccer", team_data)
+    expected = _soccer(team_data).nlargest(3, "Goals")["Player"].tolist()
+    assert intent == "leader"
+    assert [line.split(". ", 1)[1].split(" — ")[0] for line in answer.splitlines()[1:]] == expected
+
+
+def test_player_stat(team_data):
+    row = _soccer(team_data).iloc[0]
+    intent, answer = fast_path.try_answer(f"How many goals does {row['Player']} have in boys soccer?", team_data)
+    assert intent == "player_stats"
+    assert answer == f"{row['Player']} has {row['Goals']} goals this season for Edison Boys Soccer."
+
+
+def test_open_questions_go_to_the_llm(team_data):
+    for message in ("Why did boys soccer lose last week?",
+                    "Compare boys soccer and girls soccer scoring",
+                    "Who leads the team?",   # no sport named
+                    "What should our boys soccer strategy be against Metuchen?"):
+        assert fast_path.try_answer(message, team_data) is None, message
+    assert fast_path.try_answer("What's the boys soccer record?", {}) is None
+
+
+def test_full_name_beats_shared_surname(team_data):
+    fp = _soccer(team_data)
+    last = fp["Player"].str.split().str[-1]
+    shared = fp[last.duplicated(keep=False)]
+    assert not shared.empty, "synthetic roster should have two players sharing a surname"
+    row = shared.iloc[0]
+    hit = fast_path.try_answer(f"How many goals does {row['Player']} have?", team_data)
+    assert hit == ("player_stats", f"{row['Player']} has {row['Goals']} goals this season for Edison Boys Soccer.")
@@ -0,0 +1,52 @@
+import json
+
+
+def _jsonl(rows):
+    return "\n".join(json.dumps(r) for r in rows)
+
+
+def test_custom_player_data_round_trip_into_a_db_that_has_the_player(client, coach_db, tmp_path, monkeypatch):
+    client.post("/api/coach/player-stats", json={"player_name": "Jordan Reyes", "minutes_played": 400,
+                                                 "fitness_rating": 7})
+    export = client.get("/api/coach/export/custom_player_data").text
+    source_id = json.loads(export.splitlines()[0])["id"]
+
+    # A second database where the same player already exists under another id
+    monkeypatch.setattr(coach_db, "DB_PATH", str(tmp_path / "other.db"))
+    client.post("/api/coach/player-stats", json={"player_name": "Jordan Reyes", "yellow_cards": 2,
+                                                 "fitness_rating": 3})
+    existing = coach_db.get_custom_player_data("Jordan Reyes")[0]
+    assert existing["id"] != source_id
+
+    r = client.post("/api/coach/import/custom_player_data?format=jsonl", content=export).json()
+    assert r["imported"] == 1 and r["rejected"] == 0
+
+    merged = coach_db.get_custom_player_data("Jordan Reyes")
+    assert len(merged) == 1
+    assert merged[0]["id"] == existing["id"]
+    assert merged[0]["created_at"] == existing["created_at"]
+    assert (merged[0]["minutes_played"], merged[0]["fitness_rating"], merged[0]["yellow_cards"]) == (400, 7, 2)
+    # The merge reached the database, not just the cache
+    coach_db._cache["views"] = None
+    assert coach_db.get_custom_player_data("Jordan Reyes")[0]["minutes_played"] == 400
+
+
+def test_custom_player_data_import_keeps_source_id_for_new_players(client, coach_db):
+    row = {"id": "source-id-1", "created_at": "2025-09-01T00:00:00", "player_name": "New Kid", "jersey_number": 9}
+    client.post("/api/coach/import/custom_player_data?format=jsonl", content=_jsonl([row]))
+    coach_db._cache["views"] = None
+    [entry] = coach_db.get_custom_player_data("New Kid")
+    assert (entry["id"], entry["created_at"], entry["jersey_number"]) == ("source-id-1", "2025-09-01T00:00:00", 9)
+
+
+def test_notes_export_reimports_idempotently(client, coach_db):
+    for i in range(5):
+        client.post("/api/coach/notes", json={"player_name": f"Player {i}", "note": f"note {i}"})
+    export = client.get("/api/coach/export/player_notes").text
+    r = client.post("/api/coach/import/player_notes?format=jsonl", content=export).json()
+    assert r["imported"] == 5
+    assert coach_db.count("player_notes") == 5
+    csv_export = client.get("/api/coach/export/player_notes?format=csv").text
+    r = client.post("/api/coach/import/player_notes?format=csv", content=csv_export).json()
+    assert r["imported"] == 5 and r["rejected"] == 0
+    assert sorted(n["note"] for n in coach_db.get_player_notes()) == [f"note {i}" for i in range(5)]
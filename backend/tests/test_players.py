@@ -0,0 +1,32 @@
+import players
+
+
+def test_index_does_not_add_columns_to_frames():
+    import synthetic_data
+    data = synthetic_data.make_team_data()
+    before = {s: list(sd["current_stats"]["field_players"].columns)
+              for s, sd in data.items() if s in ("boys_soccer", "girls_soccer")}
+    players.build_index(data)
+    for sport, columns in before.items():
+        assert list(data[sport]["current_stats"]["field_players"].columns) == columns
+
+
+def test_resolve_by_full_last_and_ambiguous_first_name(team_data):
+    name = team_data["boys_soccer"]["current_stats"]["field_players"]["Player"][0]
+    pid = players.player_id(name)
+    assert players.resolve(name) == [pid]
+    assert players.resolve_id(name.upper()) == pid
+    assert pid in players.resolve(name.split()[-1])
+    assert players.resolve("") == []
+
+
+def test_public_tables_keep_their_scraped_columns(client):
+    goalkeepers = client.get("/api/boys_soccer/goalkeepers").json()["goalkeepers"]
+    assert goalkeepers and "Player ID" not in goalkeepers[0]
+
+
+def test_partial_name_search_resolves_to_one_player(client):
+    import api
+    name = api.team_data["boys_soccer"]["current_stats"]["field_players"]["Player"][0]
+    r = client.get(f"/api/players/search/{name[:-1]}").json()
+    assert r["found"] and r["player"]["id"] == players.player_id(name)
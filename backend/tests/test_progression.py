@@ -0,0 +1,77 @@
+import copy
+
+import pytest
+
+from players import player_id
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    import progression
+    monkeypatch.setattr(progression, "PROGRESSION_DB_PATH", str(tmp_path / "progression.db"))
+    monkeypatch.setattr(progression, "ENABLED", True)
+    return progression
+
+
+def _week(team_data, k):
+    """Copy of team_data after k more weeks: three soccer players score, one basketball player plays."""
+    d = copy.deepcopy(team_data)
+    fp = d["boys_soccer"]["current_stats"]["field_players"]
+    fp.loc[:2, "Goals"] += k
+    fp.loc[:2, "Points"] += k
+    bb = d["boys_basketball"]["current_stats"]["players"]
+    bb.loc[:0, "Points"] += 20 * k
+    bb.loc[:0, "GP"] += k
+    return d
+
+
+def test_only_changes_are_stored(store, team_data):
+    first = store.record(_week(team_data, 0), taken_at="2025-10-01T00:00:00")
+    second = store.record(_week(team_data, 1), taken_at="2025-10-08T00:00:00")
+    again = store.record(_week(team_data, 1), taken_at="2025-10-09T00:00:00")
+    assert first["deltas"] > 100
+    assert second == {"snapshots": 2, "deltas": 3 * 2 + 2, "unchanged": 7}
+    assert again["snapshots"] == 0 and again["deltas"] == 0
+
+
+def test_player_and_team_trajectories_rebuild_each_snapshot(store, team_data):
+    for k in range(3):
+        store.record(_week(team_data, k), taken_at=f"2025-10-0{k + 1}T00:00:00")
+    season = team_data["boys_soccer"]["current_stats"]["season"]
+    fp = team_data["boys_soccer"]["current_stats"]["field_players"]
+    pid = player_id(fp["Player"][0])
+
+    player = store.trajectory("boys_soccer", season, pid=pid)
+    assert [p["Goals"] for p in player["points"]] == [fp["Goals"][0] + k for k in range(3)]
+    team = store.trajectory("boys_soccer", season, stat="Goals")
+    assert [p["Goals"] for p in team["points"]] == [fp["Goals"].sum() + 3 * k for k in range(3)]
+
+    bb = team_data["boys_basketball"]["current_stats"]["players"]
+    ppg = store.trajectory("boys_basketball", season, pid=player_id(bb["Player"][0]))["points"][-1]["PPG"]
+    assert ppg == round((bb["Points"][0] + 40) / (bb["GP"][0] + 2), 2)
+
+
+def test_team_totals_leave_out_rates(store, team_data):
+    store.record(team_data)
+    baseball = store.trajectory("baseball", team_data["baseball"]["current_stats"]["season"])
+    assert "AVG" not in baseball["stats"] and "H" in baseball["stats"]
+
+
+def test_dropped_player_goes_back_to_zero(store, team_data):
+    store.record(team_data, taken_at="2025-10-01T00:00:00")
+    d = copy.deepcopy(team_data)
+    fp = d["boys_soccer"]["current_stats"]["field_players"]
+    gone = player_id(fp["Player"][0])
+    d["boys_soccer"]["current_stats"]["field_players"] = fp.iloc[1:]
+    store.record(d, taken_at="2025-10-02T00:00:00")
+    points = store.trajectory("boys_soccer", d["boys_soccer"]["current_stats"]["season"], pid=gone)["points"]
+    assert points[-1]["Goals"] == 0
+
+
+def test_unknown_sport(store):
+    assert store.trajectory("current_stats", "2025-2026") is None
+
+
+def test_endpoint_rejects_non_sport_keys(client):
+    assert client.get("/api/current_stats/progression").status_code == 404
+    assert client.get("/api/boys_soccer/progression", params={"frame": "nope"}).status_code == 400
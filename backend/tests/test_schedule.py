@@ -0,0 +1,88 @@
+import pytest
+
+import schedule
+
+
+@pytest.fixture(scope="module")
+def games(team_data):
+    schedule.build_index(team_data)
+    rows = []
+    for sport in schedule.SPORTS:
+        for season in team_data[sport]["fixture_history"].values():
+            rows += [{**r, "sport": sport, "Game Date": schedule.parse_game_date(r["Date"], r["Season"])}
+                     for r in season["games"].to_dict("records")]
+    return rows
+
+
+def test_between_matches_a_scan(games):
+    got = schedule.between("2024-10-01", "2024-11-15")
+    expected = sorted(r["Game Date"] for r in games if "2024-10-01" <= r["Game Date"] <= "2024-11-15")
+    assert [g["date"] for g in got] == expected
+    soccer = schedule.between("2024-10-01", "2024-11-15", sport="girls_soccer")
+    assert soccer and all(g["sport"] == "girls_soccer" for g in soccer)
+    assert len(schedule.between()) == sum(1 for r in games if r["Game Date"])
+
+
+def test_parse_game_date():
+    assert schedule.parse_game_date("Sat, Sep 6", "2025-2026") == "2025-09-06"
+    assert schedule.parse_game_date("Tue, Jan 13", "2025-2026") == "2026-01-13"
+    assert schedule.parse_game_date("4/2/25", "2024-2025") == "2025-04-02"
+    assert schedule.parse_game_date("Feb 30", "2025-2026") == ""
+    assert schedule.parse_game_date("TBD", "2025-2026") == ""
+
+
+def test_upcoming_and_recent(games):
+    dates = sorted(r["Game Date"] for r in games)
+    assert [g["date"] for g in schedule.upcoming(4, after="2025-01-01")] == [d for d in dates if d >= "2025-01-01"][:4]
+    assert [g["date"] for g in schedule.recent(3, before="2025-01-01")] == [d for d in dates if d < "2025-01-01"][-3:]
+
+
+def test_opponent_lookup_and_partial_names(games):
+    name = games[0]["Opponent"]
+    got = schedule.against(name)
+    assert len(got) == sum(1 for r in games if r["Opponent"] == name)
+    assert [g["date"] for g in got] == sorted(g["date"] for g in got)
+    assert len(schedule.opponents(name.upper())) == 1
+    assert schedule.opponents("no such school") == []
+
+
+def test_partial_name_matches_every_opponent(games):
+    names = {r["Opponent"] for r in games if "brunswick" in r["Opponent"].lower()}
+    assert len(names) >= 2 and len(schedule.opponents("brunswick")) == len(names)
+    got = schedule.against("brunswick")
+    assert len(got) == sum(1 for r in games if r["Opponent"] in names)
+    assert [g["date"] for g in got] == sorted(g["date"] for g in got)
+
+
+def test_head_to_head_tallies_every_season(games):
+    name = games[0]["Opponent"]
+    sport = games[0]["sport"]
+    mine = [r for r in games if r["Opponent"] == name and r["sport"] == sport]
+    h2h = schedule.head_to_head(sport, name)
+    played = [r for r in mine if r["Outcome"] != "—"]
+    assert h2h["games_played"] == len(played)
+    assert h2h["record"] == {o: sum(r["Outcome"] == o for r in played) for o in "WLT"}
+    assert set(h2h["by_season"]) == {r["Season"] for r in mine}
+    assert h2h["scored"] - h2h["allowed"] == h2h["differential"]
+    assert h2h["last_meeting"] == next(g for g in reversed(h2h["games"]) if g["played"])
+    assert schedule.head_to_head(sport, "no such school") is None
+
+
+def test_score_reads_ours_first():
+    won = {"played": True, "outcome": "W", "result": "W 1-3"}
+    lost = {"played": True, "outcome": "L", "result": "L 3-1"}
+    assert schedule._score(won) == (3, 1)
+    assert schedule._score(lost) == (1, 3)
+    assert schedule._score({"played": False, "outcome": "—", "result": ""}) is None
+
+
+def test_schedule_endpoint_keeps_the_scraped_columns(client):
+    games = client.get("/api/boys_soccer/schedule").json()["games"]
+    assert games and set(games[0]) == {"Date", "Opponent", "Location", "Result", "Outcome", "Record", "Season"}
+
+
+def test_calendar_endpoints(client):
+    assert client.get("/api/calendar", params={"start": "2024-10-01", "end": "2024-10-31"}).json()["count"] > 0
+    assert client.get("/api/calendar", params={"start": "October"}).status_code == 400
+    assert client.get("/api/calendar/upcoming", params={"sport": "lacrosse"}).status_code == 404
+    assert client.get("/api/calendar/opponent/no such school").json()["found"] is False
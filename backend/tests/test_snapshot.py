@@ -0,0 +1,30 @@
+import pandas as pd
+import snapshot
+
+
+def _frames(obj):
+    if isinstance(obj, pd.DataFrame):
+        yield obj
+    elif isinstance(obj, dict):
+        for v in obj.values():
+            yield from _frames(v)
+
+
+def test_round_trip_keeps_dtypes_and_missing_cells(tmp_path):
+    df = pd.DataFrame({"Player": pd.Series(["Alex Kim", None, "Sam Ortiz"], dtype=object),
+                       "Pos": pd.Series(["GK", "D", None], dtype=object),
+                       "Goals": [3, 0, 7], "AVG": [0.25, float("nan"), 0.4]})
+    snapshot.write_snapshot({"boys_soccer": {"current_stats": {"field_players": df}}}, str(tmp_path))
+    _, data = snapshot.load_snapshot(str(tmp_path), wait=0)
+    back = data["boys_soccer"]["current_stats"]["field_players"]
+    assert back.dtypes.to_dict() == df.dtypes.to_dict()
+    assert back["Player"][1] is None and back["Pos"][2] is None
+    pd.testing.assert_frame_equal(back, df)
+
+
+def test_team_data_round_trip(tmp_path, team_data):
+    snapshot.write_snapshot(team_data, str(tmp_path))
+    _, data = snapshot.load_snapshot(str(tmp_path), wait=0)
+    for before, after in zip(_frames(team_data), _frames(data)):
+        assert after.dtypes.to_dict() == before.dtypes.to_dict()
+        pd.testing.assert_frame_equal(after, before)
@@ -0,0 +1,45 @@
+import pytest
+
+import synthetic_data
+
+
+@pytest.fixture
+def loader(coach_db, monkeypatch):
+    """api with an empty team_data, no backoff, and get_client() not called for real."""
+    import ai_agent
+    import api
+    monkeypatch.setattr(api, "team_data", {})
+    monkeypatch.setattr(api, "LOAD_RETRY_SECONDS", 0.0)
+    monkeypatch.setattr(ai_agent, "get_client", lambda: None)
+    return api
+
+
+def _failing(times):
+    calls = []
+
+    def scrape():
+        calls.append(1)
+        if len(calls) <= times:
+            raise ConnectionError("nj.com is down")
+        return synthetic_data.make_team_data()
+    return scrape, calls
+
+
+def test_failed_load_is_retried(loader, monkeypatch):
+    scrape, calls = _failing(2)
+    monkeypatch.setattr(loader, "scrape_all_data", scrape)
+    loader._load_team_data()
+    assert len(calls) == 3 and loader.team_data
+
+
+def test_load_that_never_succeeds_exits(loader, monkeypatch):
+    scrape, calls = _failing(99)
+    monkeypatch.setattr(loader, "scrape_all_data", scrape)
+    monkeypatch.setattr(loader, "LOAD_ATTEMPTS", 3)
+
+    def exit_(code):
+        raise SystemExit(code)
+    monkeypatch.setattr(loader.os, "_exit", exit_)
+    with pytest.raises(SystemExit) as e:
+        loader._load_team_data()
+    assert e.value.code == 1 and len(calls) == 3 and not loader.team_data
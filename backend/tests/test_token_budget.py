@@ -0,0 +1,59 @@
+from token_budget import (MAX_TURN_TOKENS, MESSAGE_OVERHEAD, OMITTED_NOTE, PRIORITY_COACH, PRIORITY_HISTORY,
+                          PRIORITY_REQUIRED, PRIORITY_STATS, SUMMARY_PREFIX, estimate_tokens, fit_context,
+                          fit_history, message_tokens)
+
+
+def _turns(n, words=40):
+    return [{"role": "user" if i % 2 == 0 else "assistant",
+             "content": f"Turn {i} starts here. " + " ".join(["word"] * words)} for i in range(n)]
+
+
+def test_fit_history_keeps_newest_turns_and_summarizes_the_rest():
+    turns = _turns(10)
+    kept = fit_history(turns, 200)
+    assert message_tokens(kept) <= 200
+    assert kept[-1]["content"] == turns[-1]["content"]
+    assert kept[0]["content"].startswith(SUMMARY_PREFIX)
+    assert "Turn 0 starts here." in kept[0]["content"]
+
+
+def test_fit_history_everything_fits():
+    turns = _turns(4, words=5)
+    assert fit_history(turns, 10_000) == turns
+
+
+def test_fit_history_drops_junk_and_clips_long_turns():
+    turns = [{"role": "system", "content": "ignore me"}, {"role": "user", "content": ""},
+             {"role": "user", "content": "x " * (MAX_TURN_TOKENS * 8)}]
+    kept = fit_history(turns, 10_000)
+    assert len(kept) == 1 and kept[0]["role"] == "user"
+    assert estimate_tokens(kept[0]["content"]) <= MAX_TURN_TOKENS + 5
+
+
+def test_fit_history_extends_an_existing_summary():
+    prior = {"role": "user", "content": SUMMARY_PREFIX + "User asked: about pins."}
+    kept = fit_history([prior] + _turns(10), 200)
+    assert kept[0]["content"].startswith(SUMMARY_PREFIX + "User asked: about pins.")
+    assert kept[0]["content"].count(SUMMARY_PREFIX) == 1
+
+
+def test_fit_context_drops_lowest_priority_latest_first():
+    blocks = [(PRIORITY_REQUIRED, "r" * 400), (PRIORITY_STATS, "s" * 400), (PRIORITY_COACH, "c" * 400),
+              (PRIORITY_HISTORY, "h1" * 200), (PRIORITY_HISTORY, "h2" * 200)]
+    text, dropped = fit_context(blocks, 310)
+    assert dropped == 2
+    assert "h1" not in text and "h2" not in text and "c" * 400 in text
+    assert text.endswith(OMITTED_NOTE)
+
+    text, dropped = fit_context(blocks, 10_000)
+    assert dropped == 0 and OMITTED_NOTE not in text
+
+
+def test_fit_context_never_drops_required_blocks():
+    blocks = [(PRIORITY_REQUIRED, "r" * 4000), (PRIORITY_STATS, "s" * 40)]
+    text, dropped = fit_context(blocks, 10)
+    assert dropped == 1 and text.startswith("r" * 4000)
+
+
+def test_message_tokens_counts_overhead():
+    assert message_tokens([{"role": "user", "content": "abcd"}]) == 1 + MESSAGE_OVERHEAD
@@ -0,0 +1,133 @@
+"""
+Token accounting for chat prompt assembly.
+Estimates the size of every prompt component (system prompt, data context,
+conversation history, new message) and trims the lower-priority parts so the
+prompt stays inside a configurable budget. No tokenizer dependency — the
+Llama/Groq tokenizers average roughly 4 characters per token on English text,
+which is close enough for budgeting.
+"""
+
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+CHARS_PER_TOKEN     = 4
+MESSAGE_OVERHEAD    = 4      # role + separators per chat message
+
+PROMPT_TOKEN_BUDGET  = int(os.getenv("PROMPT_TOKEN_BUDGET", "6000"))
+HISTORY_TOKEN_BUDGET = int(os.getenv("HISTORY_TOKEN_BUDGET", "1500"))
+MAX_TURN_TOKENS      = int(os.getenv("MAX_TURN_TOKENS", "400"))
+MAX_HISTORY_TURNS    = int(os.getenv("MAX_HISTORY_TURNS", "6"))
+
+# Context block priorities — lower number survives longer when trimming
+PRIORITY_REQUIRED = 0
+PRIORITY_STATS    = 1
+PRIORITY_COACH    = 2
+PRIORITY_HISTORY  = 3
+
+SUMMARY_PREFIX = "Earlier in this conversation — "
+OMITTED_NOTE = "(Some lower-priority data was left out to keep this prompt short.)"
+TRUNCATED = " …[truncated]"
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for a piece of text."""
+    if not text:
+        return 0
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def message_tokens(messages: list) -> int:
+    return sum(estimate_tokens(m.get("content", "")) + MESSAGE_OVERHEAD for m in messages)
+
+
+def clip(text: str, max_tokens: int) -> str:
+    """Cut text down to at most max_tokens, marking the cut when there is room for the marker."""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    if max_chars <= len(TRUNCATED):
+        return text[:max_chars]
+    return text[:max_chars - len(TRUNCATED)].rstrip() + TRUNCATED
+
+
+def _first_sentence(text: str, max_chars: int = 120) -> str:
+    text = " ".join(text.split())
+    for stop in (". ", "? ", "! ", "\n"):
+        idx = text.find(stop)
+        if 0 < idx < max_chars:
+            return text[:idx + 1]
+    return text if len(text) <= max_chars else text[:max_chars].rstrip() + "…"
+
+
+def summarize_turn(turn: dict) -> str:
+    """One-line gist of a single turn."""
+    who = "User asked" if turn.get("role") == "user" else "You answered"
+    return f"{who}: {_first_sentence(turn.get('content', ''))}"
+
+
+def summarize_turns(turns: list) -> str:
+    """Compress older turns into a single line: first sentence of each."""
+    return SUMMARY_PREFIX + " | ".join(summarize_turn(t) for t in turns)
+
+
+def fit_history(turns: list, budget: int) -> list:
+    """
+    Keep the newest turns that fit in `budget` tokens (each clipped to
+    MAX_TURN_TOKENS). Turns that don't fit are folded into one summary message
+    at the front if there is room for it; a summary already at the front of
+    `turns` (from a server-side session) is extended rather than re-summarized.
+    """
+    valid = [
+        {"role": t.get("role"), "content": t.get("content")}
+        for t in (turns or [])
+        if t.get("role") in ("user", "assistant") and t.get("content")
+    ]
+    prior = []
+    if valid and valid[0]["role"] == "user" and valid[0]["content"].startswith(SUMMARY_PREFIX):
+        prior = [valid.pop(0)["content"][len(SUMMARY_PREFIX):]]
+    valid = valid[-MAX_HISTORY_TURNS * 2:]
+
+    kept, used = [], 0
+    for turn in reversed(valid):
+        content = clip(turn["content"], MAX_TURN_TOKENS)
+        cost = estimate_tokens(content) + MESSAGE_OVERHEAD
+        if used + cost > budget or len(kept) >= MAX_HISTORY_TURNS:
+            break
+        kept.append({"role": turn["role"], "content": content})
+        used += cost
+    kept.reverse()
+
+    older = valid[:len(valid) - len(kept)]
+    if older or prior:
+        summary = SUMMARY_PREFIX + " | ".join(prior + [summarize_turn(t) for t in older])
+        summary = clip(summary, max(budget - used - MESSAGE_OVERHEAD, 0))
+        if estimate_tokens(summary) > 8:
+            kept.insert(0, {"role": "user", "content": summary})
+    return kept
+
+
+def fit_context(blocks: list, budget: int) -> tuple:
+    """
+    blocks: ordered list of (priority, text). Drops the lowest-priority blocks
+    (latest first within a priority) until the joined text fits in `budget`.
+    Returns (context_text, dropped_block_count).
+    """
+    kept = list(range(len(blocks)))
+    total = sum(estimate_tokens(blocks[i][1]) + 1 for i in kept)
+    dropped = 0
+    by_priority = sorted(
+        (i for i in kept if blocks[i][0] > PRIORITY_REQUIRED),
+        key=lambda i: (-blocks[i][0], -i),
+    )
+    for i in by_priority:
+        if total <= budget:
+            break
+        kept.remove(i)
+        total -= estimate_tokens(blocks[i][1]) + 1
+        dropped += 1
+    text = "\n".join(blocks[i][1] for i in kept)
+    if dropped:
+        text += "\n" + OMITTED_NOTE
+    return text, dropped
@@ -73,7 +73,7 @@ export default function Home() {
   const [messages, setMessages] = useState<Message[]>([]);
   const [input, setInput] = useState('');
   const [isLoading, setIsLoading] = useState(false);
-  const [conversationHistory, setConversationHistory] = useState<any[]>([]);
+  const [chatSessionId, setChatSessionId] = useState<string | null>(null);
   const messagesEndRef = useRef<HTMLDivElement>(null);
   const API = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
 
@@ -202,13 +202,13 @@ export default function Home() {
     try {
       const response = await fetch(`${API}/api/chat`, {
         method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ message: userMessage, conversation_history: conversationHistory, is_coach: coachAuthed })
+        headers: coachAuthed ? authHeaders() : { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ message: userMessage, session_id: chatSessionId })
       });
       const data = await response.json();
       if (data.response) {
         setMessages(prev => [...prev, { role: 'assistant', content: data.response }]);
-        setConversationHistory(data.conversation_history || []);
+        if (data.session_id) setChatSessionId(data.session_id);
       }
     } catch {
       setMessages(prev => [...prev, { role: 'assistant', content: '❌ Cannot connect to backend. Make sure it is running on port 8000.' }]);